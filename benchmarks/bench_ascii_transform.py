@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the ASCII fast path of LowercaseDict and UnicaseDict.
+
+Run from the repository root:
+	python -m benchmarks.bench_ascii_transform
+"""
+
+import random
+import string
+import timeit
+import tracemalloc
+
+from transforming_collections import KeyTransformingDict, LowercaseDict, UnicaseDict
+from transforming_collections import transforms
+
+
+def reference_lowercase(key):
+	if isinstance(key, str):
+		return key.lower()
+	return key
+
+
+def reference_casefold(key):
+	if isinstance(key, str):
+		return key.casefold()
+	return key
+
+
+class ReferenceLowercaseDict(KeyTransformingDict):
+	transform_key = staticmethod(reference_lowercase)
+
+
+class ReferenceUnicaseDict(KeyTransformingDict):
+	transform_key = staticmethod(reference_casefold)
+
+
+def make_keys(count, non_ascii_ratio, uppercase_ratio, seed=0):
+	rng = random.Random(seed)
+	keys = []
+	for _ in range(count):
+		key = ''.join(rng.choices(string.ascii_lowercase + '_-', k=rng.randint(4, 20)))
+		if rng.random() < uppercase_ratio:
+			key = key.title()
+		if rng.random() < non_ascii_ratio:
+			key += rng.choice('éßαЖ')
+		keys.append(key)
+	return keys
+
+
+def fresh_allocations(transform, keys):
+	"""
+	Number of transformed keys that are new objects, and bytes held by them.
+	"""
+	tracemalloc.start()
+	results = [transform(key) for key in keys]
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return sum(result is not key for result, key in zip(results, keys)), size
+
+
+def per_call_ns(statement, count, repeat=5, number=20):
+	return min(timeit.repeat(statement, number=number, repeat=repeat)) / (number * count) * 1e9
+
+
+def main():
+	count = 10_000
+	cases = (
+		('lowercase', reference_lowercase, transforms.lowercase, ReferenceLowercaseDict, LowercaseDict),
+		('casefold',  reference_casefold,  transforms.casefold,  ReferenceUnicaseDict,   UnicaseDict),
+	)
+	print(f"{'transform':<10} {'non-ascii':>9} {'upper':>6} {'variant':<10} {'transform ns':>12} {'lookup ns':>10} {'new keys':>9} {'bytes':>9}")
+	for non_ascii_ratio in (0.0, 0.1, 0.5):
+		for uppercase_ratio in (0.0, 0.5):
+			keys = make_keys(count, non_ascii_ratio, uppercase_ratio)
+			for name, reference, fast, reference_class, fast_class in cases:
+				for variant, transform, dict_class in (('reference', reference, reference_class), ('fast', fast, fast_class)):
+					d = dict_class.fromkeys(keys, 1)
+					transform_ns = per_call_ns(lambda: [transform(key) for key in keys], count)
+					lookup_ns = per_call_ns(lambda: [d[key] for key in keys], count)
+					new_keys, size = fresh_allocations(transform, keys)
+					print(f"{name:<10} {non_ascii_ratio:>9.0%} {uppercase_ratio:>6.0%} {variant:<10} {transform_ns:>12.1f} {lookup_ns:>10.1f} {new_keys:>9} {size:>9}")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-threaded scaling benchmark of ConcurrentKeyTransformingDict
+against a KeyTransformingDict guarded by one global lock.
+Meaningful scaling needs a free-threaded build (python3.13t); with the GIL both variants serialize.
+
+Run from the repository root:
+	python -m benchmarks.bench_concurrent
+"""
+
+import random
+import string
+import sys
+import threading
+import time
+
+from transforming_collections import ConcurrentLowercaseDict, KeyTransformingDict
+from transforming_collections import transforms
+
+
+class GloballyLockedLowercaseDict(KeyTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+	
+	def __init__(self, *args, **kwds):
+		self.lock = threading.Lock()
+		super().__init__(*args, **kwds)
+	
+	def __getitem__(self, key):
+		with self.lock:
+			return super().__getitem__(key)
+	
+	def __setitem__(self, key, value):
+		with self.lock:
+			super().__setitem__(key, value)
+	
+	def setdefault(self, key, default=None):
+		with self.lock:
+			return super().setdefault(key, default)
+	
+	def pop(self, key, *args):
+		with self.lock:
+			return super().pop(key, *args)
+
+
+def make_keys(count, seed=0):
+	rng = random.Random(seed)
+	return [''.join(rng.choices(string.ascii_letters, k=rng.randint(4, 20))) for _ in range(count)]
+
+
+def worker(d, keys, operations, write_ratio, seed, barrier):
+	rng = random.Random(seed)
+	choices = [rng.choice(keys) for _ in range(operations)]
+	writes = [rng.random() < write_ratio for _ in range(operations)]
+	barrier.wait()
+	for key, write in zip(choices, writes):
+		if write:
+			d[key] = 0
+		else:
+			d[key]
+
+
+def run(dict_class, keys, thread_count, operations, write_ratio):
+	d = dict_class.fromkeys(keys, 0)
+	barrier = threading.Barrier(thread_count + 1)
+	threads = [
+		threading.Thread(target=worker, args=(d, keys, operations // thread_count, write_ratio, seed, barrier))
+		for seed in range(thread_count)
+	]
+	for thread in threads:
+		thread.start()
+	barrier.wait()
+	start = time.perf_counter()
+	for thread in threads:
+		thread.join()
+	return operations / (time.perf_counter() - start)
+
+
+def main():
+	gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+	print(f"GIL enabled: {gil_enabled}")
+	keys = make_keys(10_000)
+	operations = 320_000
+	print(f"{'threads':>7} {'writes':>6} {'global lock ops/s':>18} {'concurrent ops/s':>17} {'speedup':>8}")
+	for write_ratio in (0.1, 0.5):
+		for thread_count in (1, 2, 4, 8, 16, 32):
+			locked = run(GloballyLockedLowercaseDict, keys, thread_count, operations, write_ratio)
+			concurrent = run(ConcurrentLowercaseDict, keys, thread_count, operations, write_ratio)
+			print(f"{thread_count:>7} {write_ratio:>6.0%} {locked:>18,.0f} {concurrent:>17,.0f} {concurrent / locked:>7.2f}x")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the overhead of transform instrumentation on LowercaseDict operations:
+never instrumented, instrumented then disabled, and enabled.
+
+Run from the repository root:
+	python -m benchmarks.bench_instrumentation
+"""
+
+import timeit
+
+from transforming_collections import KeyTransformingDict
+from transforming_collections import transforms
+
+
+class NeverInstrumentedDict(KeyTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class DisabledDict(KeyTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class EnabledDict(KeyTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+
+
+def per_key_ns(statement, count, repeat=7, number=20):
+	return min(timeit.repeat(statement, number=number, repeat=repeat)) / (number * count) * 1e9
+
+
+def main():
+	count = 10_000
+	keys = [f'Key-{i}' for i in range(count)]
+	DisabledDict.enable_instrumentation()
+	DisabledDict.disable_instrumentation()
+	EnabledDict.enable_instrumentation()
+	
+	operations = {
+		'__getitem__': lambda d: [d[key] for key in keys],
+		'get':         lambda d: [d.get(key) for key in keys],
+		'__setitem__': lambda d: [d.__setitem__(key, 0) for key in keys],
+		'update':      lambda d: d.update(dict.fromkeys(keys, 0)),
+	}
+	print(f"{'operation':<12} {'never ns':>9} {'disabled ns':>12} {'overhead':>9} {'enabled ns':>11} {'overhead':>9}")
+	for name, operation in operations.items():
+		results = []
+		for dict_class in (NeverInstrumentedDict, DisabledDict, EnabledDict):
+			d = dict_class.fromkeys(keys, 0)
+			results.append(per_key_ns(lambda: operation(d), count))
+		never, disabled, enabled = results
+		print(f"{name:<12} {never:>9.1f} {disabled:>12.1f} {disabled / never - 1:>+9.1%} {enabled:>11.1f} {enabled / never - 1:>+9.1%}")
+
+
+if __name__ == '__main__':
+	main()
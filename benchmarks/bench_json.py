@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of parsing large nested JSON documents into LowercaseDict:
+converting the parsed plain dicts recursively, against building them with LowercaseDict.json_hook(),
+and of serializing them back with json.dumps of converted dicts against LowercaseDict.to_json().
+
+Run from the repository root:
+	python -m benchmarks.bench_json
+"""
+
+import json
+import random
+import timeit
+import tracemalloc
+
+from transforming_collections import LowercaseDict
+
+
+def make_document(rng, depth, width):
+	document = {}
+	for i in range(width):
+		key = f'Field{i}_{rng.randrange(1000)}'
+		if depth > 0 and rng.random() < 0.3:
+			document[key] = make_document(rng, depth - 1, width)
+		elif rng.random() < 0.1:
+			document[key] = [make_document(rng, 0, width // 2) for _ in range(3)]
+		else:
+			document[key] = rng.random()
+	return document
+
+
+def convert(value):
+	if isinstance(value, dict):
+		return LowercaseDict({key: convert(item) for key, item in value.items()})
+	if isinstance(value, list):
+		return [convert(item) for item in value]
+	return value
+
+
+def unconvert(value):
+	if isinstance(value, LowercaseDict):
+		return {key: unconvert(item) for key, item in value.data.items()}
+	if isinstance(value, list):
+		return [unconvert(item) for item in value]
+	return value
+
+
+def peak_bytes(function):
+	tracemalloc.start()
+	try:
+		function()
+		return tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+
+def best_ms(function, repeat=5):
+	return min(timeit.repeat(function, number=1, repeat=repeat)) * 1e3
+
+
+def main():
+	rng = random.Random(0)
+	hook = LowercaseDict.json_hook()
+	print(f"{'document':<12} {'MB':>6} {'variant':<18} {'ms':>9} {'MB/s':>8} {'peak MB':>8}")
+	for depth, width, count in ((2, 10, 500), (4, 8, 150), (6, 6, 30)):
+		document = {f'Item{i}': make_document(rng, depth, width) for i in range(count)}
+		text = json.dumps(document)
+		size = len(text) / 1e6
+		parsed = convert(json.loads(text))
+		variants = {
+			'loads':          lambda: json.loads(text),
+			'loads + convert': lambda: convert(json.loads(text)),
+			'json_hook':      lambda: json.loads(text, object_pairs_hook=hook),
+			'dumps converted': lambda: json.dumps(unconvert(parsed)),
+			'to_json':        lambda: parsed.to_json(),
+		}
+		for name, function in variants.items():
+			ms = best_ms(function)
+			print(f"{f'{depth}x{width}x{count}':<12} {size:>6.1f} {name:<18} {ms:>9.1f} {size / ms * 1e3:>8.1f} {peak_bytes(function) / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+	main()
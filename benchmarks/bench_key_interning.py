@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of interned transformed keys: many small records sharing a few hundred field names,
+with and without intern_keys.
+
+Run from the repository root:
+	python -m benchmarks.bench_key_interning
+"""
+
+import random
+import timeit
+import tracemalloc
+
+from transforming_collections import KeyTransformingDict
+
+
+class PlainLowercaseDict(KeyTransformingDict):
+	transform_key = staticmethod(str.lower)
+
+
+class InternedLowercaseDict(KeyTransformingDict):
+	intern_keys = True
+	transform_key = staticmethod(str.lower)
+
+
+def make_rows(count, fields, width, seed=0):
+	rng = random.Random(seed)
+	names = [f'Field_{i}_' + ''.join(rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=8)) for i in range(fields)]
+	# as parsed from a file, every row has its own copies of the field names
+	return [{''.join(list(name)): i for i, name in enumerate(rng.sample(names, width))} for _ in range(count)], names
+
+
+def bytes_per_record(cls, rows):
+	tracemalloc.start()
+	records = [cls(row) for row in rows]
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del records
+	return size / len(rows)
+
+
+def lookup_ns(cls, rows, names, number=5):
+	records = [cls(row) for row in rows[:1000]]
+	keys = [name.upper() for name in names]
+	def lookups():
+		for record in records:
+			for key in keys:
+				key in record
+	return min(timeit.repeat(lookups, number=number, repeat=3)) / (number * len(records) * len(keys)) * 1e9
+
+
+def main():
+	count = 200_000
+	for fields, width in ((300, 10), (300, 30)):
+		rows, names = make_rows(count, fields, width)
+		print(f'{count} records of {width} keys out of {fields} field names')
+		print(f'{"implementation":<24}{"bytes/record":>14}{"lookup ns":>12}')
+		results = {}
+		for cls in (PlainLowercaseDict, InternedLowercaseDict):
+			results[cls] = bytes_per_record(cls, rows)
+			print(f'{cls.__name__:<24}{results[cls]:>14.0f}{lookup_ns(cls, rows, names):>12.1f}')
+		print(f'saved: {results[PlainLowercaseDict] - results[InternedLowercaseDict]:.0f} bytes/record')
+		print()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Memory per entry of KeyPreservingTransformingDict compared with a naive two-dict design,
+a single dict of (original key, value) tuples, and KeyTransformingDict, which drops original keys,
+for keys that differ from their transformation and keys that are already transformed.
+
+Run from the repository root:
+	python -m benchmarks.bench_key_preserving_memory
+"""
+
+import tracemalloc
+
+from transforming_collections import KeyPreservingTransformingDict, LowercaseDict
+from transforming_collections import transforms
+
+
+class LowercasePreservingDict(KeyPreservingTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class TwoDictLowercasePreservingDict:
+	"""
+	Naive design: values and original keys in two dictionaries keyed by transformed keys.
+	"""
+	def __init__(self):
+		self.data = {}
+		self.original_keys = {}
+	
+	def __setitem__(self, key, value):
+		transformed_key = transforms.lowercase(key)
+		self.data[transformed_key] = value
+		self.original_keys[transformed_key] = key
+
+
+class TupleLowercasePreservingDict:
+	"""
+	Single dictionary of transformed keys to (original key, value) tuples.
+	"""
+	def __init__(self):
+		self.data = {}
+	
+	def __setitem__(self, key, value):
+		self.data[transforms.lowercase(key)] = (key, value)
+
+
+def bytes_per_entry(factory, keys):
+	tracemalloc.start()
+	before, _ = tracemalloc.get_traced_memory()
+	d = factory()
+	for key in keys:
+		d[key] = None
+	after, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return (after - before) / len(keys)
+
+
+def main():
+	factories = {
+		'KeyPreservingTransformingDict': LowercasePreservingDict,
+		'two dicts':                     TwoDictLowercasePreservingDict,
+		'dict of tuples':                TupleLowercasePreservingDict,
+		'LowercaseDict (no originals)':  LowercaseDict,
+	}
+	for factory in factories.values():
+		# allocations made once per class are not counted
+		bytes_per_entry(factory, ['Warm-Up'])
+	print(f"{'entries':>9} {'keys':<12} {'design':<30} {'bytes/entry':>12}")
+	for count in (1_000, 100_000, 1_000_000):
+		for case, template in (('mixed case', 'Header-Name-{}'), ('lowercase', 'header-name-{}')):
+			keys = [template.format(i) for i in range(count)]
+			for name, factory in factories.items():
+				print(f"{count:>9} {case:<12} {name:<30} {bytes_per_entry(factory, keys):>12.1f}")
+
+
+if __name__ == '__main__':
+	main()
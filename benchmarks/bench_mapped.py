@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of MappedUnicaseDict against an in-memory UnicaseDict:
+build and open time, file size, Python heap allocated per process, and lookup time.
+
+Run from the repository root:
+	python -m benchmarks.bench_mapped [key count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from transforming_collections import MappedUnicaseDict, UnicaseDict
+
+
+def allocated(function):
+	tracemalloc.start()
+	result = function()
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return result, size
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+	keys = [f'Key-{i}' for i in range(count)]
+	lookups = keys[::max(1, count // 100_000)]
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, 'table.map')
+		
+		start = time.perf_counter()
+		d, heap = allocated(lambda: UnicaseDict(zip(keys, range(count))))
+		print(f"UnicaseDict       build {time.perf_counter() - start:8.2f} s   heap {heap / 2**20:8.1f} MiB")
+		
+		start = time.perf_counter()
+		MappedUnicaseDict.write(path, d)
+		print(f"MappedUnicaseDict write {time.perf_counter() - start:8.2f} s   file {os.path.getsize(path) / 2**20:8.1f} MiB")
+		
+		start = time.perf_counter()
+		mapped, heap = allocated(lambda: MappedUnicaseDict(path))
+		print(f"MappedUnicaseDict open  {time.perf_counter() - start:8.4f} s   heap {heap / 2**20:8.3f} MiB")
+		
+		for name, mapping in (('UnicaseDict', d), ('MappedUnicaseDict', mapped)):
+			seconds = min(timeit.repeat(lambda: [mapping[key] for key in lookups], number=1, repeat=5))
+			print(f"{name:<17} lookup {seconds / len(lookups) * 1e9:8.0f} ns")
+		mapped.close()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed and per-entry memory of every transforming class, against the builtin dict and set,
+for tiny and large containers.
+
+Run from the repository root:
+	python -m benchmarks.bench_memory
+"""
+
+import collections
+
+from transforming_collections import (
+	BaseKeyTransformingDict, KeyTransformingDict, FastKeyTransformingDict, KeyPreservingTransformingDict,
+	ValueIndexedKeyTransformingDict, NestedKeyTransformingDict, UnicodeNormalizingDict, FrozenKeyTransformingDict,
+	ConcurrentKeyTransformingDict, FrozenKeyTransformingSet, KeyTransformingSet,
+)
+from transforming_collections import transforms
+from transforming_collections.memory import memory_footprint
+
+
+def lowercase_class(base):
+	return type(f'Lowercase{base.__name__}', (base, ), {'__slots__': (), 'transform_key': staticmethod(transforms.lowercase)})
+
+
+DICTS = [dict] + [lowercase_class(base) for base in (
+	BaseKeyTransformingDict, KeyTransformingDict, FastKeyTransformingDict, KeyPreservingTransformingDict,
+	ValueIndexedKeyTransformingDict, NestedKeyTransformingDict, FrozenKeyTransformingDict, ConcurrentKeyTransformingDict,
+)] + [UnicodeNormalizingDict]
+SETS = [set, frozenset] + [lowercase_class(base) for base in (KeyTransformingSet, FrozenKeyTransformingSet)]
+
+
+def main():
+	for size, instances in ((4, 2000), (100, 1000)):
+		# keys are already lowercase, so that only the containers are measured, not new transformed keys
+		pairs = [(f'key-{i}', i) for i in range(size)]
+		keys = [key for key, _ in pairs]
+		print(f'{size} entries')
+		print(f'{"class":<42}{"fixed bytes":>12}{"bytes/entry":>12}')
+		for cls, items in [(cls, collections.OrderedDict(pairs)) for cls in DICTS] + [(cls, keys) for cls in SETS]:
+			footprint = memory_footprint(cls, items, instances)
+			print(f'{cls.__name__:<42}{footprint.fixed:>12.0f}{footprint.per_entry:>12.1f}')
+		print()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of from_pairs_parallel against the serial path for an expensive transformation
+(Unicode normalization, stripping and IDNA encoding), with an increasing number of workers.
+
+Run from the repository root:
+	python -m benchmarks.bench_parallel [pair count]
+"""
+
+import os
+import sys
+import time
+import unicodedata
+
+from transforming_collections import KeyTransformingDict
+
+
+class HostnameDict(KeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		key = unicodedata.normalize('NFKC', key).strip().casefold()
+		return key.encode('idna').decode('ascii')
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+	pairs = [(f' Bücher-{i}.Example.COM ', i) for i in range(count)]
+	
+	start = time.perf_counter()
+	serial = HostnameDict()
+	serial.update(pairs)
+	serial_seconds = time.perf_counter() - start
+	print(f"{'serial update':<16} {serial_seconds:8.2f} s")
+	
+	for workers in sorted({1, 2, 4, 8, os.cpu_count() or 1}):
+		start = time.perf_counter()
+		d = HostnameDict.from_pairs_parallel(pairs, workers=workers)
+		seconds = time.perf_counter() - start
+		assert d == serial
+		print(f"{f'{workers} workers':<16} {seconds:8.2f} s {serial_seconds / seconds:6.2f}x")
+
+
+if __name__ == '__main__':
+	main()
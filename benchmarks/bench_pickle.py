@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Pickle round-trip benchmark at 1M keys, comparing the transformed-storage reduction
+with the generic object reduction it replaces, and out-of-band buffers for large bytes values.
+
+Run from the repository root:
+	python -m benchmarks.bench_pickle [key count]
+"""
+
+import pickle
+import sys
+import time
+
+from transforming_collections import FastLowercaseDict, LowercaseDict
+
+
+class GenericLowercaseDict(LowercaseDict):
+	__reduce_ex__ = object.__reduce_ex__
+
+
+class GenericFastLowercaseDict(FastLowercaseDict):
+	__reduce_ex__ = object.__reduce_ex__
+
+
+def round_trip(d, protocol, out_of_band=False):
+	buffers = [] if out_of_band else None
+	start = time.perf_counter()
+	pickled = pickle.dumps(d, protocol, buffer_callback=buffers.append if out_of_band else None)
+	dumped = time.perf_counter()
+	pickle.loads(pickled, buffers=buffers)
+	loaded = time.perf_counter()
+	return dumped - start, loaded - dumped, len(pickled)
+
+
+def report(name, d, protocol, out_of_band=False):
+	dump, load, size = round_trip(d, protocol, out_of_band)
+	print(f"{name:<34} {protocol:>8} {dump:>8.3f} {load:>8.3f} {size / 2**20:>10.1f}")
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+	items = [(f'Key-{i}', i) for i in range(count)]
+	print(f"{'dictionary':<34} {'protocol':>8} {'dump s':>8} {'load s':>8} {'stream MiB':>10}")
+	for protocol in (2, 5):
+		for name, dict_class in (
+			('LowercaseDict (generic)',     GenericLowercaseDict),
+			('LowercaseDict',               LowercaseDict),
+			('FastLowercaseDict (generic)', GenericFastLowercaseDict),
+			('FastLowercaseDict',           FastLowercaseDict),
+		):
+			report(name, dict_class(items), protocol)
+	blobs = LowercaseDict((f'Blob-{i}', bytes(2**20)) for i in range(256))
+	report('256 x 1 MiB values, in-band', blobs, 5)
+	report('256 x 1 MiB values, out-of-band', blobs, 5, out_of_band=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of record types for rows sharing the same columns,
+against one UnicaseDict per row: memory per row, construction and lookup time.
+
+Run from the repository root:
+	python -m benchmarks.bench_records
+"""
+
+import timeit
+
+from transforming_collections import UnicaseDict
+from transforming_collections.memory import memory_footprint
+
+
+def per_call_ns(function, count, repeat=5, number=5):
+	return min(timeit.repeat(function, number=number, repeat=repeat)) / (number * count) * 1e9
+
+
+def main():
+	columns = [f'Column_{i}' for i in range(30)]
+	Record = UnicaseDict.record_type(columns)
+	rows = [[f'value-{row}-{column}' for column in range(len(columns))] for row in range(10_000)]
+	mappings = [dict(zip(columns, row)) for row in rows]
+	
+	implementations = {
+		'UnicaseDict':            (lambda mapping=(): UnicaseDict(mapping), lambda row, mapping: UnicaseDict(mapping)),
+		'record':                 (lambda mapping=(): Record(mapping), lambda row, mapping: Record(mapping)),
+		'record from_values':     (lambda mapping=(): Record.from_values(mapping.values()) if mapping else Record(), lambda row, mapping: Record.from_values(row)),
+	}
+	print(f'{len(rows)} rows of {len(columns)} columns')
+	print(f'{"implementation":<22}{"bytes/row":>11}{"build ns/row":>14}{"get ns":>9}{"overflow get ns":>17}')
+	for name, (factory, build) in implementations.items():
+		footprint = memory_footprint(factory, mappings[0], 2000)
+		row_bytes = footprint.fixed + footprint.per_entry * len(columns)
+		build_ns = per_call_ns(lambda: [build(row, mapping) for row, mapping in zip(rows, mappings)], len(rows))
+		instances = [build(row, mapping) for row, mapping in zip(rows, mappings)]
+		keys = [column.upper() for column in columns]
+		get_ns = per_call_ns(lambda: [instance[key] for instance in instances[:1000] for key in keys], 1000 * len(keys))
+		for instance in instances[:1000]:
+			instance['Extra'] = 1
+		overflow_ns = per_call_ns(lambda: [instance['EXTRA'] for instance in instances[:1000]], 1000)
+		print(f'{name:<22}{row_bytes:>11.0f}{build_ns:>14.0f}{get_ns:>9.1f}{overflow_ns:>17.1f}')
+
+
+if __name__ == '__main__':
+	main()
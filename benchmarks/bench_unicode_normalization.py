@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of UnicodeNormalizingDict on mixed-script corpora of user-supplied names,
+against unconditional normalization with unicodedata.normalize.
+
+Run from the repository root:
+	python -m benchmarks.bench_unicode_normalization
+"""
+
+import random
+import timeit
+import tracemalloc
+import unicodedata
+
+from transforming_collections import KeyTransformingDict, UnicodeNormalizingDict
+from transforming_collections import transforms
+
+
+def reference_normalize(key):
+	if isinstance(key, str):
+		return unicodedata.normalize('NFKC', unicodedata.normalize('NFKC', key).casefold())
+	return key
+
+
+class ReferenceNormalizingDict(KeyTransformingDict):
+	transform_key = staticmethod(reference_normalize)
+
+
+SCRIPTS = {
+	'ascii':    'abcdefghijklmnopqrstuvwxyz',
+	'latin':    'abcdeéèêëçñöüßåøłżšť',
+	'greek':    'αβγδεζηθικλμνξοπρστυφχψω',
+	'cyrillic': 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+	'cjk':      '山田中村小林佐藤鈴木高橋伊渡辺',
+	'hangul':   '김이박최정강조윤장임한오서신권',
+}
+
+
+def make_names(count, scripts, capitalized_ratio, decomposed_ratio, fullwidth_ratio, seed=0):
+	rng = random.Random(seed)
+	names = []
+	for _ in range(count):
+		alphabet = SCRIPTS[rng.choice(scripts)]
+		name = ''.join(rng.choices(alphabet, k=rng.randint(3, 12)))
+		if rng.random() < capitalized_ratio:
+			name = name.capitalize()
+		if rng.random() < decomposed_ratio:
+			name = unicodedata.normalize('NFD', name)
+		if rng.random() < fullwidth_ratio:
+			name += '－' + rng.choice('０１２３４５６７８９')
+		names.append(name)
+	return names
+
+
+def retained_bytes(transform, keys):
+	"""
+	Bytes held by the transformed keys that are new objects.
+	"""
+	tracemalloc.start()
+	results = [transform(key) for key in keys]
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del results
+	return size
+
+
+def per_call_ns(statement, count, repeat=5, number=20):
+	return min(timeit.repeat(statement, number=number, repeat=repeat)) / (number * count) * 1e9
+
+
+def main():
+	count = 10_000
+	transform = transforms.normalizer('NFKC', True)
+	corpora = {
+		'ascii canonical':  make_names(count, ['ascii'], 0.0, 0.0, 0.0),
+		'ascii mixed case': make_names(count, ['ascii'], 0.5, 0.0, 0.0),
+		'latin':            make_names(count, ['ascii', 'latin'], 0.3, 0.1, 0.0),
+		'mixed canonical':  [transform(name) for name in make_names(count, list(SCRIPTS), 0.3, 0.1, 0.05)],
+		'mixed raw':        make_names(count, list(SCRIPTS), 0.3, 0.1, 0.05),
+	}
+	print(f"{'corpus':<17} {'variant':<10} {'transform ns':>12} {'lookup ns':>10} {'kept':>6} {'bytes':>9}")
+	for corpus, names in corpora.items():
+		for variant, function, dict_class in (('reference', reference_normalize, ReferenceNormalizingDict), ('fast', transform, UnicodeNormalizingDict)):
+			d = dict_class.fromkeys(names, 1)
+			transform_ns = per_call_ns(lambda: [function(name) for name in names], count)
+			lookup_ns = per_call_ns(lambda: [d[name] for name in names], count)
+			kept = sum(function(name) is name for name in names) / count
+			print(f"{corpus:<17} {variant:<10} {transform_ns:>12.1f} {lookup_ns:>10.1f} {kept:>6.0%} {retained_bytes(function, names):>9}")
+
+
+if __name__ == '__main__':
+	main()
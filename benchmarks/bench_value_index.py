@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of value membership with and without the value index, and the memory the index costs.
+
+Run from the repository root:
+	python -m benchmarks.bench_value_index [key count]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from transforming_collections import LowercaseDict, ValueIndexedKeyTransformingDict
+from transforming_collections import transforms
+
+
+class ValueIndexedLowercaseDict(ValueIndexedKeyTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+
+
+def build(dict_class, items):
+	tracemalloc.start()
+	d = dict_class(items)
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return d, size
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+	# values shared by 4 keys each, as in deduplication
+	items = [(f'Key-{i}', f'value-{i // 4}') for i in range(count)]
+	probes = [f'value-{i}' for i in range(0, count // 2, max(1, count // 200))]
+	print(f"{'dictionary':<26} {'heap MiB':>9} {'value in ns':>12} {'keys_for_value ns':>18}")
+	for dict_class in (LowercaseDict, ValueIndexedLowercaseDict):
+		d, size = build(dict_class, items)
+		contains = min(timeit.repeat(lambda: [probe in d.values() for probe in probes], number=1, repeat=3)) / len(probes)
+		if hasattr(d, 'keys_for_value'):
+			keys_for_value = min(timeit.repeat(lambda: [d.keys_for_value(probe) for probe in probes], number=1, repeat=3)) / len(probes)
+		else:
+			keys_for_value = min(timeit.repeat(lambda: [[k for k, v in d.items() if v == probe] for probe in probes[:10]], number=1, repeat=3)) / 10
+		print(f"{dict_class.__name__:<26} {size / 2**20:>9.1f} {contains * 1e9:>12.0f} {keys_for_value * 1e9:>18.0f}")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of building a LowercaseDict from a NumPy array of str keys:
+iterating over the array per key, converting it to str at once (the default),
+and a NumPy vectorized transform declared as vectorized_transform_key. Requires NumPy.
+
+Run from the repository root:
+	python -m benchmarks.bench_vectorized [key count ...]
+"""
+
+import sys
+import time
+
+import numpy
+
+from transforming_collections import LowercaseDict
+
+
+class PerScalarLowercaseDict(LowercaseDict):
+	def transform_keys(self, keys):
+		transform_key = self.transform_key
+		return [transform_key(key) for key in keys]
+
+
+class NumpyLowercaseDict(LowercaseDict):
+	vectorized_transform_key = staticmethod(lambda keys: numpy.strings.lower(keys).tolist())
+
+
+def keys_per_second(function, count):
+	start = time.perf_counter()
+	function()
+	return count / (time.perf_counter() - start)
+
+
+def main():
+	counts = [int(arg) for arg in sys.argv[1:]] or [10**5, 10**6, 10**7]
+	dict_classes = (PerScalarLowercaseDict, LowercaseDict, NumpyLowercaseDict)
+	print(f"{'keys':>10} {'operation':<13}" + ''.join(f" {dict_class.__name__ + ' keys/s':>30}" for dict_class in dict_classes))
+	for count in counts:
+		keys = numpy.char.add('Key-', numpy.arange(count).astype(str))
+		values = numpy.arange(count).tolist()
+		for name, build in (
+			('fromkeys',     lambda dict_class: dict_class.fromkeys(keys, 0)),
+			('from_columns', lambda dict_class: dict_class.from_columns(keys, values)),
+		):
+			rates = [keys_per_second(lambda: build(dict_class), count) for dict_class in dict_classes]
+			print(f"{count:>10} {name:<13}" + ''.join(f" {rate:>30,.0f}" for rate in rates))
+
+
+if __name__ == '__main__':
+	main()
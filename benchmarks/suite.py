@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite of the public dictionary operations of BaseKeyTransformingDict and KeyTransformingDict,
+with the builtin dict as a baseline, for cheap and expensive transformations and several sizes.
+The memory of empty dictionaries and of each entry is measured too, unless disabled with --no-memory.
+Results are written as JSON; two result files can be compared to flag regressions.
+
+Run from the repository root:
+	python -m benchmarks.suite run [--sizes 10,1000,100000] [--no-memory] [--output results.json]
+	python -m benchmarks.suite compare baseline.json results.json [--threshold 0.1]
+"""
+
+import argparse
+import collections
+import json
+import platform
+import sys
+import time
+import timeit
+import unicodedata
+
+from transforming_collections import BaseKeyTransformingDict, KeyTransformingDict
+from transforming_collections import transforms
+from transforming_collections.memory import memory_footprint
+
+
+def expensive_transform(key):
+	return unicodedata.normalize('NFKC', key).strip().casefold()
+
+
+TRANSFORMS = {
+	'cheap':     staticmethod(transforms.lowercase),
+	'expensive': staticmethod(expensive_transform),
+}
+
+IMPLEMENTATIONS = {
+	'BaseKeyTransformingDict': BaseKeyTransformingDict,
+	'KeyTransformingDict':     KeyTransformingDict,
+}
+
+# per-key operations run over a sample of at most this many keys
+SAMPLE_SIZE = 1000
+# memory is averaged over dictionaries holding about this many entries in total
+MEMORY_ENTRIES = 100_000
+
+
+class Case:
+	"""
+	Dictionaries and keys for one implementation and size, shared by all operations.
+	Operations keep d equal to same_class and transformed, so that comparisons run over all keys.
+	"""
+	def __init__(self, dict_class, size):
+		self.dict_class = dict_class
+		self.keys = [f'Key-{i}' for i in range(size)]
+		self.sample = self.keys[::max(1, size // SAMPLE_SIZE)]
+		self.sample_items = [(key, int(key[4:])) for key in self.sample]
+		self.missing = [f'Missing-{i}' for i in range(len(self.sample))]
+		self.d = dict_class(zip(self.keys, range(size)))
+		self.same_class = dict_class(zip(self.keys, range(size)))
+		self.plain = dict(zip(self.keys, range(size)))
+		self.pairs = list(self.plain.items())
+		self.user_dict = collections.UserDict(self.plain)
+		self.transformed = dict(self.d.items())
+
+
+def per_key(function):
+	function.per_key = True
+	return function
+
+
+@per_key
+def op_getitem(case):
+	d = case.d
+	for key in case.sample:
+		d[key]
+
+
+@per_key
+def op_get(case):
+	d = case.d
+	for key in case.sample:
+		d.get(key)
+
+
+@per_key
+def op_get_missing(case):
+	d = case.d
+	for key in case.missing:
+		d.get(key)
+
+
+@per_key
+def op_contains(case):
+	d = case.d
+	for key in case.sample:
+		key in d
+
+
+@per_key
+def op_setitem(case):
+	d = case.d
+	for key, value in case.sample_items:
+		d[key] = value
+
+
+@per_key
+def op_setdefault(case):
+	d = case.d
+	for key in case.sample:
+		d.setdefault(key, 0)
+
+
+@per_key
+def op_pop_setitem(case):
+	d = case.d
+	for key in case.sample:
+		d[key] = d.pop(key)
+
+
+def op_init_dict(case):
+	case.dict_class(case.plain)
+
+
+def op_update_dict(case):
+	case.d.update(case.plain)
+
+
+def op_update_same_class(case):
+	case.d.update(case.same_class)
+
+
+def op_update_pairs(case):
+	case.d.update(case.pairs)
+
+
+def op_update_user_dict(case):
+	case.d.update(case.user_dict)
+
+
+def op_or(case):
+	case.d | case.plain
+
+
+def op_or_same_class(case):
+	case.d | case.same_class
+
+
+def op_ior(case):
+	case.d |= case.plain
+
+
+def op_eq_same_class(case):
+	case.d == case.same_class
+
+
+def op_eq_dict(case):
+	case.d == case.transformed
+
+
+def op_copy(case):
+	case.d.copy()
+
+
+def op_keys(case):
+	for key in case.d.keys():
+		pass
+
+
+def op_items(case):
+	for item in case.d.items():
+		pass
+
+
+def op_values(case):
+	for value in case.d.values():
+		pass
+
+
+OPERATIONS = {name[3:]: function for name, function in globals().items() if name.startswith('op_')}
+
+
+def measure(functions, case, repeat):
+	"""
+	Time per key of each repeat of each function, in nanoseconds.
+	Repeats are interleaved across the functions, so that the spread of each function covers the noise of the whole case.
+	"""
+	timers = []
+	for function in functions:
+		timer = timeit.Timer(lambda function=function: function(case))
+		number, _ = timer.autorange()
+		count = len(case.sample) if getattr(function, 'per_key', False) else len(case.keys)
+		timers.append((timer, number, max(count, 1)))
+	runs = [[] for _ in functions]
+	for _ in range(repeat):
+		for (timer, number, count), function_runs in zip(timers, runs):
+			function_runs.append(timer.timeit(number) / number / count * 1e9)
+	return runs
+
+
+def measure_memory(case):
+	"""
+	Bytes of an empty dictionary and bytes per entry, not counting the keys and values given.
+	"""
+	instances = max(1, min(1000, MEMORY_ENTRIES // max(len(case.keys), 1)))
+	return memory_footprint(case.dict_class, case.plain, instances)
+
+
+def metric(result):
+	"""
+	Unit and samples of a result: the time of every repeat, or the memory.
+	"""
+	if 'ns_per_key' in result:
+		# results written before the repeats were stored have the best time only
+		return 'ns', result.get('ns_per_key_runs', [result['ns_per_key']])
+	return 'B', [result['bytes']]
+
+
+def run(sizes, repeat, operations, memory=True):
+	results = []
+	implementations = [('dict', 'none', dict)]
+	for transform_name, transform in TRANSFORMS.items():
+		for implementation_name, base_class in IMPLEMENTATIONS.items():
+			dict_class = type(f'{transform_name.title()}{implementation_name}', (base_class, ), {'transform_key': transform})
+			implementations.append((implementation_name, transform_name, dict_class))
+	for size in sizes:
+		for implementation_name, transform_name, dict_class in implementations:
+			case = Case(dict_class, size)
+			for operation, runs in zip(operations, measure([OPERATIONS[operation] for operation in operations], case, repeat)):
+				ns_per_key = min(runs)
+				results.append({
+					'implementation': implementation_name,
+					'transform': transform_name,
+					'operation': operation,
+					'size': size,
+					'ns_per_key': ns_per_key,
+					'ns_per_key_runs': runs,
+				})
+				print(f"{size:>9} {implementation_name:<24} {transform_name:<9} {operation:<18} {ns_per_key:>10.1f} ns/key", file=sys.stderr)
+			if memory:
+				footprint = measure_memory(case)
+				for operation, bytes_ in (('memory_fixed', footprint.fixed), ('memory_per_key', footprint.per_entry)):
+					results.append({
+						'implementation': implementation_name,
+						'transform': transform_name,
+						'operation': operation,
+						'size': size,
+						'bytes': bytes_,
+					})
+					print(f"{size:>9} {implementation_name:<24} {transform_name:<9} {operation:<18} {bytes_:>10.1f} B", file=sys.stderr)
+	return {
+		'meta': {
+			'python': sys.version,
+			'implementation': platform.python_implementation(),
+			'platform': platform.platform(),
+			'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+			'repeat': repeat,
+		},
+		'results': results,
+	}
+
+
+def compare(baseline, current, threshold):
+	"""
+	Print the ratio of current to baseline best time or memory for each result present in both,
+	and return the regressions: results whose best time is slower than the slowest baseline repeat by more than the threshold,
+	so that differences within the noise of the baseline run are not flagged, or whose memory is larger by more than the threshold.
+	"""
+	def key(result):
+		return (result['implementation'], result['transform'], result['operation'], result['size'])
+	
+	baseline_results = {key(result): result for result in baseline['results']}
+	regressions = []
+	print(f"{'size':>9} {'implementation':<24} {'transform':<9} {'operation':<18} {'baseline':>10} {'noise':>6} {'current':>10} {'ratio':>7}")
+	for result in current['results']:
+		old = baseline_results.get(key(result))
+		if old is None:
+			continue
+		unit, values = metric(result)
+		_, old_values = metric(old)
+		value = min(values)
+		old_value = min(old_values)
+		ratio = value / old_value if old_value else 1.0
+		# spread of the baseline repeats, relative to the best one
+		noise = max(old_values) / old_value - 1 if old_value else 0.0
+		flag = ''
+		if value > max(old_values) * (1 + threshold):
+			regressions.append(result)
+			flag = ' REGRESSION'
+		print(f"{result['size']:>9} {result['implementation']:<24} {result['transform']:<9} {result['operation']:<18} {old_value:>8.1f}{unit:>2} {noise:>6.0%} {value:>8.1f}{unit:>2} {ratio:>6.2f}x{flag}")
+	return regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.strip().splitlines()[0])
+	subparsers = parser.add_subparsers(dest='command', required=True)
+	run_parser = subparsers.add_parser('run', help="run the benchmarks and write JSON results")
+	run_parser.add_argument('--sizes', default='10,1000,100000', help="comma-separated dictionary sizes, up to 10000000")
+	run_parser.add_argument('--operations', default=','.join(OPERATIONS), help="comma-separated operations")
+	run_parser.add_argument('--repeat', type=int, default=5)
+	run_parser.add_argument('--no-memory', dest='memory', action='store_false', help="skip the memory measurements")
+	run_parser.add_argument('--output', help="JSON file to write, standard output by default")
+	compare_parser = subparsers.add_parser('compare', help="compare two JSON results, exiting with status 1 on regressions")
+	compare_parser.add_argument('baseline')
+	compare_parser.add_argument('current')
+	compare_parser.add_argument('--threshold', type=float, default=0.1, help="relative slowdown beyond the slowest baseline repeat, or growth of memory, flagged as a regression")
+	args = parser.parse_args(argv)
+	
+	if args.command == 'run':
+		operations = args.operations.split(',')
+		unknown = set(operations) - OPERATIONS.keys()
+		if unknown:
+			parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+		results = run([int(size) for size in args.sizes.split(',')], args.repeat, operations, args.memory)
+		output = json.dumps(results, indent=1)
+		if args.output:
+			with open(args.output, 'w') as file:
+				file.write(output)
+		else:
+			print(output)
+		return 0
+	with open(args.baseline) as file:
+		baseline = json.load(file)
+	with open(args.current) as file:
+		current = json.load(file)
+	regressions = compare(baseline, current, args.threshold)
+	print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+	return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import asyncio
+
+from transforming_collections import AsyncKeyTransformingDict, TransformCache
+
+
+class FakeResolver:
+	"""
+	Local stand-in for an alias resolver process, answering after an artificial latency.
+	"""
+	ALIASES = {'colour': 'color', 'grey': 'gray'}
+	
+	def __init__(self, latency=0.01):
+		self.latency = latency
+		self.calls = []
+		self.fail = set()
+	
+	async def resolve(self, key):
+		self.calls.append(key)
+		await asyncio.sleep(self.latency)
+		if key in self.fail:
+			raise ConnectionError(f"resolver failed for {key!r}")
+		key = key.lower()
+		return self.ALIASES.get(key, key)
+
+
+class TestAsyncKeyTransformingDict(AsyncKeyTransformingDict):
+	@classmethod
+	def with_resolver(cls, resolver):
+		class ResolvedDict(cls):
+			@staticmethod
+			async def transform_key(key):
+				return await resolver.resolve(key)
+		return ResolvedDict()
+
+
+class TestCachedAsyncKeyTransformingDict(TestAsyncKeyTransformingDict):
+	transform_cache = TransformCache(maxsize=16)
+
+
+class TestAsyncKeyTransformingDictBehavior(unittest.IsolatedAsyncioTestCase):
+	def setUp(self):
+		self.resolver = FakeResolver()
+		self.d = TestAsyncKeyTransformingDict.with_resolver(self.resolver)
+	
+	async def test_operations_transform_key(self):
+		d = self.d
+		
+		await d.aset('Colour', 1)
+		
+		self.assertEqual(d.data, {'color': 1}, "key should be transformed by the resolver")
+		self.assertEqual(await d.aget('COLOR'), 1, "lookup should use the transformed key")
+		self.assertIsNone(await d.aget('grey'), "missing key should return default")
+		self.assertTrue(await d.acontains('colour'), "membership should use the transformed key")
+		self.assertFalse(await d.acontains('grey'), "non-existing key found")
+		self.assertEqual(await d.agetitem('Color'), 1, "lookup should use the transformed key")
+		self.assertEqual(await d.asetdefault('Grey', 2), 2, "setdefault should return default for a missing key")
+		self.assertEqual(await d.apop('colour'), 1, "pop should return the value")
+		self.assertEqual(await d.apop('colour', 'default'), 'default', "pop should return default for a missing key")
+		with self.assertRaises(KeyError):
+			await d.apop('colour')
+		with self.assertRaises(KeyError):
+			await d.agetitem('colour')
+		self.assertEqual(list(d.items()), [('gray', 2)], "items should hold transformed keys")
+	
+	async def test_aupdate(self):
+		d = self.d
+		
+		await d.aupdate({'Colour': 1, 'A': 2}, GREY=3)
+		await d.aupdate([('color', 4)])
+		
+		self.assertEqual(d.data, {'color': 4, 'a': 2, 'gray': 3}, "keys should be transformed, with the last value winning")
+	
+	async def test_aupdate_transforms_concurrently(self):
+		d = self.d
+		loop = asyncio.get_running_loop()
+		keys = [f'K{i}' for i in range(20)]
+		
+		start = loop.time()
+		await d.aupdate(dict.fromkeys(keys, 0))
+		
+		self.assertLess(loop.time() - start, self.resolver.latency * 10, "keys should be transformed concurrently")
+		self.assertEqual(len(d), 20, "all keys should be set")
+	
+	async def test_in_flight_coalescing(self):
+		d = self.d
+		
+		results = await asyncio.gather(*(d.aget('Colour') for _ in range(10)), d.aset('COLOUR', 1), d.aset('colour', 2))
+		
+		self.assertEqual(self.resolver.calls.count('Colour'), 1, "concurrent operations on the same key should share one transformation")
+		self.assertEqual(len(self.resolver.calls), 3, "different raw keys should be transformed separately")
+		self.assertEqual(results[:10], [None] * 10, "lookups should complete")
+		self.assertEqual(d._in_flight, {}, "finished transformations should not stay in flight")
+	
+	async def test_in_flight_shared_by_instances(self):
+		d2 = type(self.d)()
+		
+		await asyncio.gather(self.d.aget('Colour'), d2.aset('Colour', 1))
+		
+		self.assertEqual(self.resolver.calls, ['Colour'], "instances of the same class should share one transformation")
+		self.assertIs(d2._in_flight, self.d._in_flight, "transformations in flight should be stored in the class")
+		self.assertIsNot(self.d._in_flight, TestAsyncKeyTransformingDict._in_flight, "each subclass should have its own transformations in flight")
+	
+	async def test_acreate(self):
+		d = await type(self.d).acreate({'Colour': 1, 'A': 2}, GREY=3)
+		
+		self.assertIsInstance(d, type(self.d))
+		self.assertEqual(d.data, {'color': 1, 'a': 2, 'gray': 3}, "keys should be transformed by the resolver")
+	
+	async def test_equal_keys_of_different_types_not_coalesced(self):
+		class TypeDict(AsyncKeyTransformingDict):
+			@staticmethod
+			async def transform_key(key):
+				await asyncio.sleep(0)
+				return type(key).__name__
+		
+		d = TypeDict()
+		
+		self.assertEqual(await asyncio.gather(d.atransform_key(1), d.atransform_key(1.0), d.atransform_key(True)), ['int', 'float', 'bool'])
+	
+	async def test_no_cache_transforms_again(self):
+		await self.d.aget('Colour')
+		await self.d.aget('Colour')
+		
+		self.assertEqual(self.resolver.calls, ['Colour', 'Colour'], "without a cache, completed transformations should not be reused")
+	
+	async def test_cache(self):
+		TestCachedAsyncKeyTransformingDict.transform_cache.clear()
+		d = TestCachedAsyncKeyTransformingDict.with_resolver(self.resolver)
+		d2 = TestCachedAsyncKeyTransformingDict.with_resolver(self.resolver)
+		
+		await d.aset('Colour', 1)
+		await d.aget('Colour')
+		await d2.acontains('Colour')
+		
+		self.assertEqual(self.resolver.calls, ['Colour'], "cached transformation should be reused")
+		self.assertEqual(TestCachedAsyncKeyTransformingDict.transform_cache.info().hits, 2, "cache hits not counted")
+	
+	async def test_failure_shared_and_not_cached(self):
+		self.resolver.fail.add('Colour')
+		
+		results = await asyncio.gather(*(self.d.aget('Colour') for _ in range(3)), return_exceptions=True)
+		
+		self.assertTrue(all(isinstance(result, ConnectionError) for result in results), "failure should be raised to all waiters")
+		self.assertEqual(len(self.resolver.calls), 1, "failing transformation should be shared too")
+		self.resolver.fail.clear()
+		self.assertIsNone(await self.d.aget('Colour'), "failed transformation should be retried")
+		self.assertEqual(len(self.resolver.calls), 2, "failed transformation should not be cached")
+	
+	async def test_cancelled_waiter_does_not_cancel_others(self):
+		waiter = asyncio.ensure_future(self.d.aset('Colour', 1))
+		other = asyncio.ensure_future(self.d.aset('colour', 2))
+		await asyncio.sleep(0)
+		
+		waiter.cancel()
+		await other
+		
+		self.assertEqual(self.d.data, {'color': 2}, "other waiters should complete after one is cancelled")
+	
+	async def test_synchronous_transform(self):
+		class LowercaseAsyncDict(AsyncKeyTransformingDict):
+			@staticmethod
+			def transform_key(key):
+				return key.lower()
+		
+		d = LowercaseAsyncDict()
+		await d.aset('A', 1)
+		
+		self.assertTrue(await d.acontains('a'), "synchronous transform should be supported")
+	
+	async def test_unhashable_key(self):
+		class TupleAsyncDict(AsyncKeyTransformingDict):
+			@staticmethod
+			async def transform_key(key):
+				return tuple(key)
+		
+		d = TupleAsyncDict()
+		await d.aset(['a', 'b'], 1)
+		
+		self.assertEqual(await d.aget(['a', 'b']), 1, "unhashable keys should be transformed without coalescing")
+
+
+if __name__ == '__main__':
+	unittest.main()
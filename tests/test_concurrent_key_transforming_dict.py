@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import copy
+import gc
+import pickle
+import threading
+
+from transforming_collections import ConcurrentKeyTransformingDict, ConcurrentLowercaseDict, ConcurrentUnicaseDict
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+from tests.test_key_transforming_dict import KeyTransformingDictPerformanceTestMixin
+
+
+class TestConcurrentKeyTransformingDict(ConcurrentKeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class ConcurrentKeyTransformingDictBaseTestMixin(KeyTransformingDictBaseTestMixin):
+	# iteration order is by segment, not by insertion
+	
+	def test_iter(self):
+		d = self.test_class({self.KEY_TRANSFORMED: 1, self.KEY_TRANSFORMED_2: 2})
+		
+		keys = list(d)
+		
+		self.assertEqual(len(keys), 2, "iterating should yield all keys")
+		self.assertCountEqual(keys, [self.KEY_TRANSFORMED, self.KEY_TRANSFORMED_2], "transformed key not found in iteration")
+
+
+class TestConcurrentKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictPerformanceTestMixin, ConcurrentKeyTransformingDictBaseTestMixin):
+	test_class = TestConcurrentKeyTransformingDict
+
+
+class TestConcurrentKeyTransformingDictBehavior(unittest.TestCase):
+	test_class = TestConcurrentKeyTransformingDict
+	thread_count = 8
+	
+	def run_threads(self, target, *args):
+		barrier = threading.Barrier(self.thread_count)
+		def run(i):
+			barrier.wait()
+			target(i, *args)
+		threads = [threading.Thread(target=run, args=(i, )) for i in range(self.thread_count)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+	
+	def test_sharded_storage(self):
+		d = self.test_class((f'K{i}', i) for i in range(100))
+		
+		self.assertGreater(sum(1 for segment in d._segments if segment), 1, "entries should be spread across segments")
+		self.assertEqual(len(d), 100, "length should count entries of all segments")
+		self.assertEqual(d['k42'], 42, "lookup should use the transformed key")
+	
+	def test_setdefault_atomic(self):
+		d = self.test_class()
+		results = [None] * self.thread_count
+		
+		def target(i):
+			results[i] = d.setdefault('KEY', i)
+		
+		self.run_threads(target)
+		
+		self.assertEqual(len(set(results)), 1, "all threads should get the same value from setdefault")
+		self.assertEqual(d['key'], results[0], "setdefault value not stored")
+	
+	def test_pop_atomic(self):
+		d = self.test_class((f'K{i}', i) for i in range(1000))
+		popped = [[] for _ in range(self.thread_count)]
+		marker = object()
+		
+		def target(i):
+			for j in range(1000):
+				value = d.pop(f'k{j}', marker)
+				if value is not marker:
+					popped[i].append(value)
+		
+		self.run_threads(target)
+		
+		self.assertEqual(sorted(sum(popped, [])), list(range(1000)), "each key should be popped by exactly one thread")
+		self.assertEqual(len(d), 0, "all keys should be popped")
+	
+	def test_concurrent_updates(self):
+		d = self.test_class()
+		
+		def target(i):
+			for j in range(200):
+				d[f'T{i}-{j}'] = j
+				d.update({f'U{i}-{j}': j})
+		
+		self.run_threads(target)
+		
+		self.assertEqual(len(d), self.thread_count * 400, "concurrent writes should not be lost")
+	
+	def test_iterate_while_writing(self):
+		d = self.test_class((f'K{i}', i) for i in range(1000))
+		
+		def target(i):
+			if i % 2:
+				for j in range(1000):
+					d[f'N{i}-{j}'] = j
+			else:
+				for _ in range(5):
+					list(d.items())
+		
+		self.run_threads(target)
+	
+	def test_pickle_and_deepcopy(self):
+		d = self.test_class({'A': [1], 'B': 2})
+		
+		for d_copy in (pickle.loads(pickle.dumps(d)), copy.deepcopy(d), d.copy()):
+			self.assertEqual(d_copy, d, "copy should be equal to the original")
+			d_copy['c'] = 3
+			self.assertNotIn('c', d, "modifying copy should not modify original")
+	
+	def test_snapshot_shares_segments(self):
+		d = self.test_class((f'K{i}', i) for i in range(100))
+		
+		snapshot = d.snapshot()
+		
+		self.assertEqual(snapshot, d, "snapshot should be equal to the original")
+		self.assertTrue(all(a is b for a, b in zip(snapshot._segments, d._segments)), "snapshot should share all segments")
+		self.assertEqual(d.memory_info().shared_segments, d.segment_count, "all segments should be reported as shared")
+	
+	def test_owners_tracked_once_snapshotted(self):
+		d = self.test_class({'A': 1})
+		index = d._segment_index('a')
+		
+		self.assertEqual(d._owners, [None] * d.segment_count, "owners should not be tracked before a snapshot")
+		snapshot = d.snapshot()
+		self.assertTrue(all(owners is not None for owners in d._owners), "owners should be tracked once snapshotted")
+		d['a'] = 2
+		self.assertIsNone(d._owners[index], "copied segment should have a single owner again")
+		self.assertEqual(snapshot['a'], 1, "writing to the original should not modify the snapshot")
+	
+	def test_snapshot_write_copies_one_segment(self):
+		d = self.test_class((f'K{i}', i) for i in range(100))
+		snapshot = d.snapshot()
+		
+		d['k0'] = 'new'
+		
+		index = d._segment_index('k0')
+		self.assertEqual(snapshot['k0'], 0, "writing to the original should not modify the snapshot")
+		self.assertEqual(d['k0'], 'new', "write not applied to the original")
+		self.assertIsNot(d._segments[index], snapshot._segments[index], "written segment should be copied")
+		self.assertEqual(sum(a is not b for a, b in zip(snapshot._segments, d._segments)), 1, "only the written segment should be copied")
+		self.assertEqual(d.memory_info().shared_segments, d.segment_count - 1, "copied segment should no longer be reported as shared")
+	
+	def test_snapshot_is_writable(self):
+		d = self.test_class({'A': 1, 'B': 2})
+		snapshot = d.snapshot()
+		
+		del snapshot['a']
+		snapshot.setdefault('C', 3)
+		snapshot.pop('b')
+		
+		self.assertEqual(d, {'a': 1, 'b': 2}, "writing to the snapshot should not modify the original")
+		self.assertEqual(snapshot, {'c': 3}, "writes not applied to the snapshot")
+	
+	def test_snapshot_clear(self):
+		d = self.test_class({'A': 1})
+		snapshot = d.snapshot()
+		
+		d.clear()
+		
+		self.assertEqual(len(d), 0, "clear should remove all items")
+		self.assertEqual(snapshot, {'a': 1}, "clearing the original should not modify the snapshot")
+	
+	def test_discarded_snapshot_no_copy(self):
+		d = self.test_class({'A': 1})
+		index = d._segment_index('a')
+		segment = d._segments[index]
+		
+		snapshot = d.snapshot()
+		del snapshot
+		gc.collect()
+		d['a'] = 2
+		
+		self.assertIs(d._segments[index], segment, "segment should be written in place once snapshots are discarded")
+	
+	def test_snapshot_concurrent_writers(self):
+		d = self.test_class((f'K{i}', i) for i in range(1000))
+		snapshots = [d.snapshot() for _ in range(self.thread_count)]
+		
+		def target(i):
+			for j in range(1000):
+				snapshots[i][f'k{j}'] = i
+		
+		self.run_threads(target)
+		
+		self.assertEqual(d, {f'k{j}': j for j in range(1000)}, "writing to snapshots should not modify the original")
+		for i, snapshot in enumerate(snapshots):
+			self.assertEqual(set(snapshot.values()), {i}, "writes to one snapshot should not leak into other snapshots")
+	
+	def test_invalid_segment_count(self):
+		class NoSegmentsDict(self.test_class):
+			segment_count = 0
+		
+		with self.assertRaises(ValueError):
+			NoSegmentsDict()
+
+
+class TestConcurrentLowercaseDict(unittest.TestCase, ConcurrentKeyTransformingDictBaseTestMixin):
+	test_class = ConcurrentLowercaseDict
+
+
+class TestConcurrentUnicaseDict(unittest.TestCase, ConcurrentKeyTransformingDictBaseTestMixin):
+	test_class = ConcurrentUnicaseDict
+
+
+if __name__ == '__main__':
+	unittest.main()
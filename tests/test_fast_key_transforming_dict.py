@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import collections
+
+from transforming_collections import FastKeyTransformingDict, FastLowercaseDict, FastUnicaseDict, LowercaseDict
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+from tests.test_key_transforming_dict import KeyTransformingDictPerformanceTestMixin
+
+
+class TestFastKeyTransformingDict(FastKeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class FastKeyTransformingDictBaseTestMixin(KeyTransformingDictBaseTestMixin):
+	def test_dict_subclass(self):
+		d = self.test_class({self.KEY_UNTRANSFORMED: 1})
+		
+		self.assertIsInstance(d, dict)
+		self.assertEqual(dict(d), {self.KEY_TRANSFORMED: 1}, "builtin dict should hold transformed keys")
+	
+	def test_popitem_order(self):
+		d = self.test_class({self.KEY_TRANSFORMED: 1, self.KEY_TRANSFORMED_2: 2})
+		
+		self.assertEqual(d.popitem(), (self.KEY_TRANSFORMED, 1), "popitem should remove the first item, like KeyTransformingDict")
+	
+	# OrderedDict, defaultdict and UserDict implement | for any dict on the right-hand side,
+	# so for them the left operand decides the result type; only the remaining types are checked here
+	
+	def test_ror_add_both(self):
+		source_dict = {
+			self.KEY_UNTRANSFORMED_2: 3,
+			self.KEY_TRANSFORMED_2: 4,
+		}
+		
+		ds = (
+			source_dict,
+			collections.Counter(source_dict),
+			self.test_class(source_dict),
+		)
+		
+		for d2 in ds:
+			with self.subTest(type_=type(d2).__name__):
+				d1 = self.test_class({self.KEY_TRANSFORMED: 1})
+				
+				d3 = d2 | d1
+				
+				self.assertIsInstance(d3, self.test_class, f"result should be an instance of self.test_class, not {type(d3).__name__}")
+				self.assertEqual(len(d3), 2, f"dict should have both keys: {d3.keys()}")
+				self.assertIn(self.KEY_TRANSFORMED, d3, "untransformed key from dict 1 not found")
+				self.assertIn(self.KEY_UNTRANSFORMED, d3, "transformed key from dict 1 not found")
+				self.assertIn(self.KEY_TRANSFORMED_2, d3, "untransformed key from dict 2 not found")
+				self.assertIn(self.KEY_UNTRANSFORMED_2, d3, "transformed key from dict 2 not found")
+	
+	def test_ror_overwrite(self):
+		source_dict = {
+			self.KEY_UNTRANSFORMED : 2
+		}
+		
+		ds = (
+			source_dict,
+			collections.Counter(source_dict),
+			self.test_class(source_dict),
+		)
+		
+		for d2 in ds:
+			with self.subTest(type_=type(d2).__name__):
+				d1 = self.test_class({self.KEY_TRANSFORMED: 1})
+				
+				d3 = d2 | d1
+				
+				self.assertIsInstance(d3, self.test_class, f"result should be an instance of self.test_class, not {type(d3).__name__}")
+				self.assertEqual(len(d3), 1, "dict should have one key")
+				self.assertEqual(d3[self.KEY_UNTRANSFORMED], 1, "value of untransformed key not overwritten")
+				self.assertEqual(d3[self.KEY_TRANSFORMED], 1, "value of transformed key not overwritten")
+	
+	def test_ror_dict_subclass_left_operand(self):
+		d1 = self.test_class({self.KEY_TRANSFORMED: 1})
+		
+		d3 = collections.OrderedDict({self.KEY_UNTRANSFORMED: 2}) | d1
+		
+		self.assertIsInstance(d3, collections.OrderedDict, "left operand implementing | for dicts should decide the result type")
+	
+	def test_eq_key_transforming_dict(self):
+		d1 = self.test_class({self.KEY_UNTRANSFORMED: 1})
+		d2 = LowercaseDict({self.KEY_UNTRANSFORMED: 1})
+		
+		self.assertEqual(d1, d2, "dicts with the same transformed keys should be equal across engines")
+		self.assertEqual(d2, d1, "dicts with the same transformed keys should be equal across engines")
+
+
+class TestFastKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictPerformanceTestMixin, FastKeyTransformingDictBaseTestMixin):
+	test_class = TestFastKeyTransformingDict
+	
+	def test_ror_transform_once_per_key_other_class(self):
+		source_dict = {
+			self.KEY_UNTRANSFORMED: 1,
+			self.KEY_TRANSFORMED: 2,
+			self.KEY_UNTRANSFORMED_2: 3,
+			self.KEY_TRANSFORMED_2: 4,
+		}
+		
+		ds = (
+			source_dict,
+			collections.Counter(source_dict),
+		)
+		
+		for d2 in ds:
+			with self.subTest(type_=type(d2).__name__):
+				d1 = self.test_class({self.KEY_TRANSFORMED: 1})
+				
+				with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+					d2 | d1
+					self.assertEqual(transform_key_mock.call_count, len(d2), "transform_key should be called once for each key in the other dict")
+
+
+class TestFastLowercaseDict(unittest.TestCase, FastKeyTransformingDictBaseTestMixin):
+	test_class = FastLowercaseDict
+
+
+class TestFastUnicaseDict(unittest.TestCase, FastKeyTransformingDictBaseTestMixin):
+	test_class = FastUnicaseDict
+
+
+class TestFastKeyTransformingDictAbstract(unittest.TestCase):
+	def test_abstract_transform_key(self):
+		class NoTransformDict(FastKeyTransformingDict):
+			pass
+		
+		with self.assertRaises(TypeError, msg="dictionary without transform_key should not be instantiable"):
+			NoTransformDict()
+		with self.assertRaises(TypeError, msg="base class should not be instantiable"):
+			FastKeyTransformingDict()
+
+
+if __name__ == '__main__':
+	unittest.main()
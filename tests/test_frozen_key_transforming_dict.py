@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import collections
+import copy
+import functools
+import pickle
+
+from transforming_collections import FrozenKeyTransformingDict, FrozenLowercaseDict
+
+
+class TestFrozenKeyTransformingDict(FrozenKeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestFrozenKeyTransformingDictBehavior(unittest.TestCase):
+	test_class = TestFrozenKeyTransformingDict
+	
+	def test_init_transform_key(self):
+		for source in ({'A': 1, 'b': 2}, [('A', 1), ('b', 2)], collections.UserDict({'A': 1, 'b': 2})):
+			with self.subTest(source=source):
+				d = self.test_class(source)
+				self.assertEqual(d.data, {'a': 1, 'b': 2}, "keys should be transformed on initialization")
+		self.assertEqual(self.test_class(A=1).data, {'a': 1}, "kwargs keys should be transformed on initialization")
+		self.assertEqual(self.test_class.fromkeys(['A', 'a']).data, {'a': None}, "fromkeys should transform keys")
+	
+	def test_lookup_transform_key(self):
+		d = self.test_class({'A': 1})
+		
+		self.assertEqual(d['a'], 1, "lookup should use the transformed key")
+		self.assertEqual(d.get('A'), 1, "lookup should use the transformed key")
+		self.assertIsNone(d.get('B'), "missing key should return default")
+		self.assertIn('A', d, "membership should use the transformed key")
+		self.assertIn(('A', 1), d.items(), "items membership should use the transformed key")
+		self.assertEqual(list(d.values()), [1], "values not returned")
+	
+	def test_immutable(self):
+		d = self.test_class({'A': 1})
+		
+		with self.assertRaises(TypeError):
+			d['b'] = 2
+		with self.assertRaises(TypeError):
+			del d['a']
+		self.assertFalse(hasattr(d, 'update'), "frozen dict should not support updating")
+	
+	def test_hash(self):
+		d = self.test_class({'A': 1, 'b': 2})
+		
+		self.assertEqual(hash(d), hash(frozenset({'a': 1, 'b': 2}.items())), "hash should match the hash of transformed items")
+		self.assertEqual(hash(d), hash(self.test_class({'a': 1, 'B': 2})), "equal frozen dicts should have equal hashes")
+		self.assertEqual({d: 'value'}[self.test_class(a=1, b=2)], 'value', "equal frozen dicts should be usable as the same dict key")
+	
+	def test_hash_cached(self):
+		d = self.test_class({'A': 1})
+		hash(d)
+		
+		with unittest.mock.patch('builtins.frozenset', side_effect=AssertionError("hash recomputed")):
+			hash(d)
+	
+	def test_hash_unhashable_values(self):
+		d = self.test_class({'A': []})
+		
+		with self.assertRaises(TypeError):
+			hash(d)
+	
+	def test_lru_cache_argument(self):
+		calls = []
+		
+		@functools.lru_cache
+		def f(d):
+			calls.append(d)
+			return len(d)
+		
+		f(self.test_class({'A': 1}))
+		f(self.test_class({'a': 1}))
+		
+		self.assertEqual(len(calls), 1, "equal frozen dicts should hit the same lru_cache entry")
+	
+	def test_eq(self):
+		d = self.test_class({'A': 1})
+		
+		self.assertEqual(d, {'a': 1}, "dicts with same items should be equal")
+		self.assertEqual(d, self.test_class({'a': 1}), "frozen dicts with same items (up to transformation) should be equal")
+		self.assertNotEqual(d, {'A': 1}, "dicts with same items (up to transformation) should not be equal unless the keys are exactly equal")
+		self.assertNotEqual(d, self.test_class({'a': 2}), "frozen dicts with different values should not be equal")
+	
+	def test_copy_returns_self(self):
+		d = self.test_class({'A': (1, 2)})
+		
+		self.assertIs(d.copy(), d, "copy should return the same object")
+		self.assertIs(copy.copy(d), d, "copy.copy should return the same object")
+		self.assertIs(copy.deepcopy(d), d, "copy.deepcopy should return the same object when values are immutable")
+	
+	def test_deepcopy_mutable_values(self):
+		d = self.test_class({'A': [1]})
+		
+		d_copy = copy.deepcopy(d)
+		d_copy['a'].append(2)
+		
+		self.assertIsNot(d_copy, d, "copy.deepcopy should copy when values are mutable")
+		self.assertEqual(d['a'], [1], "modifying deep copy should not modify original")
+	
+	def test_deepcopy_hashable_mutable_values(self):
+		class Box:
+			pass
+		
+		box = Box()
+		d = self.test_class({'A': box, 'B': 1})
+		
+		d_copy = copy.deepcopy(d)
+		
+		self.assertIsNot(d_copy, d, "copy.deepcopy should copy when values are mutable, even if hashable")
+		self.assertIsNot(d_copy['a'], box, "mutable values should be deep copied")
+		self.assertIs(d['a'], box, "original should keep its values")
+	
+	def test_deepcopy_cycle(self):
+		values = []
+		d = self.test_class({'A': values})
+		values.append(d)
+		
+		d_copy = copy.deepcopy(d)
+		
+		self.assertIs(d_copy['a'][0], d_copy, "reference cycles should be copied as cycles")
+	
+	def test_init_same_class_shares_data(self):
+		d = self.test_class({'A': 1})
+		
+		self.assertIs(self.test_class(d).data, d.data, "frozen dicts of the same class should share storage")
+	
+	def test_or(self):
+		d = self.test_class({'A': 1, 'b': 2})
+		
+		for other in ({'B': 3, 'C': 4}, self.test_class({'B': 3, 'C': 4}), collections.UserDict({'B': 3, 'C': 4})):
+			with self.subTest(other=other):
+				result = d | other
+				self.assertIsInstance(result, self.test_class, f"result should be an instance of self.test_class, not {type(result).__name__}")
+				self.assertEqual(result.data, {'a': 1, 'b': 3, 'c': 4}, "keys of the other mapping should be transformed")
+		result = {'B': 3, 'C': 4} | d
+		self.assertIsInstance(result, self.test_class, f"result should be an instance of self.test_class, not {type(result).__name__}")
+		self.assertEqual(result.data, {'b': 2, 'c': 4, 'a': 1}, "keys of the other mapping should be transformed")
+		d_before = d
+		d |= {'C': 4}
+		self.assertIsNot(d, d_before, "in-place or should create a new object")
+		self.assertEqual(d_before.data, {'a': 1, 'b': 2}, "in-place or should not modify the original")
+	
+	def test_same_class_no_transforms(self):
+		d1 = self.test_class({'A': 1})
+		d2 = self.test_class({'B': 2})
+		operations = {
+			'init':                 lambda: self.test_class(d1),
+			'or':                   lambda: d1 | d2,
+			'eq':                   lambda: d1 == d2,
+			'hash':                 lambda: hash(d1),
+			'copy':                 lambda: copy.copy(d1),
+			'deepcopy':             lambda: copy.deepcopy(d1),
+			'iter':                 lambda: list(d1.items()),
+		}
+		
+		for name, operation in operations.items():
+			with self.subTest(operation=name):
+				with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+					operation()
+					self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not be called for operations with the same class")
+	
+	def test_pickle(self):
+		d = self.test_class({'A': 1})
+		hash(d)
+		
+		d_unpickled = pickle.loads(pickle.dumps(d))
+		
+		self.assertEqual(d_unpickled, d, "unpickled frozen dict should be equal to the original")
+		self.assertIsNone(d_unpickled._hash, "cached hash should not be pickled")
+	
+	def test_lowercase(self):
+		d = FrozenLowercaseDict({'A': 1, 2: 'two'})
+		
+		self.assertEqual(d.data, {'a': 1, 2: 'two'}, "keys should be lowercased")
+
+
+if __name__ == '__main__':
+	unittest.main()
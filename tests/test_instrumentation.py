@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import gc
+
+from transforming_collections import ConcurrentKeyTransformingDict, KeyTransformingDict, TransformCache
+from transforming_collections import instrumentation
+
+
+class TestKeyTransformingDict(KeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestInstrumentation(unittest.TestCase):
+	def setUp(self):
+		TestKeyTransformingDict.enable_instrumentation()
+		self.addCleanup(TestKeyTransformingDict.disable_instrumentation)
+	
+	def test_transforms_per_operation(self):
+		d = TestKeyTransformingDict({'A': 1, 'B': 2})
+		d['C'] = 3
+		d.get('a')
+		d.update({'D': 4})
+		
+		self.assertEqual(TestKeyTransformingDict.stats().transforms, {'__init__': 2, '__setitem__': 1, 'get': 1, 'update': 1}, "transformations should be attributed to the outermost operation")
+	
+	def test_no_transforms_counted(self):
+		d = TestKeyTransformingDict({'A': 1})
+		instrumentation.reset(TestKeyTransformingDict)
+		
+		d.copy()
+		d | TestKeyTransformingDict({})
+		d == TestKeyTransformingDict(d)
+		
+		self.assertEqual(TestKeyTransformingDict.stats().transforms, {}, "operations between instances of the same class should not transform keys")
+	
+	def test_latency_histogram(self):
+		d = TestKeyTransformingDict()
+		d['A'] = 1
+		d['B'] = 2
+		
+		latency = TestKeyTransformingDict.stats().latency
+		self.assertEqual(list(latency), ['__setitem__'], "latency should be recorded per operation")
+		self.assertEqual(sum(latency['__setitem__'].values()), 2, "every transformation should fall in a bucket")
+		for bound in latency['__setitem__']:
+			self.assertEqual(bound & (bound - 1), 0, "bucket bounds should be powers of two")
+	
+	def test_hits_misses(self):
+		d = TestKeyTransformingDict({'A': 1})
+		instrumentation.reset(TestKeyTransformingDict)
+		
+		d['a']
+		'A' in d
+		self.assertIsNone(d.get('B'), "get should return the default for a missing key")
+		self.assertEqual(d.get('B', 2), 2, "get should return the default for a missing key")
+		self.assertEqual(d.pop('C', 3), 3, "pop should return the default for a missing key")
+		d.setdefault('D', 4)
+		d.setdefault('d', 5)
+		with self.assertRaises(KeyError):
+			d['E']
+		
+		stats = TestKeyTransformingDict.stats()
+		self.assertEqual((stats.hits, stats.misses), (3, 5), "lookups should be counted as hits or misses")
+	
+	def test_lookup_keyword_arguments(self):
+		d = TestKeyTransformingDict({'A': 1, 'B': 2})
+		instrumentation.reset(TestKeyTransformingDict)
+		
+		self.assertEqual(d.get(key='A'), 1, "get should accept the key by keyword")
+		self.assertEqual(d.get(key='C', default=3), 3, "get should return the default given by keyword")
+		self.assertEqual(d.get('C', default=4), 4, "get should return the default given by keyword")
+		self.assertEqual(d.pop(key='C', default=5), 5, "pop should return the default given by keyword")
+		self.assertEqual(d.pop(key='B'), 2, "pop should accept the key by keyword")
+		with self.assertRaises(KeyError):
+			d.pop(key='B')
+		
+		stats = TestKeyTransformingDict.stats()
+		self.assertEqual((stats.hits, stats.misses), (2, 4), "lookups with keyword arguments should be counted as hits or misses")
+	
+	def test_count_transforms(self):
+		d = TestKeyTransformingDict({'A': 1})
+		
+		with TestKeyTransformingDict.count_transforms() as counts:
+			d['A']
+			d.get_many(['A', 'B'])
+		d['A']
+		
+		self.assertEqual(counts, {'__getitem__': 1, 'get_many': 2}, "only transformations inside the context should be counted")
+	
+	def test_disable_restores_methods(self):
+		class OtherDict(TestKeyTransformingDict):
+			@staticmethod
+			def transform_key(key):
+				return str.upper(key)
+		
+		methods = dict(vars(OtherDict))
+		OtherDict.enable_instrumentation()
+		OtherDict.disable_instrumentation()
+		
+		self.assertEqual(dict(vars(OtherDict)), methods, "disabling should restore the class as it was")
+		self.assertEqual(OtherDict({'a': 1}).data, {'A': 1}, "restored class should transform keys")
+	
+	def test_count_transforms_not_enabled(self):
+		class OtherDict(TestKeyTransformingDict):
+			pass
+		
+		with OtherDict.count_transforms() as counts:
+			OtherDict(a=1)
+		
+		self.assertEqual(counts, {'__init__': 1}, "count_transforms should instrument the class while active")
+		self.assertFalse(instrumentation.is_enabled(OtherDict), "instrumentation should be disabled after the context")
+	
+	def test_cache_stats(self):
+		class CachedDict(KeyTransformingDict):
+			transform_cache = TransformCache()
+			transform_key = staticmethod(str.lower)
+		
+		CachedDict(A=1)['A']
+		
+		self.assertEqual(CachedDict.stats().cache.hits, 1, "transform cache counters should be reported")
+		self.assertIsNone(TestKeyTransformingDict.stats().cache, "classes without a transform cache should report no cache counters")
+	
+	
+	def test_segment_memory(self):
+		class SegmentedDict(ConcurrentKeyTransformingDict):
+			transform_key = staticmethod(str.lower)
+		
+		SegmentedDict.enable_instrumentation()
+		self.addCleanup(SegmentedDict.disable_instrumentation)
+		d = SegmentedDict((f'K{i}', i) for i in range(100))
+		count = SegmentedDict.segment_count
+		
+		before = SegmentedDict.stats().segments
+		snapshot = d.snapshot()
+		shared = SegmentedDict.stats().segments
+		d['k0'] = 'new'
+		written = SegmentedDict.stats().segments
+		del d, snapshot
+		gc.collect()
+		
+		self.assertEqual((before.segments, before.shared_segments, before.shared_bytes), (count, 0, 0), "segments should be owned before a snapshot")
+		self.assertEqual((shared.segments, shared.shared_segments), (count, count), "segments shared with a snapshot should be counted once")
+		self.assertEqual((shared.owned_bytes, shared.shared_bytes), (0, before.owned_bytes), "bytes of shared segments should be reported as shared")
+		self.assertEqual((written.segments, written.shared_segments), (count + 1, count - 1), "written segment should be copied")
+		self.assertEqual(SegmentedDict.stats().segments.segments, 0, "collected instances should not be reported")
+		self.assertIsNone(TestKeyTransformingDict.stats().segments, "classes without segments should report no segment memory")
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import gc
+import pickle
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+from transforming_collections import (
+	ConcurrentKeyTransformingDict, FastKeyTransformingDict, FrozenKeyTransformingDict, FrozenKeyTransformingSet, KeyPreservingTransformingDict,
+	KeyTransformingDict, KeyTransformingSet, TransformCache,
+)
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+from tests.test_key_transforming_dict import KeyTransformingDictPerformanceTestMixin
+
+
+class TestInternedKeyTransformingDict(KeyTransformingDict):
+	intern_keys = True
+	
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+def interned_class(base):
+	return type(f'Interned{base.__name__}', (base, ), {'intern_keys': True, 'transform_key': staticmethod(str.lower), '__module__': __name__})
+
+
+InternedFastKeyTransformingDict = interned_class(FastKeyTransformingDict)
+InternedFrozenKeyTransformingDict = interned_class(FrozenKeyTransformingDict)
+InternedKeyPreservingTransformingDict = interned_class(KeyPreservingTransformingDict)
+InternedConcurrentKeyTransformingDict = interned_class(ConcurrentKeyTransformingDict)
+InternedKeyTransformingSet = interned_class(KeyTransformingSet)
+InternedFrozenKeyTransformingSet = interned_class(FrozenKeyTransformingSet)
+
+
+class FrozensetKey:
+	"""
+	Transformation of iterables to frozensets, which are interned in the weak table.
+	"""
+	@staticmethod
+	def transform_key(key):
+		if isinstance(key, str):
+			return key
+		return frozenset(key)
+
+
+def fresh(text):
+	# equal, but distinct string objects, as read from records
+	return ''.join(list(text))
+
+
+class TestKeyInterning(unittest.TestCase):
+	def test_str_keys_shared_across_instances(self):
+		for base in (KeyTransformingDict, FastKeyTransformingDict):
+			with self.subTest(base=base.__name__):
+				class InternedDict(base):
+					intern_keys = True
+					transform_key = staticmethod(str.lower)
+				
+				first = InternedDict({fresh('Field'): 1})
+				second = InternedDict({fresh('FIELD'): 2})
+				
+				self.assertIs(next(iter(first)), next(iter(second)), "equal transformed keys should be the same object")
+	
+	def test_set_elements_shared(self):
+		class InternedSet(KeyTransformingSet):
+			intern_keys = True
+			transform_key = staticmethod(str.lower)
+		
+		first = InternedSet([fresh('Field')])
+		second = InternedSet([fresh('FIELD')])
+		
+		self.assertIs(next(iter(first)), next(iter(second)), "equal transformed elements should be the same object")
+	
+	def test_lookup_key_identical(self):
+		d = TestInternedKeyTransformingDict({fresh('Field'): 1})
+		
+		self.assertIs(d.transform_key(fresh('FIELD')), next(iter(d)), "transformed lookup key should be the stored object")
+	
+	def test_non_str_keys_weak_table(self):
+		class InternedDict(FrozensetKey, KeyTransformingDict):
+			intern_keys = True
+		
+		first = InternedDict({('a', 'b'): 1})
+		second = InternedDict({('b', 'a'): 2})
+		
+		self.assertIs(next(iter(first)), next(iter(second)), "equal weakly referenceable keys should be the same object")
+		self.assertEqual(len(InternedDict._intern_table), 1, "canonical key should be in the intern table")
+		del first, second
+		gc.collect()
+		self.assertEqual(len(InternedDict._intern_table), 0, "intern table should not keep keys alive")
+	
+	def test_unsupported_keys_unchanged(self):
+		class InternedDict(KeyTransformingDict):
+			intern_keys = True
+			transform_key = staticmethod(tuple)
+		
+		key = ('a', ['b'])
+		
+		self.assertEqual(InternedDict.transform_key(key), key, "unhashable key should be returned as is")
+		self.assertEqual(InternedDict({'ab': 1}).data, {('a', 'b'): 1}, "keys that are not weakly referenceable should be stored as they are")
+	
+	def test_cached_keys_interned(self):
+		class InternedDict(KeyTransformingDict):
+			intern_keys = True
+			transform_cache = TransformCache()
+			transform_key = staticmethod(str.lower)
+		
+		InternedDict({fresh('Field'): 1})
+		
+		self.assertIs(InternedDict.transform_cache.get('Field'), 'field', "cache should hold the interned key")
+	
+	def test_subclass_transform_key_interned(self):
+		class UpperDict(TestInternedKeyTransformingDict):
+			transform_key = staticmethod(str.upper)
+		
+		self.assertIs(UpperDict.transform_key(fresh('field')), 'FIELD', "subclass transformation should be interned")
+	
+	def test_not_interned_by_default(self):
+		class PlainDict(KeyTransformingDict):
+			transform_key = staticmethod(str.lower)
+		
+		first = PlainDict({fresh('Field'): 1})
+		second = PlainDict({fresh('FIELD'): 2})
+		
+		self.assertIsNot(next(iter(first)), next(iter(second)), "keys should not be interned unless intern_keys is set")
+
+
+class TestKeyTransformingMixin(unittest.TestCase):
+	def test_transform_key_abstract(self):
+		bases = (
+			KeyTransformingDict, FastKeyTransformingDict, FrozenKeyTransformingDict, KeyPreservingTransformingDict,
+			ConcurrentKeyTransformingDict, KeyTransformingSet, FrozenKeyTransformingSet,
+		)
+		for base in bases:
+			with self.subTest(base=base.__name__):
+				self.assertIn('transform_key', base.__abstractmethods__, "transform_key should be abstract until implemented")
+				self.assertFalse(interned_class(base).__abstractmethods__, "subclass implementing transform_key should be concrete")
+
+
+class TestKeyInterningBulkPaths(unittest.TestCase):
+	def test_unpickled_keys_interned(self):
+		dicts = (
+			TestInternedKeyTransformingDict, InternedFastKeyTransformingDict, InternedFrozenKeyTransformingDict,
+			InternedKeyPreservingTransformingDict, InternedConcurrentKeyTransformingDict,
+		)
+		for cls in dicts + (InternedKeyTransformingSet, InternedFrozenKeyTransformingSet):
+			with self.subTest(cls=cls.__name__):
+				obj = cls({fresh('Field'): 1} if cls in dicts else [fresh('Field')])
+				canonical = cls.transform_key(fresh('FIELD'))
+				for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+					unpickled = pickle.loads(pickle.dumps(obj, protocol))
+					self.assertEqual(unpickled, obj, "unpickled instance should be equal to original")
+					# the key preserving dictionary iterates the original keys, so its transformed keys are checked directly
+					storage = unpickled._data if isinstance(unpickled, KeyPreservingTransformingDict) else unpickled
+					self.assertIs(next(iter(storage)), canonical, "unpickled keys should be interned")
+	
+	def test_unpickled_keys_not_interned_by_default(self):
+		class PlainDict(KeyTransformingDict):
+			transform_key = staticmethod(str.lower)
+		
+		with unittest.mock.patch('transforming_collections.key_interning._canonical') as canonical_mock:
+			PlainDict({fresh('Field'): 1}).__reduce_ex__(2)
+			canonical_mock.assert_not_called()
+	
+	def test_from_pairs_parallel_keys_interned(self):
+		pairs = [(fresh(f'Field{i % 10}'), i) for i in range(100)]
+		
+		d = TestInternedKeyTransformingDict.from_pairs_parallel(pairs, workers=2, chunksize=10)
+		
+		for key in d:
+			self.assertIs(key, TestInternedKeyTransformingDict.transform_key(fresh(key)), "keys transformed by workers should be interned")
+	
+	@unittest.skipUnless(numpy, "requires NumPy")
+	def test_vectorized_keys_interned(self):
+		class VectorizedDict(TestInternedKeyTransformingDict):
+			vectorized_transform_key = staticmethod(lambda keys: numpy.strings.lower(keys).tolist())
+		
+		d = VectorizedDict.from_columns(numpy.array(['Field', 'Other']), [1, 2])
+		
+		self.assertIs(next(iter(d)), VectorizedDict.transform_key(fresh('FIELD')), "keys transformed by vectorized_transform_key should be interned")
+
+
+class TestInternedKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictPerformanceTestMixin, KeyTransformingDictBaseTestMixin):
+	test_class = TestInternedKeyTransformingDict
+
+
+if __name__ == '__main__':
+	unittest.main()
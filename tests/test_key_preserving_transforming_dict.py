@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import copy
+import pickle
+
+from transforming_collections import KeyPreservingTransformingDict
+
+
+class TestKeyPreservingTransformingDict(KeyPreservingTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestKeyPreservingTransformingDictBehavior(unittest.TestCase):
+	test_class = TestKeyPreservingTransformingDict
+	
+	def test_iter_original_keys(self):
+		d = self.test_class({'Content-Type': 1, 'Accept': 2})
+		
+		self.assertEqual(list(d), ['Content-Type', 'Accept'], "iteration should yield original keys")
+		self.assertEqual(list(d.keys()), ['Content-Type', 'Accept'], "keys should yield original keys")
+		self.assertEqual(list(d.items()), [('Content-Type', 1), ('Accept', 2)], "items should yield original keys")
+		self.assertEqual(list(d.values()), [1, 2], "values not yielded in insertion order")
+	
+	def test_lookup_transformed(self):
+		d = self.test_class({'Content-Type': 1})
+		
+		self.assertEqual(d['content-type'], 1, "lookup should use the transformed key")
+		self.assertEqual(d.get('CONTENT-TYPE'), 1, "lookup should use the transformed key")
+		self.assertIn('CONTENT-type', d, "membership should use the transformed key")
+		self.assertIn(('content-TYPE', 1), d.items(), "items membership should use the transformed key")
+		self.assertIn('content-type', d.keys(), "keys membership should use the transformed key")
+	
+	def test_setitem_keeps_last_inserted_key(self):
+		d = self.test_class({'Content-Type': 1})
+		
+		d['CONTENT-TYPE'] = 2
+		
+		self.assertEqual(len(d), 1, "setting the same key (up to transformation) should not increase length")
+		self.assertEqual(list(d.items()), [('CONTENT-TYPE', 2)], "last inserted key should be kept")
+	
+	def test_delete_and_reinsert_order(self):
+		d = self.test_class({'a': 1, 'B': 2, 'c': 3})
+		
+		del d['A']
+		d.pop('C')
+		d['D'] = 4
+		
+		self.assertEqual(list(d.items()), [('B', 2), ('D', 4)], "deleted keys should not be iterated")
+		self.assertEqual(len(d), 2, "deleted keys should not be counted")
+	
+	def test_original_keys_stored_when_different(self):
+		d = self.test_class({'content-type': 1, 'Accept': 2})
+		
+		self.assertEqual(d._original_keys, {'accept': 'Accept'}, "only original keys that differ from their transformation should be stored")
+		d['CONTENT-TYPE'] = 3
+		d['accept'] = 4
+		self.assertEqual(d._original_keys, {'content-type': 'CONTENT-TYPE'}, "original keys should follow the last inserted key")
+		self.assertEqual(list(d.items()), [('CONTENT-TYPE', 3), ('accept', 4)], "iteration should yield the last inserted keys")
+		del d['Content-Type']
+		self.assertEqual(d._original_keys, {}, "original key should be removed with its entry")
+	
+	def test_popitem(self):
+		d = self.test_class({'A': 1, 'B': 2})
+		
+		self.assertEqual(d.popitem(), ('A', 1), "popitem should return the first original key")
+		self.assertEqual(d.popitem(), ('B', 2), "popitem should return the next original key")
+		with self.assertRaises(KeyError):
+			d.popitem()
+	
+	def test_missing_key(self):
+		d = self.test_class()
+		
+		with self.assertRaises(KeyError):
+			d['a']
+		with self.assertRaises(KeyError):
+			del d['a']
+		with self.assertRaises(KeyError):
+			d.pop('a')
+		self.assertEqual(d.pop('a', 0), 0, "pop should return specified default value")
+	
+	def test_setdefault(self):
+		d = self.test_class({'A': 1})
+		
+		self.assertEqual(d.setdefault('a', 2), 1, "present value not returned")
+		self.assertEqual(d.setdefault('B', 3), 3, "default value not returned")
+		self.assertEqual(list(d), ['A', 'B'], "existing key should be kept by setdefault")
+	
+	def test_eq(self):
+		d = self.test_class({'A': 1})
+		
+		self.assertEqual(d, self.test_class({'a': 1}), "dicts with same keys (up to transformation) should be equal")
+		self.assertEqual(d, {'a': 1}, "dicts with same keys (up to transformation) should be equal")
+		self.assertNotEqual(d, {'a': 2}, "dicts with different values should not be equal")
+	
+	def test_copies(self):
+		d = self.test_class({'A': 1, 'b': 2})
+		del d['b']
+		
+		for copier in (self.test_class.copy, copy.copy, copy.deepcopy, lambda d: pickle.loads(pickle.dumps(d))):
+			with self.subTest(copier=copier):
+				with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+					d_copy = copier(d)
+					self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not have been called during copying")
+				self.assertIsNot(d_copy, d, "copy should not be the same object as original")
+				self.assertEqual(list(d_copy.items()), [('A', 1)], "copy should preserve original keys")
+				d_copy['C'] = 3
+				self.assertNotIn('C', d, "modifying copy should not modify original")
+	
+	def test_or(self):
+		d1 = self.test_class({'A': 1})
+		d2 = self.test_class({'a': 2, 'B': 3})
+		
+		self.assertEqual(list((d1 | d2).items()), [('a', 2), ('B', 3)], "right operand should overwrite keys and values")
+		self.assertEqual(list(({'A': 0} | d1).items()), [('A', 1)], "right operand should overwrite values")
+		d1 |= {'C': 4}
+		self.assertEqual(list(d1), ['A', 'C'], "in-place or should add keys")
+	
+	def test_iteration_no_transform(self):
+		d = self.test_class({'A': 1, 'B': 2})
+		
+		with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+			list(d)
+			list(d.keys())
+			list(d.items())
+			list(d.values())
+			repr(d)
+			self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not have been called during iteration")
+	
+	def test_transform_once(self):
+		operations = {
+			'getitem':    lambda d: d['a'],
+			'get':        lambda d: d.get('a'),
+			'contains':   lambda d: 'a' in d,
+			'setitem':    lambda d: d.__setitem__('a', 2),
+			'delitem':    lambda d: d.__delitem__('a'),
+			'pop':        lambda d: d.pop('a'),
+			'setdefault': lambda d: d.setdefault('a', 2),
+		}
+		
+		for name, operation in operations.items():
+			with self.subTest(operation=name):
+				d = self.test_class({'A': 1})
+				with unittest.mock.patch.object(d, 'transform_key', wraps=d.transform_key) as transform_key_mock:
+					operation(d)
+					transform_key_mock.assert_called_once()
+
+
+if __name__ == '__main__':
+	unittest.main()
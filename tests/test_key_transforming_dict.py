@@ -3,6 +3,12 @@
 import unittest
 import unittest.mock
 import collections
+import copy
+import json
+import os
+import pickle
+import tempfile
+import tracemalloc
 
 from transforming_collections import KeyTransformingDict
 from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
@@ -303,6 +309,18 @@ class KeyTransformingDictPerformanceTestMixin:
 			copy.deepcopy(d)
 			self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not have been called during copying")
 	
+	def test_pickle_no_transforms(self):
+		d = self.test_class({self.KEY_TRANSFORMED: 1, self.KEY_TRANSFORMED_2: 2})
+		
+		for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+			with self.subTest(protocol=protocol):
+				pickled = pickle.dumps(d, protocol)
+				with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+					d_unpickled = pickle.loads(pickled)
+					self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not have been called during unpickling")
+				self.assertIs(type(d_unpickled), self.test_class, "unpickled dictionary should be of the same class")
+				self.assertEqual(d_unpickled, d, "unpickled dictionary should be equal to the original")
+	
 	def test_or_no_transform_this_class(self):
 		d1 = self.test_class({self.KEY_TRANSFORMED: 1, self.KEY_TRANSFORMED_2: 2})
 		d2 = self.test_class({self.KEY_TRANSFORMED: 3, self.KEY_TRANSFORMED_3: 4})
@@ -446,5 +464,315 @@ class TestKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictP
 	test_class = TestKeyTransformingDict
 
 
+class TestKeyTransformingDictBatch(unittest.TestCase):
+	test_class = TestKeyTransformingDict
+	
+	def test_get_many(self):
+		d = self.test_class({'a': 1, 'b': 2})
+		
+		self.assertEqual(d.get_many(['B', 'x', 'A']), [2, None, 1], "values should be returned in input order")
+		self.assertEqual(d.get_many(['X'], 0), [0], "missing key should return specified default value")
+	
+	def test_from_columns(self):
+		d = self.test_class.from_columns(['A', 'b', 'a'], [1, 2, 3])
+		
+		self.assertEqual(d.data, {'a': 3, 'b': 2}, "keys should be transformed, with the last value winning")
+		with self.assertRaises(ValueError):
+			self.test_class.from_columns(['A', 'b'], [1])
+	
+	def test_from_pairs_parallel(self):
+		pairs = [(f'K{i % 150}', i) for i in range(300)] + [(f'k{i}', -i) for i in range(0, 300, 7)]
+		expected = self.test_class()
+		expected.update(pairs)
+		
+		for workers, chunksize in ((2, 16), (2, 1000), (1, 16)):
+			with self.subTest(workers=workers, chunksize=chunksize):
+				d = self.test_class.from_pairs_parallel(iter(pairs), workers=workers, chunksize=chunksize)
+				self.assertIs(type(d), self.test_class, "result should be an instance of the class")
+				self.assertEqual(list(d.items()), list(expected.items()), "result should be identical to the serial update, including order")
+	
+	def test_from_pairs_parallel_small_input_serial(self):
+		with unittest.mock.patch('concurrent.futures.ProcessPoolExecutor') as executor_mock:
+			d = self.test_class.from_pairs_parallel({'A': 1, 'b': 2}, workers=4)
+			executor_mock.assert_not_called()
+		self.assertEqual(d.data, {'a': 1, 'b': 2}, "keys should be transformed")
+	
+	def test_from_iterable(self):
+		progress = unittest.mock.Mock()
+		
+		d = self.test_class.from_iterable(((f'K{i % 5}', i) for i in range(12)), chunksize=5, progress=progress)
+		
+		self.assertEqual(d.data, {'k0': 10, 'k1': 11, 'k2': 7, 'k3': 8, 'k4': 9}, "keys should be transformed, with the last value winning")
+		self.assertEqual(progress.call_args_list, [unittest.mock.call(5), unittest.mock.call(10), unittest.mock.call(12)], "progress should be reported after each chunk")
+	
+	def test_from_iterable_peak_memory(self):
+		def pairs():
+			for i in range(20_000):
+				yield (f'Key-{i:06}', i)
+		
+		def peak(function):
+			tracemalloc.start()
+			try:
+				result = function()
+				return tracemalloc.get_traced_memory()[1], result
+			finally:
+				tracemalloc.stop()
+		
+		streamed_peak, streamed = peak(lambda: self.test_class.from_iterable(pairs(), chunksize=500))
+		materialized_peak, materialized = peak(lambda: self.test_class(list(pairs())))
+		
+		self.assertEqual(streamed, materialized, "streamed construction should give the same result")
+		self.assertLess(streamed_peak, 0.8 * materialized_peak, "streamed construction should not hold the whole input in memory")
+	
+	def test_from_jsonl(self):
+		path = self.write_file('data.jsonl', '{"name": "A", "id": 1}\n\n{"name": "b", "id": 2}\n{"name": "a", "id": 3}\n')
+		progress = unittest.mock.Mock()
+		
+		d = self.test_class.from_jsonl(path, 'name', 'id', chunksize=2, progress=progress)
+		records = self.test_class.from_jsonl(path, 'name')
+		
+		self.assertEqual(d.data, {'a': 3, 'b': 2}, "keys should be transformed, with the last value winning")
+		self.assertEqual(progress.call_args_list, [unittest.mock.call(2), unittest.mock.call(3)], "progress should be reported after each chunk")
+		self.assertEqual(records['B'], {'name': 'b', 'id': 2}, "whole objects should be values without a value field")
+	
+	def test_from_csv(self):
+		path = self.write_file('data.csv', 'name;id\nA;1\nb;2\na;3\n')
+		
+		d = self.test_class.from_csv(path, 'name', 'id', delimiter=';')
+		rows = self.test_class.from_csv(path, 'name', delimiter=';')
+		
+		self.assertEqual(d.data, {'a': '3', 'b': '2'}, "keys should be transformed, with the last value winning")
+		self.assertEqual(rows['B'], {'name': 'b', 'id': '2'}, "whole rows should be values without a value column")
+	
+	def write_file(self, name, content):
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		path = os.path.join(directory.name, name)
+		with open(path, 'w', encoding='utf-8') as file:
+			file.write(content)
+		return path
+	
+	def test_contains_many(self):
+		d = self.test_class({'a': 1})
+		
+		self.assertEqual(d.contains_many(['A', 'b', 'a']), [True, False, True], "membership should be returned in input order")
+	
+	def test_set_many(self):
+		sources = (
+			{'A': 1, 'b': 2},
+			[('A', 1), ('b', 2)],
+		)
+		
+		for source in sources:
+			with self.subTest(type_=type(source).__name__):
+				d = self.test_class({'a': 0})
+				
+				d.set_many(source)
+				
+				self.assertEqual(d, self.test_class({'a': 1, 'b': 2}), "all items should be set")
+	
+	def test_set_many_last_wins(self):
+		d = self.test_class()
+		
+		d.set_many([('A', 1), ('a', 2)])
+		
+		self.assertEqual(d['a'], 2, "later key (up to transformation) should overwrite earlier one")
+	
+	def test_set_many_all_or_nothing(self):
+		d = self.test_class({'a': 0})
+		
+		with self.assertRaises(TypeError):
+			d.set_many([('A', 1), (None, 2)])
+		self.assertEqual(d, self.test_class({'a': 0}), "no item should be set when a key cannot be transformed")
+	
+	def test_delete_many(self):
+		d = self.test_class({'a': 1, 'b': 2, 'c': 3})
+		
+		d.delete_many(['A', 'b', 'a'])
+		
+		self.assertEqual(list(d), ['c'], "all keys should be deleted")
+	
+	def test_delete_many_all_or_nothing(self):
+		d = self.test_class({'a': 1, 'b': 2})
+		
+		with self.assertRaises(KeyError):
+			d.delete_many(['A', 'x'])
+		self.assertEqual(len(d), 2, "no key should be deleted when a key is missing")
+	
+	def test_transform_once_per_key(self):
+		keys = ['A', 'B', 'C']
+		operations = {
+			'get_many':      lambda d: d.get_many(keys),
+			'contains_many': lambda d: d.contains_many(keys),
+			'set_many':      lambda d: d.set_many((key, 1) for key in keys),
+			'delete_many':   lambda d: d.delete_many(keys),
+		}
+		
+		for name, operation in operations.items():
+			with self.subTest(operation=name):
+				d = self.test_class({'a': 1, 'b': 2, 'c': 3})
+				with unittest.mock.patch.object(d, 'transform_key', wraps=d.transform_key) as transform_key_mock:
+					operation(d)
+					self.assertEqual(transform_key_mock.call_count, len(keys), "transform_key should be called once for each key")
+	
+	def test_transform_keys_hook(self):
+		class BatchTransformingDict(self.test_class):
+			@staticmethod
+			def transform_keys(keys):
+				return [key.lower() for key in keys]
+		d = BatchTransformingDict({'a': 1})
+		
+		with unittest.mock.patch.object(BatchTransformingDict, 'transform_key') as transform_key_mock:
+			d.get_many(['A'])
+			d.set_many([('B', 2)])
+			self.assertEqual(transform_key_mock.call_count, 0, "batch operations should use the batch transformation")
+		self.assertEqual(list(d), ['a', 'b'], "batch transformation not applied")
+
+
+class TestKeyTransformingDictWrap(unittest.TestCase):
+	test_class = TestKeyTransformingDict
+	
+	def test_wrap_trusted(self):
+		data = {'content-type': 'text/plain'}
+		
+		with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+			d = self.test_class.wrap(data)
+			self.assertEqual(transform_key_mock.call_count, 0, "wrapping should not transform keys")
+		d['Accept'] = '*/*'
+		
+		self.assertIs(type(d), self.test_class, "trusted wrapper should be an instance of the class")
+		self.assertIs(d.data, data, "wrapped dict should be used as storage")
+		self.assertEqual(d['Content-Type'], 'text/plain', "reads should transform keys")
+		self.assertEqual(data, {'content-type': 'text/plain', 'accept': '*/*'}, "writes should go to the wrapped dict with transformed keys")
+	
+	def test_wrap_untrusted_lazy_aliases(self):
+		d = self.test_class.wrap({'host': 'example.com', 'Content-Type': 'text/plain'}, trusted=False)
+		
+		self.assertEqual(d['HOST'], 'example.com', "transformed key should be found in storage")
+		self.assertIsNone(d._aliases, "aliases should not be built while lookups hit")
+		self.assertEqual(d['CONTENT-TYPE'], 'text/plain', "key not transformed in storage should be found")
+		self.assertEqual(d._aliases, {'content-type': 'Content-Type'}, "aliases should index only keys not transformed in storage")
+	
+	def test_wrap_untrusted_writes(self):
+		data = {'Content-Type': 'text/plain', 'host': 'example.com'}
+		d = self.test_class.wrap(data, trusted=False)
+		
+		d['content-type'] = 'text/html'
+		d['Accept'] = '*/*'
+		del d['HOST']
+		
+		self.assertEqual(data, {'Content-Type': 'text/html', 'accept': '*/*'}, "writes should update the existing storage key, or add transformed keys")
+		self.assertEqual(list(d), ['content-type', 'accept'], "iteration should yield transformed keys")
+		self.assertEqual(dict(d.items()), {'content-type': 'text/html', 'accept': '*/*'}, "items should have transformed keys")
+		self.assertEqual(d.get_many(['CONTENT-TYPE', 'host']), ['text/html', None], "batch reads should find keys not transformed in storage")
+		self.assertEqual(d.pop('Content-Type'), 'text/html', "pop should find keys not transformed in storage")
+		self.assertEqual(data, {'accept': '*/*'}, "pop should delete from the wrapped dict")
+	
+	def test_wrap_untrusted_eq_copy_pickle(self):
+		d = self.test_class.wrap({'Content-Type': 'text/plain'}, trusted=False)
+		expected = self.test_class({'content-type': 'text/plain'})
+		
+		self.assertEqual(d, expected, "wrapper should compare by transformed keys")
+		self.assertEqual(expected, d, "wrapper should compare by transformed keys")
+		self.assertEqual(d, self.test_class.wrap({'CONTENT-TYPE': 'text/plain'}, trusted=False), "wrappers should compare by transformed keys")
+		for name, c in (('copy', d.copy()), ('copy.copy', copy.copy(d)), ('pickle', pickle.loads(pickle.dumps(d)))):
+			with self.subTest(copy=name):
+				self.assertIs(type(c), self.test_class, "copy should be an instance of the class")
+				self.assertEqual(c.data, {'content-type': 'text/plain'}, "copy should store transformed keys")
+	
+	def test_wrap_untrusted_to_json(self):
+		d = self.test_class.wrap({'Content-Type': 'text/plain', 'Nested': self.test_class.wrap({'A': 1}, trusted=False)}, trusted=False)
+		
+		self.assertEqual(d.to_json(sort_keys=True), '{"content-type": "text/plain", "nested": {"a": 1}}', "untrusted storage should be serialized with transformed keys")
+
+
+class TestKeyTransformingDictJson(unittest.TestCase):
+	test_class = TestKeyTransformingDict
+	
+	def test_json_hook(self):
+		d = json.loads('{"A": 1, "Nested": {"B": [{"C": 2}]}, "a": 3}', object_pairs_hook=self.test_class.json_hook())
+		
+		self.assertIs(type(d), self.test_class, "objects should be built as the class")
+		self.assertIs(type(d['nested']['b'][0]), self.test_class, "nested objects should be built as the class")
+		self.assertEqual(d.data, {'a': 3, 'nested': d['nested']}, "keys should be transformed, with the last value winning")
+		self.assertEqual(d['NESTED']['b'][0]['c'], 2, "nested keys should be transformed")
+	
+	def test_json_hook_adopts_storage(self):
+		hook = self.test_class.json_hook()
+		
+		with unittest.mock.patch.object(self.test_class, '_update_without_transform') as update_mock:
+			d = json.loads('{"A": 1}', object_pairs_hook=hook)
+		
+		self.assertEqual(d.data, {'a': 1}, "keys should be transformed")
+		update_mock.assert_not_called()
+	
+	def test_json_hook_transform_once_per_key(self):
+		with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+			json.loads('{"A": {"B": 1, "C": 2}}', object_pairs_hook=self.test_class.json_hook())
+			self.assertEqual(transform_key_mock.call_count, 3, "transform_key should be called once for each key")
+	
+	def test_to_json_no_transforms(self):
+		d = self.test_class({'A': 1, 'b': self.test_class({'C': [2]})})
+		
+		with unittest.mock.patch.object(self.test_class, 'transform_key') as transform_key_mock:
+			serialized = d.to_json(sort_keys=True)
+			self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not be called when serializing")
+		self.assertEqual(serialized, '{"a": 1, "b": {"c": [2]}}', "stored keys should be serialized, including nested dictionaries")
+	
+	def test_to_json_default(self):
+		d = self.test_class({'A': {1, 2}})
+		
+		with self.assertRaises(TypeError):
+			d.to_json()
+		self.assertEqual(d.to_json(default=sorted), '{"a": [1, 2]}', "default should be used for other objects")
+
+
+class TestKeyTransformingDictPickle(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		# imported here, as the fast dictionary tests import the performance mixin from this module
+		from tests.test_fast_key_transforming_dict import TestFastKeyTransformingDict
+		cls.test_classes = (TestKeyTransformingDict, TestFastKeyTransformingDict)
+	
+	def test_out_of_band_buffers(self):
+		large = b'x' * TestKeyTransformingDict.pickle_buffer_threshold
+		
+		for test_class in self.test_classes:
+			with self.subTest(test_class=test_class.__name__):
+				d = test_class({'A': large, 'B': b'small', 'C': 1})
+				buffers = []
+				
+				pickled = pickle.dumps(d, protocol=5, buffer_callback=buffers.append)
+				d_unpickled = pickle.loads(pickled, buffers=buffers)
+				
+				self.assertEqual(len(buffers), 1, "only bytes values above the threshold should be sent out-of-band")
+				self.assertLess(len(pickled), len(large), "large value should not be in the pickle stream")
+				self.assertEqual(d_unpickled, d, "unpickled dictionary should be equal to the original")
+				self.assertIs(type(d_unpickled['a']), bytes, "out-of-band value should be restored as bytes")
+	
+	def test_in_band_protocol_5(self):
+		large = b'x' * TestKeyTransformingDict.pickle_buffer_threshold
+		
+		for test_class in self.test_classes:
+			with self.subTest(test_class=test_class.__name__):
+				d = test_class({'A': large})
+				
+				d_unpickled = pickle.loads(pickle.dumps(d, protocol=5))
+				
+				self.assertEqual(d_unpickled, d, "unpickled dictionary should be equal to the original")
+				self.assertIs(type(d_unpickled['a']), bytes, "value should be restored as bytes")
+	
+	def test_instance_attributes(self):
+		for test_class in self.test_classes:
+			with self.subTest(test_class=test_class.__name__):
+				d = test_class({'A': 1})
+				d.name = 'headers'
+				
+				d_unpickled = pickle.loads(pickle.dumps(d))
+				
+				self.assertEqual(d_unpickled.name, 'headers', "instance attributes should be pickled")
+				self.assertEqual(d_unpickled, d, "unpickled dictionary should be equal to the original")
+
+
 if __name__ == '__main__':
 	unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import copy
+import pickle
+
+from transforming_collections import KeyTransformingDict, KeyTransformingRecord, LowercaseDict
+
+
+class TestKeyTransformingDict(KeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+TestRecord = TestKeyTransformingDict.record_type(['Name', 'AGE', 'city'])
+
+
+class TestKeyTransformingRecord(unittest.TestCase):
+	def test_record_type(self):
+		self.assertTrue(issubclass(TestRecord, KeyTransformingRecord), "record type should be a KeyTransformingRecord")
+		self.assertEqual(TestRecord.fields, ('name', 'age', 'city'), "fields should be transformed")
+		self.assertEqual(TestRecord.__name__, 'TestKeyTransformingDictRecord', "record type should be named after the dictionary class")
+		self.assertIs(TestKeyTransformingDict.record_type(['NAME', 'age', 'City']), TestRecord, "equal schemas should share the record type")
+		self.assertIsNot(LowercaseDict.record_type(['name', 'age', 'city']), TestRecord, "schemas of other classes should not be shared")
+		self.assertEqual(TestKeyTransformingDict.record_type(['a'], 'Row').__name__, 'Row', "record type should be named as given")
+	
+	def test_duplicate_fields(self):
+		with self.assertRaises(ValueError, msg="fields equal up to transformation should be rejected"):
+			TestKeyTransformingDict.record_type(['a', 'A'])
+	
+	def test_mapping(self):
+		r = TestRecord({'NAME': 'Ann', 'Age': 30})
+		
+		self.assertEqual(r['name'], 'Ann', "field should be found by transformed key")
+		self.assertEqual(r['AGE'], 30, "field should be found by untransformed key")
+		self.assertNotIn('city', r, "field not set should not be found")
+		self.assertEqual(r.get('City', 'none'), 'none', "get should return default for field not set")
+		with self.assertRaises(KeyError, msg="field not set should raise KeyError"):
+			r['city']
+		self.assertEqual(len(r), 2, "length should count fields set")
+		self.assertEqual(list(r), ['name', 'age'], "iteration should yield transformed fields set, in schema order")
+		self.assertEqual(dict(r), {'name': 'Ann', 'age': 30}, "items should be transformed keys and values")
+	
+	def test_overflow(self):
+		r = TestRecord(name='Ann', Extra=1)
+		
+		self.assertEqual(r['EXTRA'], 1, "key outside of the schema should be found")
+		self.assertEqual(list(r), ['name', 'extra'], "overflow keys should be iterated after fields")
+		self.assertEqual(len(r), 2, "length should count overflow keys")
+		del r['extra']
+		self.assertNotIn('extra', r, "deleted overflow key should not be found")
+		with self.assertRaises(KeyError, msg="missing overflow key should raise KeyError"):
+			r['other']
+	
+	def test_setitem_delitem(self):
+		r = TestRecord(name='Ann')
+		r['CITY'] = 'Oslo'
+		r['Name'] = 'Bob'
+		
+		self.assertEqual(dict(r), {'name': 'Bob', 'city': 'Oslo'}, "fields should be set by untransformed key")
+		del r['NAME']
+		self.assertNotIn('name', r, "deleted field should not be found")
+		with self.assertRaises(KeyError, msg="deleting a field not set should raise KeyError"):
+			del r['name']
+		r.clear()
+		self.assertEqual(len(r), 0, "cleared record should be empty")
+	
+	def test_from_values(self):
+		with unittest.mock.patch.object(TestRecord, 'transform_key', wraps=TestRecord.transform_key) as transform_key_mock:
+			r = TestRecord.from_values(['Ann', 30, 'Oslo'])
+			self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not be called when creating from values")
+		self.assertEqual(dict(r), {'name': 'Ann', 'age': 30, 'city': 'Oslo'}, "values should be assigned in field order")
+		with self.assertRaises(ValueError, msg="wrong number of values should be rejected"):
+			TestRecord.from_values(['Ann'])
+	
+	def test_lookup_transform_once(self):
+		r = TestRecord.from_values(['Ann', 30, 'Oslo'])
+		with unittest.mock.patch.object(TestRecord, 'transform_key', wraps=TestRecord.transform_key) as transform_key_mock:
+			r['NAME']
+			self.assertEqual(transform_key_mock.call_count, 1, "transform_key should be called once per lookup")
+	
+	def test_eq(self):
+		r = TestRecord(name='Ann', extra=1)
+		
+		self.assertEqual(r, TestRecord(NAME='Ann', EXTRA=1), "records of the same type with equal items should be equal")
+		self.assertEqual(r, {'name': 'Ann', 'extra': 1}, "record should be equal to a dict of transformed keys")
+		self.assertEqual(r, TestKeyTransformingDict(NAME='Ann', extra=1), "record should be equal to a key transforming dict")
+		self.assertNotEqual(r, TestRecord(name='Ann'), "records with different items should not be equal")
+		self.assertNotEqual(r, {'NAME': 'Ann', 'extra': 1}, "untransformed keys of another mapping should not be transformed")
+	
+	def test_copy_pickle(self):
+		r = TestRecord(name='Ann', extra=[1])
+		
+		for copier in (TestRecord.copy, copy.copy, copy.deepcopy, lambda r: pickle.loads(pickle.dumps(r))):
+			with self.subTest(copier=copier):
+				r_copy = copier(r)
+				self.assertIs(type(r_copy), TestRecord, "copy should have the same record type")
+				self.assertEqual(r_copy, r, "copy should be equal to original")
+				self.assertNotIn('age', r_copy, "fields not set should stay unset")
+				r_copy['age'] = 1
+				self.assertNotIn('age', r, "modifying copy should not modify original")
+	
+	def test_no_instance_dict(self):
+		self.assertFalse(hasattr(TestRecord(), '__dict__'), "records should not have an instance dictionary")
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import copy
+
+from transforming_collections import FrozenKeyTransformingSet, KeyTransformingSet
+
+
+class TestKeyTransformingSet(KeyTransformingSet):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestFrozenKeyTransformingSet(FrozenKeyTransformingSet):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class KeyTransformingSetTestMixin:
+	def test_init_transform_key(self):
+		s = self.test_class(['A', 'a', 'B'])
+		
+		self.assertEqual(len(s), 2, "elements equal up to transformation should be stored once")
+		self.assertEqual(set(s), {'a', 'b'}, "iteration should yield transformed elements")
+		self.assertIn('A', s, "untransformed element not found")
+		self.assertIn('a', s, "transformed element not found")
+		self.assertNotIn('c', s, "non-existing element found")
+	
+	def test_operators_transform_other(self):
+		s = self.test_class(['a', 'b'])
+		other = {'B', 'C'}
+		
+		self.assertEqual(set(s & other), {'b'}, "intersection should transform elements of the other set")
+		self.assertEqual(set(s | other), {'a', 'b', 'c'}, "union should transform elements of the other set")
+		self.assertEqual(set(s - other), {'a'}, "difference should transform elements of the other set")
+		self.assertEqual(set(s ^ other), {'a', 'c'}, "symmetric difference should transform elements of the other set")
+		self.assertEqual(set(other - s), {'c'}, "reflected difference should transform elements of the other set")
+		for result in (s & other, s | other, s - other, s ^ other, other & s, other - s):
+			self.assertIsInstance(result, self.test_class, f"result should be an instance of self.test_class, not {type(result).__name__}")
+	
+	def test_methods_accept_iterables(self):
+		s = self.test_class(['a', 'b'])
+		
+		self.assertEqual(set(s.union(['C'], ('D', ))), {'a', 'b', 'c', 'd'}, "union should accept any iterables")
+		self.assertEqual(set(s.intersection(['A'])), {'a'}, "intersection should accept any iterable")
+		self.assertEqual(set(s.difference(['A'])), {'b'}, "difference should accept any iterable")
+		self.assertEqual(set(s.symmetric_difference(['A', 'C'])), {'b', 'c'}, "symmetric difference should accept any iterable")
+		self.assertTrue(s.issubset(['A', 'B', 'C']), "set should be a subset of a superset up to transformation")
+		self.assertTrue(s.issuperset(['A']), "set should be a superset of a subset up to transformation")
+		self.assertTrue(s.isdisjoint(['C']), "sets without common elements should be disjoint")
+		self.assertFalse(s.isdisjoint(['B']), "sets with common elements (up to transformation) should not be disjoint")
+	
+	def test_comparisons(self):
+		s = self.test_class(['a'])
+		
+		self.assertLessEqual(s, {'A', 'B'}, "set should be a subset of a superset up to transformation")
+		self.assertLess(s, {'A', 'B'}, "set should be a proper subset of a superset up to transformation")
+		self.assertEqual(s, {'a'}, "sets with same elements should be equal")
+		self.assertEqual(s, self.test_class(['A']), "sets of the same class with same elements (up to transformation) should be equal")
+		self.assertEqual(s, {'A'}, "sets with same elements (up to transformation) should be equal")
+		self.assertNotEqual(s, {'A', 'B'}, "sets with different elements should not be equal")
+	
+	def test_eq_consistent_with_subset(self):
+		s = self.test_class(['A'])
+		
+		for other in ({'A'}, {'a'}, frozenset(['A']), {'A', 'B'}, set()):
+			with self.subTest(other=other):
+				self.assertEqual(s == other, s <= other and s >= other, "== should hold exactly when <= and >= both hold")
+				self.assertEqual(other == s, s == other, "equality should be symmetric")
+	
+	def test_same_class_no_transforms(self):
+		s1 = self.test_class(['a', 'b'])
+		s2 = self.test_class(['b', 'c'])
+		operations = {
+			'init':                 lambda: self.test_class(s1),
+			'and':                  lambda: s1 & s2,
+			'or':                   lambda: s1 | s2,
+			'sub':                  lambda: s1 - s2,
+			'xor':                  lambda: s1 ^ s2,
+			'issubset':             lambda: s1.issubset(s2),
+			'union':                lambda: s1.union(s2),
+			'eq':                   lambda: s1 == s2,
+			'copy':                 lambda: s1.copy(),
+		}
+		
+		for name, operation in operations.items():
+			with self.subTest(operation=name):
+				with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+					operation()
+					self.assertEqual(transform_key_mock.call_count, 0, "transform_key should not be called for operations with the same class")
+	
+	def test_other_class_transform_once_per_element(self):
+		s = self.test_class(['a', 'b'])
+		other = {'A', 'C', 'd'}
+		
+		with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+			s | other
+			self.assertEqual(transform_key_mock.call_count, len(other), "transform_key should be called once for each element of the other set")
+
+
+class TestKeyTransformingSetBehavior(unittest.TestCase, KeyTransformingSetTestMixin):
+	test_class = TestKeyTransformingSet
+	
+	def test_add_discard_remove(self):
+		s = self.test_class()
+		
+		s.add('A')
+		s.add('a')
+		self.assertEqual(list(s), ['a'], "adding the same element (up to transformation) should not increase length")
+		s.discard('X')
+		s.discard('A')
+		self.assertEqual(len(s), 0, "untransformed element not discarded")
+		with self.assertRaises(KeyError):
+			s.remove('A')
+	
+	def test_in_place_operations(self):
+		s = self.test_class(['a', 'b'])
+		s_before = s
+		
+		s |= {'C'}
+		s -= {'A'}
+		s &= {'B', 'C', 'D'}
+		s ^= {'D'}
+		
+		self.assertIs(s, s_before, "in-place operations should modify the same object")
+		self.assertEqual(set(s), {'b', 'c', 'd'}, "in-place operations should transform elements of the other set")
+		s.update(['E'], ['F'])
+		s.difference_update(['B'])
+		s.intersection_update(['C', 'D', 'E', 'F'])
+		s.symmetric_difference_update(['F', 'G'])
+		self.assertEqual(set(s), {'c', 'd', 'e', 'g'}, "update methods should transform elements of the iterables")
+	
+	def test_unhashable(self):
+		with self.assertRaises(TypeError):
+			hash(self.test_class())
+	
+	def test_copy_independent(self):
+		s = self.test_class(['a'])
+		
+		for s_copy in (s.copy(), copy.copy(s), copy.deepcopy(s)):
+			s_copy.add('b')
+			self.assertNotIn('b', s, "modifying copy should not modify original")
+
+
+class TestFrozenKeyTransformingSetBehavior(unittest.TestCase, KeyTransformingSetTestMixin):
+	test_class = TestFrozenKeyTransformingSet
+	
+	def test_hash(self):
+		s = self.test_class(['A', 'b'])
+		
+		self.assertEqual(hash(s), hash(frozenset({'a', 'b'})), "hash should match the hash of transformed elements")
+		self.assertEqual({s: 1}[self.test_class(['a', 'B'])], 1, "equal frozen sets should be usable as the same dict key")
+	
+	def test_immutable(self):
+		s = self.test_class(['a'])
+		
+		self.assertFalse(hasattr(s, 'add'), "frozen set should not support adding")
+		self.assertIs(s.copy(), s, "copy of a frozen set should be the same object")
+		self.assertIs(copy.copy(s), s, "copy of a frozen set should be the same object")
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import os
+import pickle
+import tempfile
+
+from transforming_collections import MappedKeyTransformingDict, MappedUnicaseDict, UnicaseDict
+
+
+class TestMappedKeyTransformingDict(MappedKeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		if isinstance(key, str):
+			return str.lower(key)
+		return key
+
+
+class TestMappedKeyTransformingDictBehavior(unittest.TestCase):
+	mapped_class = TestMappedKeyTransformingDict
+	
+	def setUp(self):
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		self.path = os.path.join(directory.name, 'table.map')
+	
+	def open(self, mapping):
+		self.mapped_class.write(self.path, mapping)
+		d = self.mapped_class(self.path)
+		self.addCleanup(d.close)
+		return d
+	
+	def test_lookup_transform_key(self):
+		d = self.open({'A': 1, 'b': 'two'})
+		
+		self.assertEqual(d['a'], 1, "lookup should use the transformed key")
+		self.assertEqual(d['B'], 'two', "lookup should use the transformed key")
+		self.assertEqual(d.get('A'), 1, "lookup should use the transformed key")
+		self.assertIsNone(d.get('c'), "missing key should return default")
+		self.assertIn('A', d, "membership should use the transformed key")
+		self.assertNotIn('c', d, "non-existing key found")
+		with self.assertRaises(KeyError):
+			d['c']
+	
+	def test_supported_types(self):
+		source = {
+			'str': 'ÅßΣ\U0001f600',
+			b'bytes': b'\x00\xff',
+			0: 0,
+			-2**100: 2**100,
+			1.5: float('inf'),
+			'float': -0.25,
+		}
+		
+		d = self.open(source)
+		
+		self.assertEqual(dict(d.items()), source, "keys and values should be stored without loss")
+		for key, value in source.items():
+			self.assertIs(type(d[key]), type(value), "value type should be preserved")
+	
+	def test_equal_keys_of_different_types(self):
+		d = self.open({1: 'one'})
+		
+		self.assertEqual(d[1.0], 'one', "float equal to an int key should find it, like in a dict")
+		self.assertNotIn('1', d, "str key should not match an int key")
+	
+	def test_bool_stored_as_int(self):
+		d = self.open({True: False, 'a': True})
+		
+		self.assertEqual(d[1], 0, "bool key should be found as the equal int, like in a dict")
+		self.assertEqual(d[True], 0, "bool key should be found")
+		self.assertIs(type(d['a']), int, "bool value should be read back as int")
+		self.assertEqual(d['a'], 1, "bool value should be stored as int")
+	
+	@unittest.skipUnless(os.name == 'posix', "requires POSIX file modes")
+	def test_write_file_mode(self):
+		umask = os.umask(0o027)
+		self.addCleanup(os.umask, umask)
+		
+		self.mapped_class.write(self.path, {'a': 1})
+		
+		self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640, "written file should have the mode open() gives new files")
+	
+	def test_write_failure_removes_temporary_file(self):
+		directory = os.path.dirname(self.path)
+		before = set(os.listdir(directory))
+		
+		with unittest.mock.patch('os.replace', side_effect=OSError("replace failed")):
+			with self.assertRaises(OSError):
+				self.mapped_class.write(self.path, {'a': 1})
+		
+		self.assertEqual(set(os.listdir(directory)), before, "temporary file should be removed when writing fails")
+	
+	def test_unsupported_type(self):
+		with self.assertRaises(TypeError):
+			self.mapped_class.write(self.path, {'a': None})
+		d = self.open({'a': 1})
+		self.assertNotIn(('a', ), d, "unsupported key type should not be found")
+		self.assertEqual(d.get(('a', ), 'default'), 'default', "unsupported key type should return default")
+	
+	def test_iter_insertion_order(self):
+		d = self.open(UnicaseDict({'Straße': 1, 'B': 2, 'STRASSE': 3}))
+		
+		self.assertEqual(len(d), 2, "length should count transformed keys")
+		self.assertEqual(list(d), ['strasse', 'b'], "iteration should yield transformed keys in insertion order")
+		self.assertEqual(list(d.values()), [3, 2], "values not returned")
+		self.assertEqual(d, {'strasse': 3, 'b': 2}, "mapped dictionary should be equal to a dict with the same items")
+	
+	def test_many_keys(self):
+		source = {f'Key{i}': i for i in range(10_000)}
+		
+		d = self.open(source)
+		
+		self.assertEqual(len(d), len(source), "length should count all keys")
+		self.assertTrue(all(d[f'KEY{i}'] == i for i in range(10_000)), "all keys should be found")
+		self.assertFalse(any(f'other{i}' in d for i in range(1000)), "non-existing key found")
+	
+	def test_empty(self):
+		d = self.open({})
+		
+		self.assertEqual(len(d), 0, "empty mapping should have no keys")
+		self.assertNotIn('a', d, "non-existing key found")
+	
+	def test_pickle_maps_same_file(self):
+		d = self.open({'A': 1})
+		
+		d_unpickled = pickle.loads(pickle.dumps(d))
+		self.addCleanup(d_unpickled.close)
+		
+		self.assertEqual(d_unpickled.path, d.path, "unpickled dictionary should map the same file")
+		self.assertEqual(d_unpickled['a'], 1, "unpickled dictionary should find keys")
+	
+	def test_rewrite_keeps_open_map(self):
+		d = self.open({'A': 1})
+		
+		self.mapped_class.write(self.path, {'A': 2})
+		
+		self.assertEqual(d['a'], 1, "already mapped file should not change when the file is rewritten")
+		with self.mapped_class(self.path) as d2:
+			self.assertEqual(d2['a'], 2, "reopened file should have new values")
+	
+	def test_invalid_file(self):
+		with open(self.path, 'wb') as file:
+			file.write(b'\x00' * 64)
+		
+		with self.assertRaises(ValueError):
+			self.mapped_class(self.path)
+	
+	def test_lookup_transform_once(self):
+		d = self.open({'A': 1})
+		
+		with unittest.mock.patch.object(self.mapped_class, 'transform_key', wraps=self.mapped_class.transform_key) as transform_key_mock:
+			d['A']
+			self.assertEqual(transform_key_mock.call_count, 1, "transform_key should be called once per lookup")
+	
+	def test_unicase(self):
+		MappedUnicaseDict.write(self.path, UnicaseDict({'Straße': 1}))
+		
+		with MappedUnicaseDict(self.path) as d:
+			self.assertEqual(d['STRASSE'], 1, "keys should be casefolded")
+
+
+if __name__ == '__main__':
+	unittest.main()
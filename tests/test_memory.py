@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import copy
+import pickle
+import tracemalloc
+import weakref
+
+from transforming_collections import (
+	ConcurrentKeyTransformingDict, FastLowercaseDict, FrozenLowercaseDict, KeyPreservingTransformingDict, LowercaseDict, LowercaseSet,
+	FrozenKeyTransformingDict, FrozenKeyTransformingSet,
+)
+from transforming_collections.memory import memory_footprint
+
+
+class SlottedKeyPreservingDict(KeyPreservingTransformingDict):
+	__slots__ = ()
+	transform_key = staticmethod(str.lower)
+
+
+class UnslottedKeyPreservingDict(KeyPreservingTransformingDict):
+	transform_key = staticmethod(str.lower)
+
+
+class SlottedConcurrentDict(ConcurrentKeyTransformingDict):
+	__slots__ = ()
+	transform_key = staticmethod(str.lower)
+
+
+class SlottedFrozenSet(FrozenKeyTransformingSet):
+	__slots__ = ()
+	transform_key = staticmethod(str.lower)
+
+
+class UnslottedFrozenSet(FrozenKeyTransformingSet):
+	transform_key = staticmethod(str.lower)
+
+
+class UnslottedFrozenDict(FrozenKeyTransformingDict):
+	transform_key = staticmethod(str.lower)
+
+
+SLOTTED = {
+	'fast': lambda: FastLowercaseDict({'A': 1}),
+	'frozen': lambda: FrozenLowercaseDict({'A': 1}),
+	'key preserving': lambda: SlottedKeyPreservingDict({'A': 1}),
+	'concurrent': lambda: SlottedConcurrentDict({'A': 1}),
+	'set': lambda: LowercaseSet(['A']),
+	'frozen set': lambda: SlottedFrozenSet(['A']),
+}
+
+
+class TestSlots(unittest.TestCase):
+	def test_no_instance_dict(self):
+		for name, factory in SLOTTED.items():
+			with self.subTest(name=name):
+				self.assertFalse(hasattr(factory(), '__dict__'), "slotted instances should not have an instance dictionary")
+	
+	def test_weakref(self):
+		for name, factory in SLOTTED.items():
+			with self.subTest(name=name):
+				obj = factory()
+				self.assertIs(weakref.ref(obj)(), obj, "slotted instances should support weak references")
+	
+	def test_pickle_copy(self):
+		for name, factory in SLOTTED.items():
+			obj = factory()
+			for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+				with self.subTest(name=name, protocol=protocol):
+					self.assertEqual(pickle.loads(pickle.dumps(obj, protocol)), obj, "unpickled instance should be equal to original")
+			with self.subTest(name=name):
+				self.assertEqual(copy.deepcopy(obj), obj, "deep copy should be equal to original")
+	
+	def test_subclass_attributes_pickled(self):
+		for obj in (UnslottedKeyPreservingDict({'A': 1}), UnslottedFrozenSet(['A']), UnslottedFrozenDict({'A': 1})):
+			obj.note = 'kept'
+			for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+				with self.subTest(cls=type(obj).__name__, protocol=protocol):
+					obj_unpickled = pickle.loads(pickle.dumps(obj, protocol))
+					self.assertEqual(obj_unpickled, obj, "unpickled instance should be equal to original")
+					self.assertEqual(obj_unpickled.note, 'kept', "attributes of subclasses without slots should be pickled")
+
+
+class TestMemoryFootprint(unittest.TestCase):
+	def test_footprint(self):
+		items = {f'key-{i}': i for i in range(100)}
+		footprint = memory_footprint(dict, items, 100)
+		
+		self.assertGreater(footprint.fixed, 0, "an empty dict should take memory")
+		self.assertGreater(footprint.per_entry, 0, "entries should take memory")
+		self.assertLess(footprint.per_entry, 100, "keys and values given should not be counted")
+	
+	def test_transformed_keys_counted(self):
+		items = {f'KEY-{i}': i for i in range(100)}
+		
+		self.assertGreater(memory_footprint(LowercaseDict, items, 100).per_entry, memory_footprint(dict, items, 100).per_entry, "new transformed keys should be counted")
+	
+	def test_empty_items(self):
+		self.assertEqual(memory_footprint(dict, {}, 10).per_entry, 0, "no entries should take no memory per entry")
+	
+	def test_tracing_state_kept(self):
+		memory_footprint(dict, {'a': 1}, 10)
+		self.assertFalse(tracemalloc.is_tracing(), "tracing should be stopped if it was not running")
+		tracemalloc.start()
+		try:
+			memory_footprint(dict, {'a': 1}, 10)
+			self.assertTrue(tracemalloc.is_tracing(), "tracing started by the caller should not be stopped")
+		finally:
+			tracemalloc.stop()
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import copy
+import pickle
+
+from transforming_collections import NestedKeyTransformingDict
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+from tests.test_key_transforming_dict import KeyTransformingDictPerformanceTestMixin
+
+
+class TestNestedKeyTransformingDict(NestedKeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestNestedKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictPerformanceTestMixin, KeyTransformingDictBaseTestMixin):
+	test_class = TestNestedKeyTransformingDict
+
+
+class TestNestedKeyTransformingDictNesting(unittest.TestCase):
+	test_class = TestNestedKeyTransformingDict
+	
+	def config(self):
+		return {'Server': {'Host': 'localhost', 'Ports': {'HTTP': 80}}, 'Debug': True}
+	
+	def test_lazy_wrapping(self):
+		config = self.config()
+		d = self.test_class(config)
+		
+		self.assertIs(d.data['server'], config['Server'], "nested mappings should not be wrapped before they are read")
+		server = d['SERVER']
+		self.assertIs(type(server), self.test_class, "nested mapping should be wrapped when read")
+		self.assertIs(d['server'], server, "wrapper should be cached")
+		self.assertIs(server.data['ports'], config['Server']['Ports'], "deeper mappings should not be wrapped before they are read")
+		self.assertEqual(d.get('Server')['PORTS']['http'], 80, "keys should be transformed at every level")
+	
+	def test_get_many_wraps(self):
+		d = self.test_class(self.config())
+		
+		server, debug, missing = d.get_many(['SERVER', 'debug', 'other'], 'none')
+		
+		self.assertIs(type(server), self.test_class, "nested mapping should be wrapped when read by get_many")
+		self.assertIs(d['server'], server, "wrapper read by get_many should be cached")
+		self.assertEqual((debug, missing), (True, 'none'), "other values and defaults should be returned as they are")
+	
+	def test_wrapping_no_transforms_on_other_levels(self):
+		d = self.test_class(self.config())
+		
+		with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+			d['Server']
+			self.assertEqual(transform_key_mock.call_count, 3, "only the looked up key and the keys of the wrapped level should be transformed")
+	
+	def test_write_through_wrapper(self):
+		d = self.test_class(self.config())
+		
+		d['Server']['Ports']['HTTPS'] = 443
+		
+		self.assertEqual(d['server']['ports']['https'], 443, "writes through wrappers should be visible from the parent")
+	
+	def test_get_path(self):
+		d = self.test_class(self.config())
+		
+		self.assertEqual(d.get_path(('SERVER', 'ports', 'Http')), 80, "path should be resolved through nested mappings")
+		self.assertEqual(d.get_path(['Debug']), True, "path should be resolved")
+		self.assertIs(d.get_path(()), d, "empty path should resolve to the dictionary itself")
+		self.assertIsNone(d.get_path(('Server', 'Missing'), None), "missing path should return default")
+		self.assertIsNone(d.get_path(('Debug', 'x'), None), "path through a non-mapping should return default")
+		with self.assertRaises(KeyError):
+			d.get_path(('Server', 'Host', 'x'))
+	
+	def test_get_path_memoized(self):
+		d = self.test_class(self.config())
+		path = ('Server', 'Ports', 'HTTP')
+		d.get_path(path)
+		
+		with unittest.mock.patch.object(self.test_class, 'transform_key', wraps=self.test_class.transform_key) as transform_key_mock:
+			self.assertEqual(d.get_path(path), 80, "memoized path should return the value")
+			self.assertEqual(transform_key_mock.call_count, 0, "memoized path should not transform keys")
+	
+	def test_write_invalidates_paths_through_key(self):
+		operations = {
+			'setitem':    lambda ports: ports.__setitem__('http', 8080),
+			'update':     lambda ports: ports.update(HTTP=8080),
+			'set_many':   lambda ports: ports.set_many({'HTTP': 8080}),
+			'setdefault': lambda ports: (ports.pop('Http'), ports.setdefault('HTTP', 8080)),
+			'clear':      lambda ports: (ports.clear(), ports.__setitem__('HTTP', 8080)),
+		}
+		
+		for name, operation in operations.items():
+			with self.subTest(operation=name):
+				d = self.test_class(self.config())
+				d.get_path(('Server', 'Ports', 'HTTP'))
+				d.get_path(('Server', 'Host'))
+				
+				operation(d['server']['ports'])
+				
+				self.assertEqual(d.get_path(('Server', 'Ports', 'HTTP')), 8080, "write should invalidate cached paths through the written key")
+				self.assertIn(('Server', 'Host'), d._path_cache, "write should not invalidate cached paths through other keys")
+	
+	def test_replace_invalidates_deeper_paths(self):
+		d = self.test_class(self.config())
+		d.get_path(('Server', 'Ports', 'HTTP'))
+		
+		d['server'] = {'PORTS': {'http': 8000}}
+		
+		self.assertEqual(d.get_path(('Server', 'Ports', 'HTTP')), 8000, "replacing a nested mapping should invalidate paths through it")
+		with self.assertRaises(KeyError):
+			d.get_path(('Server', 'Host'))
+	
+	def test_delete_invalidates_paths(self):
+		d = self.test_class(self.config())
+		d.get_path(('Server', 'Host'))
+		
+		del d['Server']['Host']
+		
+		self.assertIsNone(d.get_path(('Server', 'Host'), None), "deletion should invalidate cached paths through the deleted key")
+	
+	def test_eq_independent_of_wrapping(self):
+		d = self.test_class(self.config())
+		other = self.test_class(self.config())
+		other['Server']['Ports']
+		
+		self.assertEqual(d, other, "equality should not depend on which nested mappings were read")
+		self.assertEqual(d, {'server': {'host': 'localhost', 'ports': {'http': 80}}, 'debug': True}, "nested mappings should be compared with transformed keys")
+		self.assertNotEqual(d, {'server': {'host': 'remote', 'ports': {'http': 80}}, 'debug': True}, "different nested values should not be equal")
+	
+	def test_copy_does_not_share_path_cache(self):
+		d = self.test_class(self.config())
+		d.get_path(('Debug', ))
+		
+		for name, c in (('copy', d.copy()), ('copy.copy', copy.copy(d)), ('deepcopy', copy.deepcopy(d)), ('pickle', pickle.loads(pickle.dumps(d)))):
+			with self.subTest(copy=name):
+				c['debug'] = False
+				self.assertFalse(c.get_path(('Debug', )), "copy should resolve paths from its own data")
+				self.assertTrue(d.get_path(('Debug', )), "original should keep its own cached paths")
+
+
+if __name__ == '__main__':
+	unittest.main()
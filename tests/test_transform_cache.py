@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+
+from transforming_collections import KeyTransformingDict, TransformCache
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+from tests.test_key_transforming_dict import KeyTransformingDictPerformanceTestMixin
+
+
+class TestCachedKeyTransformingDict(KeyTransformingDict):
+	transform_cache = TransformCache(maxsize=4)
+	
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestTransformCache(unittest.TestCase):
+	def test_hit_miss_counters(self):
+		cache = TransformCache(maxsize=2)
+		
+		self.assertIsNone(cache.get('A'), "empty cache should return default")
+		cache.put('A', 'a')
+		self.assertEqual(cache.get('A'), 'a', "cached transformation not returned")
+		
+		info = cache.info()
+		self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1), "unexpected cache counters")
+	
+	def test_lru_eviction(self):
+		cache = TransformCache(maxsize=2, policy='lru')
+		marker = object()
+		
+		cache.put('A', 'a')
+		cache.put('B', 'b')
+		cache.get('A')
+		cache.put('C', 'c')
+		
+		self.assertIs(cache.get('B', marker), marker, "least recently used key not evicted")
+		self.assertEqual(cache.get('A'), 'a', "recently used key evicted")
+		self.assertEqual(cache.get('C'), 'c', "new key not cached")
+		self.assertEqual(cache.info().evictions, 1, "eviction not counted")
+	
+	def test_clock_eviction(self):
+		cache = TransformCache(maxsize=2, policy='clock')
+		marker = object()
+		
+		cache.put('A', 'a')
+		cache.put('B', 'b')
+		cache.get('A')
+		cache.put('C', 'c')
+		
+		self.assertIs(cache.get('B', marker), marker, "unreferenced key not evicted")
+		self.assertEqual(cache.get('A'), 'a', "referenced key evicted")
+		self.assertEqual(cache.get('C'), 'c', "new key not cached")
+		self.assertEqual(len(cache), 2, "cache should stay bounded")
+	
+	def test_equal_keys_of_different_types(self):
+		cache = TransformCache()
+		marker = object()
+		
+		cache.put(1, 'int')
+		
+		self.assertIs(cache.get(True, marker), marker, "keys of different types should be cached separately")
+		self.assertIs(cache.get(1.0, marker), marker, "keys of different types should be cached separately")
+	
+	def test_unhashable_key_bypass(self):
+		cache = TransformCache()
+		transform = unittest.mock.Mock(side_effect=tuple)
+		cached_transform = cache.wrap(transform)
+		
+		self.assertEqual(cached_transform(['a']), ('a', ), "unhashable key not transformed")
+		self.assertEqual(cached_transform(['a']), ('a', ), "unhashable key not transformed")
+		self.assertEqual(transform.call_count, 2, "unhashable key should not be cached")
+		self.assertEqual(len(cache), 0, "unhashable key should not be cached")
+	
+	def test_clear(self):
+		cache = TransformCache()
+		cache.put('A', 'a')
+		cache.get('A')
+		
+		cache.clear()
+		
+		self.assertEqual(cache.info(), (0, 0, 0, cache.maxsize, 0), "clear should remove entries and reset counters")
+	
+	def test_invalid_arguments(self):
+		with self.assertRaises(ValueError):
+			TransformCache(maxsize=0)
+		with self.assertRaises(ValueError):
+			TransformCache(policy='fifo')
+
+
+class TestCachedKeyTransformingDictCache(unittest.TestCase):
+	def setUp(self):
+		TestCachedKeyTransformingDict.transform_cache.clear()
+	
+	def test_repeated_key_transformed_once(self):
+		transform = unittest.mock.Mock(side_effect=str.lower)
+		class CachedDict(KeyTransformingDict):
+			transform_cache = TransformCache()
+			transform_key = staticmethod(transform)
+		d = CachedDict({'A': 1})
+		d2 = CachedDict()
+		
+		d['A']
+		d.get('A')
+		'A' in d2
+		
+		self.assertEqual(transform.call_count, 1, "cached key should be transformed only once across instances")
+		self.assertEqual(CachedDict.transform_cache.info().hits, 3, "cache hits not counted")
+	
+	def test_subclass_without_own_cache(self):
+		class OtherDict(TestCachedKeyTransformingDict):
+			@staticmethod
+			def transform_key(key):
+				return str.upper(key)
+		
+		d = OtherDict({'a': 1})
+		
+		self.assertEqual(list(d), ['A'], "subclass transformation should not be served from parent cache")
+		self.assertEqual(len(TestCachedKeyTransformingDict.transform_cache), 0, "subclass should not use parent cache")
+
+
+class TestCachedKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictPerformanceTestMixin, KeyTransformingDictBaseTestMixin):
+	test_class = TestCachedKeyTransformingDict
+
+
+if __name__ == '__main__':
+	unittest.main()
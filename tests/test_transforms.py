@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import unicodedata
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+from transforming_collections import KeyTransformingDict, LowercaseDict, UnicaseDict, UnicodeNormalizingDict
+from transforming_collections import transforms
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+
+
+class TestTransforms(unittest.TestCase):
+	KEYS = (
+		'', 'abc', 'ABC', 'aBc', 'abc_123', '123', 'x-Forwarded-For', 'content-type',
+		'ß', 'Straße', 'αβγ', 'ΑΒΓ', 'İstanbul', 'ﬁle', 'ǅ', 'abc€',
+	)
+	
+	def test_lowercase_equals_str_lower(self):
+		for key in self.KEYS:
+			with self.subTest(key=key):
+				self.assertEqual(transforms.lowercase(key), key.lower())
+	
+	def test_casefold_equals_str_casefold(self):
+		for key in self.KEYS:
+			with self.subTest(key=key):
+				self.assertEqual(transforms.casefold(key), key.casefold())
+	
+	def test_folded_key_not_copied(self):
+		for transform in (transforms.lowercase, transforms.casefold):
+			for key in ('abc', 'abc_123', '123', 'content-type', '', 'αβγ'):
+				with self.subTest(transform=transform.__name__, key=key):
+					self.assertIs(transform(key), key, "already folded key should be returned as is")
+	
+	def test_non_string_key_unchanged(self):
+		for transform in (transforms.lowercase, transforms.casefold):
+			for key in (1, b'ABC', ('A', ), None):
+				with self.subTest(transform=transform.__name__, key=key):
+					self.assertIs(transform(key), key, "non-string key should be returned as is")
+	
+	def test_string_subclass_transformed_to_str(self):
+		class Name(str):
+			pass
+		
+		for transform in (transforms.lowercase, transforms.casefold):
+			with self.subTest(transform=transform.__name__):
+				self.assertIs(type(transform(Name('abc'))), str, "string subclass should be transformed to str")
+
+
+class TestNormalizer(unittest.TestCase):
+	KEYS = TestTransforms.KEYS + (
+		'e\u0301', '\u00e9', 'Ｆｉｌｅ', '①', 'ΐ', 'ᾈ', 'Å', 'Å', '한국어', '\u1100\u1161', 'ｶﾀｶﾅ', 'x\u0345\u0301',
+	)
+	
+	def test_equals_reference(self):
+		for form in transforms.NORMALIZATION_FORMS:
+			for casefold in (True, False):
+				transform = transforms.normalizer(form, casefold)
+				for key in self.KEYS:
+					with self.subTest(form=form, casefold=casefold, key=key):
+						expected = unicodedata.normalize(form, key)
+						if casefold:
+							expected = unicodedata.normalize(form, expected.casefold())
+						self.assertEqual(transform(key), expected, "key should be normalized")
+						self.assertEqual(transform(transform(key)), transform(key), "transformation should be idempotent")
+	
+	def test_normalized_key_not_copied(self):
+		transform = transforms.normalizer('NFKC', True)
+		
+		for key in ('abc', 'content-type', '', 'αβγ', '\u00e9', '한국어', 'straße'.casefold()):
+			with self.subTest(key=key):
+				self.assertIs(transform(key), key, "already normalized key should be returned as is")
+	
+	def test_non_string_key_unchanged(self):
+		transform = transforms.normalizer()
+		
+		for key in (1, b'ABC', ('A', ), None):
+			with self.subTest(key=key):
+				self.assertIs(transform(key), key, "non-string key should be returned as is")
+	
+	def test_string_subclass_transformed_to_str(self):
+		class Name(str):
+			pass
+		
+		for casefold in (True, False):
+			for key in ('abc', '\u00e9'):
+				with self.subTest(casefold=casefold, key=key):
+					self.assertIs(type(transforms.normalizer('NFC', casefold)(Name(key))), str, "string subclass should be transformed to str")
+	
+	def test_invalid_form(self):
+		with self.assertRaises(ValueError):
+			transforms.normalizer('NFX')
+
+
+class TestLowercaseDict(unittest.TestCase, KeyTransformingDictBaseTestMixin):
+	test_class = LowercaseDict
+
+
+class TestUnicaseDict(unittest.TestCase, KeyTransformingDictBaseTestMixin):
+	test_class = UnicaseDict
+
+
+class TestUnicodeNormalizingDict(unittest.TestCase, KeyTransformingDictBaseTestMixin):
+	test_class = UnicodeNormalizingDict
+	
+	def test_normalization(self):
+		d = self.test_class({'Ｆｉｌｅ': 1, 'Cafe\u0301': 2})
+		
+		self.assertEqual(d['file'], 1, "compatibility characters should be normalized")
+		self.assertEqual(d['CAF\u00c9'], 2, "composed and decomposed keys should be equal")
+	
+	def test_subclass_normalization(self):
+		class NFCDict(self.test_class):
+			normalization_form = 'NFC'
+			casefold = False
+		
+		d = NFCDict({'Cafe\u0301': 1, 'Ｆｉｌｅ': 2})
+		
+		self.assertEqual(list(d), ['Caf\u00e9', 'Ｆｉｌｅ'], "keys should be normalized to the form of the subclass, without casefolding")
+
+
+@unittest.skipUnless(numpy, "requires NumPy")
+class TestStrArrayKeys(unittest.TestCase):
+	def test_is_str_array(self):
+		self.assertTrue(transforms.is_str_array(numpy.array(['a'])), "str array not recognized")
+		self.assertFalse(transforms.is_str_array(numpy.array(['a'], dtype=object)), "object array may hold keys of any type")
+		self.assertFalse(transforms.is_str_array(numpy.array([1])), "int array should not be recognized")
+		self.assertFalse(transforms.is_str_array(['a']), "list should not be recognized")
+	
+	def test_bulk_str_keys(self):
+		keys = numpy.array(['A', 'b', 'Straße'])
+		
+		for dict_class in (LowercaseDict, UnicaseDict):
+			with self.subTest(dict_class=dict_class.__name__):
+				d = dict_class.from_columns(keys, range(3))
+				self.assertEqual(d.data, dict(zip(map(dict_class.transform_key, keys.tolist()), range(3))), "keys should be transformed")
+				self.assertTrue(all(type(key) is str for key in d), "keys should be stored as str, not NumPy scalars")
+				self.assertEqual(dict_class.fromkeys(keys).get_many(keys), [None] * 3, "keys should be found")
+	
+	def test_vectorized_transform_key(self):
+		class UppercaseDict(KeyTransformingDict):
+			transform_key = staticmethod(str.upper)
+			vectorized_transform_key = staticmethod(lambda keys: numpy.strings.upper(keys).tolist())
+		
+		keys = numpy.array(['a', 'B'])
+		
+		with unittest.mock.patch.object(UppercaseDict, 'transform_key', wraps=UppercaseDict.transform_key) as transform_key_mock:
+			d = UppercaseDict.fromkeys(keys, 0)
+			UppercaseDict.from_columns(keys, [1, 2])
+			d.contains_many(keys)
+			self.assertEqual(transform_key_mock.call_count, 0, "string arrays should be transformed by the vectorized transform")
+		self.assertEqual(d.data, {'A': 0, 'B': 0}, "keys should be transformed")
+	
+	def test_object_array_per_key(self):
+		keys = numpy.array(['A', 1], dtype=object)
+		
+		d = LowercaseDict.fromkeys(keys)
+		
+		self.assertEqual(d.data, {'a': None, 1: None}, "object arrays should be transformed per key")
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import unittest.mock
+import copy
+import json
+import pickle
+
+from transforming_collections import ValueIndexedKeyTransformingDict
+from tests.test_base_key_transforming_dict import KeyTransformingDictBaseTestMixin
+from tests.test_key_transforming_dict import KeyTransformingDictPerformanceTestMixin
+
+
+class TestValueIndexedKeyTransformingDict(ValueIndexedKeyTransformingDict):
+	@staticmethod
+	def transform_key(key):
+		return str.lower(key)
+
+
+class TestValueIndexedKeyTransformingDictPerformance(unittest.TestCase, KeyTransformingDictPerformanceTestMixin, KeyTransformingDictBaseTestMixin):
+	test_class = TestValueIndexedKeyTransformingDict
+
+
+class TestValueIndexedKeyTransformingDictIndex(unittest.TestCase):
+	test_class = TestValueIndexedKeyTransformingDict
+	
+	def assertIndexConsistent(self, d):
+		value_keys = {}
+		unhashable_keys = {}
+		for key, value in d.data.items():
+			try:
+				value_keys.setdefault(value, {})[key] = None
+			except TypeError:
+				unhashable_keys[key] = None
+		self.assertEqual(d._value_keys, value_keys, "value index out of sync with the data")
+		self.assertEqual(d._unhashable_keys, unhashable_keys, "unhashable keys out of sync with the data")
+	
+	def test_writes_keep_index_consistent(self):
+		d = self.test_class({'A': 1, 'B': 1, 'C': [1]}, D=2)
+		operations = {
+			'setitem':              lambda: d.__setitem__('A', 2),
+			'setitem unhashable':   lambda: d.__setitem__('B', [2]),
+			'delitem':              lambda: d.__delitem__('C'),
+			'pop':                  lambda: d.pop('D'),
+			'pop missing':          lambda: d.pop('X', None),
+			'setdefault':           lambda: d.setdefault('E', 3),
+			'update':               lambda: d.update({'F': 3, 'a': 4}),
+			'update same class':    lambda: d.update(self.test_class({'G': 4})),
+			'ior':                  lambda: d.__ior__({'H': [5]}),
+			'set_many':             lambda: d.set_many({'I': 6, 'b': 6}),
+			'delete_many':          lambda: d.delete_many(['I', 'E']),
+			'popitem':              lambda: d.popitem(),
+		}
+		
+		for name, operation in operations.items():
+			with self.subTest(operation=name):
+				operation()
+				self.assertIndexConsistent(d)
+		d.clear()
+		self.assertIndexConsistent(d)
+	
+	def test_wrap_builds_index(self):
+		for trusted in (True, False):
+			with self.subTest(trusted=trusted):
+				d = self.test_class.wrap({'a': 1, 'b': [1]}, trusted=trusted)
+				
+				self.assertIndexConsistent(d)
+				d['C'] = 1
+				self.assertEqual(d.keys_for_value(1), ['a', 'c'], "wrapped and written keys should be indexed")
+	
+	def test_wrap_untrusted_keys_for_value(self):
+		d = self.test_class.wrap({'Content-Type': 1, 'Accept': [1], 'host': 1}, trusted=False)
+		
+		self.assertEqual(d.keys_for_value(1), ['content-type', 'host'], "keys of untrusted storage should be returned transformed")
+		self.assertEqual(d.keys_for_value([1]), ['accept'], "keys found by scanning should be returned transformed")
+		d['CONTENT-TYPE'] = 2
+		self.assertEqual(d.keys_for_value(2), ['content-type'], "rewritten keys should be returned transformed")
+		self.assertEqual(d.keys_for_value(1), ['host'], "rewritten keys should be removed from the index")
+	
+	def test_json_hook_builds_index(self):
+		d = json.loads('{"A": 1, "B": 2, "C": 1}', object_pairs_hook=self.test_class.json_hook())
+		
+		self.assertIndexConsistent(d)
+		self.assertEqual(d.keys_for_value(1), ['a', 'c'], "keys parsed from JSON should be indexed")
+	
+	def test_values_contains(self):
+		d = self.test_class({'A': 1, 'B': [2], 'C': frozenset({3})})
+		
+		self.assertIn(1, d.values(), "hashable value not found")
+		self.assertIn(1.0, d.values(), "value equal to a stored value not found")
+		self.assertIn([2], d.values(), "unhashable value not found")
+		self.assertIn({3}, d.values(), "unhashable value equal to a stored hashable value not found")
+		self.assertNotIn(2, d.values(), "non-existing value found")
+	
+	def test_values_contains_no_scan(self):
+		d = self.test_class({f'K{i}': i for i in range(1000)})
+		
+		with unittest.mock.patch.object(self.test_class, '_getitem_without_transform') as getitem_mock:
+			self.assertIn(500, d.values(), "hashable value not found")
+			self.assertNotIn(-1, d.values(), "non-existing value found")
+			getitem_mock.assert_not_called()
+	
+	def test_keys_for_value(self):
+		d = self.test_class({'A': 1, 'B': 2, 'C': 1, 'D': [1]})
+		
+		self.assertEqual(d.keys_for_value(1), ['a', 'c'], "keys with the value should be returned in insertion order")
+		self.assertEqual(d.keys_for_value([1]), ['d'], "keys with an unhashable value should be found by scanning")
+		self.assertEqual(d.keys_for_value(3), [], "no keys should be returned for a non-existing value")
+		del d['a']
+		self.assertEqual(d.keys_for_value(1), ['c'], "deleted key should not be returned")
+	
+	def test_copies_independent_index(self):
+		d = self.test_class({'A': 1})
+		
+		for d_copy in (d.copy(), copy.copy(d), copy.deepcopy(d), pickle.loads(pickle.dumps(d)), d | {}):
+			with self.subTest(copy=d_copy):
+				d_copy['b'] = 1
+				self.assertIndexConsistent(d_copy)
+				self.assertEqual(d.keys_for_value(1), ['a'], "modifying copy should not modify the index of the original")
+
+
+if __name__ == '__main__':
+	unittest.main()
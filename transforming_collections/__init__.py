@@ -1,27 +1,126 @@
 # -*- coding: utf-8 -*-
 
 from .key_transforming_dict import BaseKeyTransformingDict, KeyTransformingDict
+from .fast_key_transforming_dict import FastKeyTransformingDict
+from .key_preserving_transforming_dict import KeyPreservingTransformingDict
+from .value_indexed_key_transforming_dict import ValueIndexedKeyTransformingDict
+from .nested_key_transforming_dict import NestedKeyTransformingDict
+from .unicode_normalizing_dict import UnicodeNormalizingDict
+from .frozen_key_transforming_dict import FrozenKeyTransformingDict
+from .concurrent_key_transforming_dict import ConcurrentKeyTransformingDict
+from .mapped_key_transforming_dict import MappedKeyTransformingDict
+from .async_key_transforming_dict import AsyncKeyTransformingDict
+from .key_transforming_record import KeyTransformingRecord
+from .key_transforming_set import BaseKeyTransformingSet, FrozenKeyTransformingSet, KeyTransformingSet
+from .transform_cache import TransformCache
+from . import transforms
 
 
 class LowercaseDict(KeyTransformingDict):
-	@staticmethod
-	def transform_key(key):
-		if isinstance(key, str):
-			return key.lower()
-		return key
+	transform_key = staticmethod(transforms.lowercase)
 
 
 class UnicaseDict(KeyTransformingDict):
-	@staticmethod
-	def transform_key(key):
-		if isinstance(key, str):
-			return key.casefold()
-		return key
+	transform_key = staticmethod(transforms.casefold)
+
+
+class NestedLowercaseDict(NestedKeyTransformingDict):
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class NestedUnicaseDict(NestedKeyTransformingDict):
+	transform_key = staticmethod(transforms.casefold)
+
+
+class FrozenLowercaseDict(FrozenKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class FrozenUnicaseDict(FrozenKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.casefold)
+
+
+class ConcurrentLowercaseDict(ConcurrentKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class ConcurrentUnicaseDict(ConcurrentKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.casefold)
+
+
+class MappedLowercaseDict(MappedKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class MappedUnicaseDict(MappedKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.casefold)
+
+
+class LowercaseSet(KeyTransformingSet):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class UnicaseSet(KeyTransformingSet):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.casefold)
+
+
+class FastLowercaseDict(FastKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.lowercase)
+
+
+class FastUnicaseDict(FastKeyTransformingDict):
+	__slots__ = ()
+	
+	transform_key = staticmethod(transforms.casefold)
 
 
 __all__ = [
 	'LowercaseDict',
 	'UnicaseDict',
+	'UnicodeNormalizingDict',
+	'NestedLowercaseDict',
+	'NestedUnicaseDict',
+	'FrozenLowercaseDict',
+	'FrozenUnicaseDict',
+	'ConcurrentLowercaseDict',
+	'ConcurrentUnicaseDict',
+	'MappedLowercaseDict',
+	'MappedUnicaseDict',
+	'LowercaseSet',
+	'UnicaseSet',
+	'FastLowercaseDict',
+	'FastUnicaseDict',
 	'BaseKeyTransformingDict',
 	'KeyTransformingDict',
+	'FastKeyTransformingDict',
+	'KeyPreservingTransformingDict',
+	'ValueIndexedKeyTransformingDict',
+	'NestedKeyTransformingDict',
+	'FrozenKeyTransformingDict',
+	'ConcurrentKeyTransformingDict',
+	'MappedKeyTransformingDict',
+	'AsyncKeyTransformingDict',
+	'KeyTransformingRecord',
+	'BaseKeyTransformingSet',
+	'FrozenKeyTransformingSet',
+	'KeyTransformingSet',
+	'TransformCache',
 ]
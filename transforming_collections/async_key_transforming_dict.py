@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import abc
+import asyncio
+import inspect
+import typing
+
+from .transform_cache import TransformCache
+
+
+class AsyncKeyTransformingDict(abc.ABC):
+	"""
+	Dictionary for asyncio code whose key transformation may be a coroutine, e.g. because it needs I/O.
+	Requires subclassing and implementing the key transformation function.
+	Operations taking keys are coroutines; operations not taking keys are synchronous and work on transformed keys.
+	Concurrent operations on the same key, in any instance of the class, share one in-flight transformation,
+	and subclasses may set transform_cache to keep the results of completed transformations.
+	The constructor is synchronous and takes no items: use acreate() to create a dictionary with items.
+	"""
+	transform_cache: typing.ClassVar[TransformCache | None] = None
+	# (event loop, type, key) -> task transforming the key, as equal keys of different types may transform differently
+	_in_flight: typing.ClassVar[dict] = {}
+	
+	__marker = object()
+	
+	def __init_subclass__(cls, **kwargs) -> None:
+		super().__init_subclass__(**kwargs)
+		# transformations in flight are shared by instances with the same transform_key
+		cls._in_flight = {}
+	
+	@staticmethod
+	@abc.abstractmethod
+	def transform_key(key: object) -> object | collections.abc.Awaitable:
+		"""
+		Function that transforms the key before it is used in any operation.
+		It may be a coroutine function.
+		It must be idempotent, i.e. subsequent calls with the same key
+		must return the same result.
+		"""
+		raise NotImplementedError
+	
+	def __init__(self) -> None:
+		self.data = {}
+	
+	@classmethod
+	async def acreate(cls, other: collections.abc.Mapping | collections.abc.Iterable=(), /, **kwds) -> typing.Self:
+		"""
+		Create a dictionary with the items of a mapping or an iterable of key-value pairs, transforming all keys concurrently.
+		"""
+		new = cls()
+		await new.aupdate(other, **kwds)
+		return new
+	
+	async def _transform(self, key: object) -> object:
+		result = self.transform_key(key)
+		if inspect.isawaitable(result):
+			result = await result
+		if self.transform_cache is not None:
+			self.transform_cache.put(key, result)
+		return result
+	
+	async def atransform_key(self, key: object) -> object:
+		"""
+		Transform the key, reusing a cached result or a transformation of the same key already in flight.
+		"""
+		if self.transform_cache is not None:
+			result = self.transform_cache.get(key, self.__marker)
+			if result is not self.__marker:
+				return result
+		# tasks can only be awaited in their own event loop
+		entry_key = (asyncio.get_running_loop(), type(key), key)
+		in_flight = self._in_flight
+		try:
+			task = in_flight.get(entry_key)
+		except TypeError:
+			return await self._transform(key)
+		if task is None:
+			task = asyncio.ensure_future(self._transform(key))
+			in_flight[entry_key] = task
+			task.add_done_callback(lambda task: in_flight.pop(entry_key, None))
+		# a waiter being cancelled must not cancel the transformation shared with other waiters
+		return await asyncio.shield(task)
+	
+	async def atransform_keys(self, keys: collections.abc.Iterable) -> list:
+		"""
+		Transform many keys concurrently, returning them in input order.
+		"""
+		return await asyncio.gather(*map(self.atransform_key, keys))
+	
+	async def aget(self, key: object, default: object=None) -> object:
+		return self.data.get(await self.atransform_key(key), default)
+	
+	async def agetitem(self, key: object) -> object:
+		transformed_key = await self.atransform_key(key)
+		try:
+			return self.data[transformed_key]
+		except KeyError:
+			raise KeyError(key) from None
+	
+	async def acontains(self, key: object) -> bool:
+		return await self.atransform_key(key) in self.data
+	
+	async def aset(self, key: object, value: object) -> None:
+		self.data[await self.atransform_key(key)] = value
+	
+	async def asetdefault(self, key: object, default: object=None) -> object:
+		return self.data.setdefault(await self.atransform_key(key), default)
+	
+	async def apop(self, key: object, default: object=__marker) -> object:
+		transformed_key = await self.atransform_key(key)
+		try:
+			return self.data.pop(transformed_key)
+		except KeyError:
+			if default is self.__marker:
+				raise KeyError(key) from None
+			return default
+	
+	async def aupdate(self, other: collections.abc.Mapping | collections.abc.Iterable=(), /, **kwds) -> None:
+		"""
+		Update the dictionary from a mapping or an iterable of key-value pairs, transforming all keys concurrently.
+		"""
+		if isinstance(other, collections.abc.Mapping):
+			other = other.items()
+		items = [*other, *kwds.items()]
+		transformed_keys = await self.atransform_keys(key for key, value in items)
+		self.data.update(zip(transformed_keys, (value for key, value in items)))
+	
+	def __len__(self) -> int:
+		return len(self.data)
+	
+	def __iter__(self):
+		return iter(self.data)
+	
+	def __repr__(self) -> str:
+		return f'{type(self).__name__}({self.data!r})'
+	
+	def keys(self) -> collections.abc.KeysView:
+		return self.data.keys()
+	
+	def items(self) -> collections.abc.ItemsView:
+		return self.data.items()
+	
+	def values(self) -> collections.abc.ValuesView:
+		return self.data.values()
+	
+	def clear(self) -> None:
+		self.data.clear()
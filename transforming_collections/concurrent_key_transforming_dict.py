@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import contextlib
+import sys
+import threading
+import typing
+import weakref
+
+from . import instrumentation
+from .key_interning import intern_storage
+from .key_transforming_mixin import KeyTransformingMixin
+
+
+class SegmentMemoryInfo(typing.NamedTuple):
+	segments: int
+	shared_segments: int
+	owned_bytes: int
+	shared_bytes: int
+
+
+class _SegmentOwners:
+	"""
+	Instances sharing one segment dictionary after a snapshot, and the lock guarding its copy-on-write.
+	Created by the first snapshot of the segment; a segment without owners has a single owner.
+	"""
+	__slots__ = ('lock', 'owners')
+	
+	def __init__(self, owner: object) -> None:
+		self.lock = threading.Lock()
+		# mappings are unhashable, so owners are keyed by identity
+		self.owners = weakref.WeakValueDictionary({id(owner): owner})
+	
+	def add(self, owner: object) -> None:
+		self.owners[id(owner)] = owner
+	
+	def discard(self, owner: object) -> None:
+		self.owners.pop(id(owner), None)
+	
+	def __len__(self) -> int:
+		return len(self.owners)
+
+
+def _memory_info(instances: collections.abc.Iterable) -> SegmentMemoryInfo:
+	"""
+	Memory of the segments of the instances, counting a segment shared by several of them once.
+	"""
+	seen = set()
+	shared_segments = owned_bytes = shared_bytes = 0
+	for instance in instances:
+		for segment, owners in zip(instance._segments, instance._owners):
+			if id(segment) in seen:
+				continue
+			seen.add(id(segment))
+			if owners is not None and len(owners) > 1:
+				shared_segments += 1
+				shared_bytes += sys.getsizeof(segment)
+			else:
+				owned_bytes += sys.getsizeof(segment)
+	return SegmentMemoryInfo(len(seen), shared_segments, owned_bytes, shared_bytes)
+
+
+class ConcurrentKeyTransformingDict(KeyTransformingMixin, collections.abc.MutableMapping):
+	"""
+	Thread-safe dictionary that transforms keys before using them in any operation.
+	Requires subclassing and implementing the key transformation function.
+	Entries are sharded by the hash of the transformed key across segments, each guarded by its own lock.
+	Reads do not take locks; writes lock only the segment of the key,
+	so every single-key operation (including setdefault and pop) is atomic.
+	Operations spanning many keys (update, clear, iteration) are atomic per segment, not as a whole.
+	Iteration order is by segment, not by insertion.
+	Snapshots and copies share the segments with the original;
+	the first write to a shared segment copies only that segment.
+	"""
+	segment_count: typing.ClassVar[int] = 16
+	
+	class ItemsView(collections.abc.ItemsView):
+		@typing.override
+		def __contains__(self, item: object) -> bool:
+			key, value = item
+			key = self._mapping.transform_key(key)
+			try:
+				v = self._mapping._segment(key)[key]
+			except KeyError:
+				return False
+			return v is value or v == value
+		
+		@typing.override
+		def __iter__(self):
+			return self._mapping.transformed_items()
+	
+	class ValuesView(collections.abc.ValuesView):
+		@typing.override
+		def __iter__(self):
+			for key, value in self._mapping.transformed_items():
+				yield value
+	
+	__slots__ = ('_segments', '_locks', '_owners', '__weakref__')
+	
+	__marker = object()
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		if self.segment_count < 1:
+			raise ValueError(f"segment_count must be positive, not {self.segment_count!r}")
+		self._segments = [{} for _ in range(self.segment_count)]
+		self._locks = [threading.Lock() for _ in range(self.segment_count)]
+		# owners are tracked only once a segment is snapshotted, so unshared dictionaries stay small
+		self._owners = [None] * self.segment_count
+		self.update(other, **kwds)
+	
+	@classmethod
+	def fromkeys(cls, iterable, value: object=None) -> typing.Self:
+		new = cls()
+		new._update_transformed((cls.transform_key(key), value) for key in iterable)
+		return new
+	
+	def _segment_index(self, transformed_key: object) -> int:
+		return hash(transformed_key) % len(self._segments)
+	
+	def _segment(self, transformed_key: object) -> dict:
+		return self._segments[self._segment_index(transformed_key)]
+	
+	def _writable_segment(self, index: int) -> dict:
+		# must be called with the segment lock held, so no snapshot of this instance can add an owner meanwhile
+		owners = self._owners[index]
+		if owners is not None and len(owners) > 1:
+			with owners.lock:
+				if len(owners) > 1:
+					# the other owners write in place only after this instance stops owning the segment
+					self._segments[index] = self._segments[index].copy()
+					owners.discard(self)
+					self._owners[index] = None
+		return self._segments[index]
+	
+	def _update_transformed(self, items: collections.abc.Iterable) -> None:
+		# group by segment first, so each lock is taken once
+		staged = [{} for _ in self._segments]
+		segment_index = self._segment_index
+		for key, value in items:
+			staged[segment_index(key)][key] = value
+		for index, segment_items in enumerate(staged):
+			if segment_items:
+				with self._locks[index]:
+					self._writable_segment(index).update(segment_items)
+	
+	@typing.override
+	def __len__(self) -> int:
+		return sum(map(len, self._segments))
+	
+	@typing.override
+	def __iter__(self):
+		for segment, lock in zip(self._segments, self._locks):
+			with lock:
+				keys = list(segment)
+			yield from keys
+	
+	def transformed_items(self):
+		"""
+		Iterate over pairs of transformed keys and values, taking a snapshot of one segment at a time.
+		"""
+		for segment, lock in zip(self._segments, self._locks):
+			with lock:
+				items = list(segment.items())
+			yield from items
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		key = self.transform_key(key)
+		return key in self._segment(key)
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		key = self.transform_key(key)
+		return self._segment(key)[key]
+	
+	@typing.override
+	def get(self, key: object, default: object=None) -> object:
+		key = self.transform_key(key)
+		return self._segment(key).get(key, default)
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		key = self.transform_key(key)
+		index = self._segment_index(key)
+		with self._locks[index]:
+			self._writable_segment(index)[key] = value
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		key = self.transform_key(key)
+		index = self._segment_index(key)
+		with self._locks[index]:
+			if key not in self._segments[index]:
+				raise KeyError(key)
+			del self._writable_segment(index)[key]
+	
+	@typing.override
+	def pop(self, key: object, default: object=__marker) -> object:
+		key = self.transform_key(key)
+		index = self._segment_index(key)
+		with self._locks[index]:
+			if key not in self._segments[index]:
+				if default is self.__marker:
+					raise KeyError(key)
+				return default
+			return self._writable_segment(index).pop(key)
+	
+	@typing.override
+	def popitem(self) -> tuple[object, object]:
+		for index, lock in enumerate(self._locks):
+			with lock:
+				if self._segments[index]:
+					segment = self._writable_segment(index)
+					key = next(iter(segment))
+					return key, segment.pop(key)
+		raise KeyError('popitem(): dictionary is empty')
+	
+	@typing.override
+	def setdefault(self, key: object, default: object=None) -> object:
+		key = self.transform_key(key)
+		index = self._segment_index(key)
+		with self._locks[index]:
+			try:
+				return self._segments[index][key]
+			except KeyError:
+				self._writable_segment(index)[key] = default
+				return default
+	
+	@typing.override
+	def clear(self) -> None:
+		for index, lock in enumerate(self._locks):
+			with lock:
+				owners = self._owners[index]
+				if owners is not None and len(owners) > 1:
+					# a shared segment is replaced, not copied
+					with owners.lock:
+						owners.discard(self)
+					self._segments[index] = {}
+					self._owners[index] = None
+				else:
+					self._segments[index].clear()
+	
+	@typing.override
+	def update(self, other=(), /, **kwds) -> None:
+		if isinstance(other, type(self)):
+			items = other.transformed_items()
+		else:
+			if isinstance(other, collections.abc.Mapping):
+				other = other.items()
+			elif hasattr(other, 'keys'):
+				other = ((key, other[key]) for key in other.keys())
+			transform_key = self.transform_key
+			items = ((transform_key(key), value) for key, value in other)
+		self._update_transformed(items)
+		if kwds:
+			self._update_transformed((self.transform_key(key), value) for key, value in kwds.items())
+	
+	def snapshot(self) -> typing.Self:
+		"""
+		Return a copy sharing all segments with this dictionary until either side writes to them.
+		Each segment is captured atomically; the snapshot as a whole is consistent when there are no concurrent writers.
+		"""
+		new = type(self).__new__(type(self))
+		new._segments = [None] * len(self._segments)
+		new._locks = [threading.Lock() for _ in self._segments]
+		new._owners = [None] * len(self._segments)
+		for index, lock in enumerate(self._locks):
+			with lock:
+				owners = self._owners[index]
+				if owners is None:
+					owners = self._owners[index] = _SegmentOwners(self)
+				with owners.lock:
+					owners.add(new)
+				new._segments[index] = self._segments[index]
+				new._owners[index] = owners
+		return new
+	
+	copy = snapshot
+	__copy__ = snapshot
+	
+	def memory_info(self) -> SegmentMemoryInfo:
+		"""
+		Number of segments, how many of them are shared with snapshots,
+		and bytes of the hash tables of owned and shared segments (keys and values not included).
+		Totals over the instances of a class are reported by the instrumentation stats().
+		"""
+		return _memory_info((self, ))
+	
+	# memory of the segments of many instances, reported by the instrumentation stats()
+	_total_memory_info = staticmethod(_memory_info)
+	
+	@classmethod
+	def enable_instrumentation(cls) -> None:
+		"""
+		Start recording the transformations made by each operation, their latency, storage hits and misses,
+		and the segments of the instances created or snapshotted from now on.
+		"""
+		instrumentation.enable(cls)
+	
+	@classmethod
+	def disable_instrumentation(cls) -> None:
+		instrumentation.disable(cls)
+	
+	@classmethod
+	def stats(cls) -> instrumentation.TransformStats:
+		"""
+		Snapshot of the recorded counters, of the transform cache counters and of the segment memory.
+		"""
+		return instrumentation.stats(cls)
+	
+	@classmethod
+	def count_transforms(cls) -> contextlib.AbstractContextManager[collections.Counter]:
+		"""
+		Context manager counting the transformations made by each operation while it is active.
+		"""
+		return instrumentation.count_transforms(cls)
+	
+	def __getstate__(self) -> dict:
+		# locks cannot be pickled or copied, so the state is the plain transformed items
+		return dict(self.transformed_items())
+	
+	def __setstate__(self, state: dict) -> None:
+		self.__init__()
+		self._update_transformed(intern_storage(type(self), state).items())
+	
+	def __repr__(self) -> str:
+		return repr(dict(self.transformed_items()))
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, type(self)):
+			return dict(self.transformed_items()) == dict(other.transformed_items())
+		if isinstance(other, collections.UserDict):
+			return dict(self.transformed_items()) == other.data
+		if isinstance(other, collections.abc.Mapping):
+			return dict(self.transformed_items()) == dict(other.items())
+		return NotImplemented
+	
+	def __or__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		new = self.copy()
+		new.update(other)
+		return new
+	
+	def __ror__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		new = type(self)(other)
+		new.update(self)
+		return new
+	
+	def __ior__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		self.update(other)
+		return self
+	
+	@typing.override
+	def items(self) -> collections.abc.ItemsView:
+		return self.ItemsView(self)
+	
+	@typing.override
+	def values(self) -> collections.abc.ValuesView:
+		return self.ValuesView(self)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+import abc
+import collections
+import copy
+import typing
+
+from .key_transforming_dict import KeyTransformingDict, _reduce_transformed
+from .key_transforming_mixin import KeyTransformingMixin
+
+
+class FastKeyTransformingDict(KeyTransformingMixin, dict, metaclass=abc.ABCMeta):
+	"""
+	Dictionary that transforms keys before using them in any operation.
+	Requires subclassing and implementing the key transformation function.
+	Same semantics as KeyTransformingDict, but built directly on the builtin dict:
+	only operations taking keys are overridden, everything else runs at builtin speed.
+	Mappings that implement | for any dict (OrderedDict, defaultdict, UserDict)
+	take precedence when they are the left operand, as with other dict subclasses.
+	"""
+	pickle_buffer_threshold: typing.ClassVar[int] = KeyTransformingDict.pickle_buffer_threshold
+	
+	__slots__ = ('__weakref__', )
+	
+	ItemsView = KeyTransformingDict.ItemsView
+	ValuesView = KeyTransformingDict.ValuesView
+	
+	_contains_without_transform = dict.__contains__
+	_getitem_without_transform = dict.__getitem__
+	_setitem_without_transform = dict.__setitem__
+	_delitem_without_transform = dict.__delitem__
+	
+	__marker = object()
+	
+	def __new__(cls, *args, **kwds) -> typing.Self:
+		# dict.__new__ does not check abstract methods, unlike object.__new__
+		if cls.__abstractmethods__:
+			methods = ', '.join(repr(name) for name in sorted(cls.__abstractmethods__))
+			raise TypeError(f"Can't instantiate abstract class {cls.__name__} without an implementation for abstract method {methods}")
+		return dict.__new__(cls, *args, **kwds)
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		self.update(other, **kwds)
+	
+	@typing.override
+	@classmethod
+	def fromkeys(cls, iterable, value: object=None) -> typing.Self:
+		new = cls()
+		for key in iterable:
+			new[key] = value
+		return new
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return dict.__contains__(self, self.transform_key(key))
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		return dict.__getitem__(self, self.transform_key(key))
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		dict.__setitem__(self, self.transform_key(key), value)
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		dict.__delitem__(self, self.transform_key(key))
+	
+	@typing.override
+	def get(self, key: object, default: object=None) -> object:
+		return dict.get(self, self.transform_key(key), default)
+	
+	@typing.override
+	def pop(self, key: object, default: object=__marker) -> object:
+		key = self.transform_key(key)
+		if default is self.__marker:
+			return dict.pop(self, key)
+		return dict.pop(self, key, default)
+	
+	@typing.override
+	def popitem(self) -> tuple[object, object]:
+		try:
+			key = next(iter(self))
+		except StopIteration:
+			raise KeyError from None
+		return key, dict.pop(self, key)
+	
+	@typing.override
+	def setdefault(self, key: object, default: object=None) -> object:
+		return dict.setdefault(self, self.transform_key(key), default)
+	
+	@typing.override
+	def update(self, other=(), /, **kwds) -> None:
+		if isinstance(other, type(self)):
+			dict.update(self, other)
+		elif isinstance(other, collections.abc.Mapping):
+			for key in other:
+				self[key] = other[key]
+		elif hasattr(other, 'keys'):
+			for key in other.keys():
+				self[key] = other[key]
+		else:
+			for key, value in other:
+				self[key] = value
+		for key, value in kwds.items():
+			self[key] = value
+	
+	@typing.override
+	def copy(self) -> typing.Self:
+		new = type(self)()
+		dict.update(new, self)
+		return new
+	
+	def __copy__(self) -> typing.Self:
+		return self.copy()
+	
+	@typing.override
+	def __reduce_ex__(self, protocol: int) -> tuple:
+		return _reduce_transformed(self, dict.copy(self), protocol)
+	
+	def __deepcopy__(self, memo: dict) -> typing.Self:
+		new = type(self)()
+		memo[id(self)] = new
+		dict.update(new, copy.deepcopy(dict(self), memo))
+		return new
+	
+	@typing.override
+	def __or__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		new = self.copy()
+		new.update(other)
+		return new
+	
+	@typing.override
+	def __ror__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		new = type(self)(other)
+		new.update(self)
+		return new
+	
+	@typing.override
+	def __ior__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		self.update(other)
+		return self
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, dict):
+			return dict.__eq__(self, other)
+		if isinstance(other, collections.UserDict):
+			return dict.__eq__(self, other.data)
+		if isinstance(other, collections.abc.Mapping):
+			return dict.__eq__(self, dict(other.items()))
+		return NotImplemented
+	
+	@typing.override
+	def __ne__(self, other: object) -> bool:
+		result = self.__eq__(other)
+		if result is NotImplemented:
+			return result
+		return not result
+	
+	@typing.override
+	def keys(self) -> collections.abc.KeysView:
+		return collections.abc.KeysView(self)
+	
+	@typing.override
+	def items(self) -> collections.abc.ItemsView:
+		return self.ItemsView(self)
+	
+	@typing.override
+	def values(self) -> collections.abc.ValuesView:
+		return self.ValuesView(self)
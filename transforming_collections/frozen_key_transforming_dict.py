@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import copy
+import typing
+
+from .key_transforming_dict import KeyTransformingDict
+from .key_interning import intern_storage
+from .key_transforming_mixin import KeyTransformingMixin
+
+
+class FrozenKeyTransformingDict(KeyTransformingMixin, collections.abc.Mapping):
+	"""
+	Immutable, hashable dictionary that transforms keys before using them in any operation.
+	Requires subclassing and implementing the key transformation function.
+	The hash is computed on first use and cached; it requires all values to be hashable.
+	Copies return the same object, and instances of the same class share their storage.
+	"""
+	
+	ItemsView = KeyTransformingDict.ItemsView
+	ValuesView = KeyTransformingDict.ValuesView
+	
+	__slots__ = ('data', '_hash', '__weakref__')
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		self._hash = None
+		if isinstance(other, type(self)) and not kwds:
+			self.data = other.data
+			self._hash = other._hash
+			return
+		data = {}
+		if isinstance(other, type(self)):
+			data.update(other.data)
+		else:
+			if isinstance(other, collections.abc.Mapping):
+				other = other.items()
+			elif hasattr(other, 'keys'):
+				other = ((key, other[key]) for key in other.keys())
+			transform_key = self.transform_key
+			for key, value in other:
+				data[transform_key(key)] = value
+		for key, value in kwds.items():
+			data[self.transform_key(key)] = value
+		self.data = data
+	
+	@classmethod
+	def fromkeys(cls, iterable, value: object=None) -> typing.Self:
+		return cls._from_transformed(dict.fromkeys(map(cls.transform_key, iterable), value))
+	
+	@classmethod
+	def _from_transformed(cls, data: dict) -> typing.Self:
+		new = cls.__new__(cls)
+		new.data = data
+		new._hash = None
+		return new
+	
+	def _contains_without_transform(self, key: object) -> bool:
+		return key in self.data
+	
+	def _getitem_without_transform(self, key: object) -> object:
+		return self.data[key]
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return self.transform_key(key) in self.data
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		return self.data[self.transform_key(key)]
+	
+	@typing.override
+	def get(self, key: object, default: object=None) -> object:
+		return self.data.get(self.transform_key(key), default)
+	
+	@typing.override
+	def __iter__(self):
+		return iter(self.data)
+	
+	@typing.override
+	def __len__(self) -> int:
+		return len(self.data)
+	
+	def __repr__(self) -> str:
+		return repr(self.data)
+	
+	@typing.override
+	def __hash__(self) -> int:
+		if self._hash is None:
+			self._hash = hash(frozenset(self.data.items()))
+		return self._hash
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, type(self)):
+			if self.data is other.data:
+				return True
+			if self._hash is not None and other._hash is not None and self._hash != other._hash:
+				return False
+			return self.data == other.data
+		if isinstance(other, collections.UserDict):
+			return self.data == other.data
+		if isinstance(other, collections.abc.Mapping):
+			return self.data == dict(other.items())
+		return NotImplemented
+	
+	def __getstate__(self) -> tuple:
+		# string hashes are randomized per process, so the cached hash must not be pickled
+		return (getattr(self, '__dict__', None), {'data': self.data, '_hash': None})
+	
+	def __setstate__(self, state: tuple) -> None:
+		instance_state, slots = state
+		if instance_state:
+			vars(self).update(instance_state)
+		self.data = intern_storage(type(self), slots['data'])
+		self._hash = None
+	
+	def copy(self) -> typing.Self:
+		return self
+	
+	def __copy__(self) -> typing.Self:
+		return self
+	
+	def __deepcopy__(self, memo: dict) -> typing.Self:
+		# as for tuples, the copy is the same object unless some key or value is copied to a new object
+		data = self.data
+		items = [(copy.deepcopy(key, memo), copy.deepcopy(value, memo)) for key, value in data.items()]
+		try:
+			# a copy made while copying the items, through a reference cycle
+			return memo[id(self)]
+		except KeyError:
+			pass
+		if all(key_copy is key and value_copy is value for (key_copy, value_copy), (key, value) in zip(items, data.items())):
+			return self
+		new = self._from_transformed(dict(items))
+		memo[id(self)] = new
+		return new
+	
+	def __or__(self, other: object) -> typing.Self:
+		if isinstance(other, type(self)):
+			return self._from_transformed(self.data | other.data)
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		return self._from_transformed(self.data | type(self)(other).data)
+	
+	def __ror__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		return self._from_transformed(type(self)(other).data | self.data)
+	
+	@typing.override
+	def items(self) -> collections.abc.ItemsView:
+		return self.ItemsView(self)
+	
+	@typing.override
+	def values(self) -> collections.abc.ValuesView:
+		return self.ValuesView(self)
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import contextlib
+import functools
+import inspect
+import threading
+import time
+import typing
+import weakref
+
+from .transform_cache import CacheInfo
+
+
+# methods wrapped when instrumentation is enabled; only those the class has are wrapped
+OPERATIONS = (
+	'__init__', '__getitem__', '__contains__', '__setitem__', '__delitem__',
+	'get', 'pop', 'popitem', 'setdefault', 'update', 'clear', 'copy',
+	'__or__', '__ror__', '__ior__', '__eq__',
+	'fromkeys', 'wrap', 'from_columns', 'from_iterable', 'from_jsonl', 'from_csv', 'from_pairs_parallel',
+	'get_many', 'contains_many', 'set_many', 'delete_many', 'get_path',
+)
+# operations creating instances of segmented classes, tracked for their segment memory
+CONSTRUCTORS = ('__init__', 'snapshot', 'copy', '__copy__')
+# operations looking a single key up in the storage, counted as hits or misses
+LOOKUP_OPERATIONS = frozenset(('__getitem__', '__contains__', 'get', 'pop', 'setdefault'))
+# transformations made outside of any instrumented operation
+OTHER = 'other'
+
+_MISSING = object()
+
+
+class TransformStats(typing.NamedTuple):
+	transforms: dict[str, int]
+	latency: dict[str, dict[int, int]]
+	hits: int
+	misses: int
+	cache: CacheInfo | None
+	# SegmentMemoryInfo of the live instances created while instrumented, for segmented classes
+	segments: tuple | None = None
+
+
+class _Local(threading.local):
+	# outermost instrumented operation running in the thread
+	operation: str | None = None
+
+
+class _Recorder:
+	"""
+	Counters of one instrumented class, and the attributes its wrappers replaced.
+	"""
+	def __init__(self, cls: type) -> None:
+		self.cls = cls
+		self.originals = {}
+		self.counters = []
+		self._lock = threading.Lock()
+		self.local = _Local()
+		# segmented classes report the memory of many instances with _total_memory_info
+		self.total_memory_info = getattr(cls, '_total_memory_info', None)
+		# id -> weak reference to a live instance, or None for classes without segments
+		self.instances = None if self.total_memory_info is None else {}
+		self.reset()
+	
+	def reset(self) -> None:
+		with self._lock:
+			self.transforms = collections.Counter()
+			# operation -> upper bound of the latency bucket in nanoseconds -> transformations
+			self.latency = collections.defaultdict(collections.Counter)
+			self.hits = self.misses = 0
+	
+	def record_transform(self, elapsed: int) -> None:
+		operation = self.local.operation or OTHER
+		with self._lock:
+			self.transforms[operation] += 1
+			self.latency[operation][1 << elapsed.bit_length()] += 1
+			for counter in self.counters:
+				counter[operation] += 1
+	
+	def record_lookup(self, hit: bool) -> None:
+		with self._lock:
+			if hit:
+				self.hits += 1
+			else:
+				self.misses += 1
+	
+	def track(self, instance: object) -> None:
+		key = id(instance)
+		instances = self.instances
+		if key not in instances:
+			# the callback runs when the instance is collected, before its id can be reused
+			instances[key] = weakref.ref(instance, lambda ref: instances.pop(key, None))
+	
+	def stats(self) -> TransformStats:
+		segments = None
+		if self.instances is not None:
+			live = [instance for instance in (ref() for ref in list(self.instances.values())) if instance is not None]
+			segments = self.total_memory_info(live)
+		with self._lock:
+			return TransformStats(
+				dict(self.transforms),
+				{operation: dict(buckets) for operation, buckets in self.latency.items()},
+				self.hits,
+				self.misses,
+				_cache_info(self.cls),
+				segments,
+			)
+
+
+def _cache_info(cls: type) -> CacheInfo | None:
+	cache = getattr(cls, 'transform_cache', None)
+	return None if cache is None else cache.info()
+
+
+def _instrument_transform(recorder: _Recorder, transform: typing.Callable[[object], object]) -> typing.Callable[[object], object]:
+	@functools.wraps(transform)
+	def instrumented_transform(key: object) -> object:
+		start = time.perf_counter_ns()
+		try:
+			return transform(key)
+		finally:
+			recorder.record_transform(time.perf_counter_ns() - start)
+	
+	return instrumented_transform
+
+
+def _lookup(recorder: _Recorder, name: str, method: typing.Callable, signature: inspect.Signature, self: object, args: tuple, kwds: dict) -> object:
+	if name == '__contains__':
+		result = method(self, *args, **kwds)
+		recorder.record_lookup(result)
+		return result
+	if name == 'setdefault':
+		size = len(self)
+		result = method(self, *args, **kwds)
+		recorder.record_lookup(len(self) == size)
+		return result
+	if name != '__getitem__':
+		# get and pop take the key and the default by position or by keyword
+		self, key, *rest = signature.bind(self, *args, **kwds).args
+	if name == '__getitem__' or (name == 'pop' and not rest):
+		try:
+			result = method(self, *args, **kwds)
+		except KeyError:
+			recorder.record_lookup(False)
+			raise
+		recorder.record_lookup(True)
+		return result
+	# get, or pop with a default: a private default tells a miss from a stored default
+	default = rest[0] if rest else None
+	result = method(self, key, _MISSING)
+	recorder.record_lookup(result is not _MISSING)
+	return default if result is _MISSING else result
+
+
+def _instrument_operation(recorder: _Recorder, name: str, method: typing.Callable) -> typing.Callable:
+	local = recorder.local
+	lookup = name in LOOKUP_OPERATIONS
+	signature = inspect.signature(method) if name in ('get', 'pop') else None
+	
+	@functools.wraps(method)
+	def instrumented_operation(self, *args, **kwds):
+		# nested operations, such as update called by __init__, are attributed to the outermost one
+		if local.operation is not None:
+			return method(self, *args, **kwds)
+		local.operation = name
+		try:
+			if lookup:
+				return _lookup(recorder, name, method, signature, self, args, kwds)
+			return method(self, *args, **kwds)
+		finally:
+			local.operation = None
+	
+	return instrumented_operation
+
+
+def _track_instances(recorder: _Recorder, name: str, method: typing.Callable) -> typing.Callable:
+	@functools.wraps(method)
+	def tracking_constructor(self, *args, **kwds):
+		result = method(self, *args, **kwds)
+		recorder.track(self if name == '__init__' else result)
+		return result
+	
+	return tracking_constructor
+
+
+def _recorder(cls: type) -> _Recorder | None:
+	return cls.__dict__.get('_instrumentation')
+
+
+def enable(cls: type) -> None:
+	"""
+	Start recording transformations and lookups of the class and of its subclasses that do not override the instrumented methods.
+	The methods are replaced by recording wrappers on the class itself,
+	so a class that is not instrumented runs its methods unchanged.
+	"""
+	if _recorder(cls) is not None:
+		return
+	recorder = _Recorder(cls)
+	
+	def install(name: str, value: object) -> None:
+		recorder.originals.setdefault(name, cls.__dict__.get(name, _MISSING))
+		setattr(cls, name, value)
+	
+	install('transform_key', staticmethod(_instrument_transform(recorder, cls.transform_key)))
+	for name in OPERATIONS:
+		attribute = inspect.getattr_static(cls, name, None)
+		if isinstance(attribute, classmethod):
+			install(name, classmethod(_instrument_operation(recorder, name, attribute.__func__)))
+		elif callable(attribute):
+			install(name, _instrument_operation(recorder, name, attribute))
+	if recorder.instances is not None:
+		for name in CONSTRUCTORS:
+			install(name, _track_instances(recorder, name, getattr(cls, name)))
+	cls._instrumentation = recorder
+
+
+def disable(cls: type) -> None:
+	"""
+	Stop recording and restore the original methods of the class.
+	"""
+	recorder = _recorder(cls)
+	if recorder is None:
+		return
+	for name, original in recorder.originals.items():
+		if original is _MISSING:
+			delattr(cls, name)
+		else:
+			setattr(cls, name, original)
+	del cls._instrumentation
+
+
+def is_enabled(cls: type) -> bool:
+	return _recorder(cls) is not None
+
+
+def reset(cls: type) -> None:
+	"""
+	Reset the counters of an instrumented class.
+	"""
+	recorder = _recorder(cls)
+	if recorder is not None:
+		recorder.reset()
+
+
+def stats(cls: type) -> TransformStats:
+	"""
+	Snapshot of the transformations made by each operation, their latency histograms in nanoseconds,
+	storage hits and misses of single-key lookups, and the transform cache counters.
+	For segmented classes, it also reports the segments of the live instances created or snapshotted while instrumented,
+	counting a segment shared by snapshots once.
+	Counters are empty when the class is not instrumented.
+	"""
+	recorder = _recorder(cls)
+	if recorder is None:
+		return TransformStats({}, {}, 0, 0, _cache_info(cls))
+	return recorder.stats()
+
+
+@contextlib.contextmanager
+def count_transforms(cls: type) -> typing.Iterator[collections.Counter]:
+	"""
+	Count the transformations made by each operation while the context is active.
+	The class is instrumented for the duration of the context if it was not already.
+	"""
+	enabled = is_enabled(cls)
+	if not enabled:
+		enable(cls)
+	recorder = _recorder(cls)
+	counter = collections.Counter()
+	with recorder._lock:
+		recorder.counters.append(counter)
+	try:
+		yield counter
+	finally:
+		with recorder._lock:
+			recorder.counters.remove(counter)
+		if not enabled:
+			disable(cls)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import sys
+import typing
+import weakref
+
+
+def _canonical(key: object, table: weakref.WeakKeyDictionary) -> object:
+	"""
+	Canonical object equal to the transformed key: interned with sys.intern if it is a string,
+	interned in the weak table if it is hashable and weakly referenceable, or the key itself otherwise.
+	"""
+	if type(key) is str:
+		return sys.intern(key)
+	try:
+		ref = table.get(key)
+	except TypeError:
+		return key
+	if ref is not None:
+		canonical = ref()
+		if canonical is not None:
+			return canonical
+	table[key] = weakref.ref(key)
+	return key
+
+
+def interning(transform: typing.Callable[[object], object], table: weakref.WeakKeyDictionary) -> typing.Callable[[object], object]:
+	"""
+	Return a function that transforms keys and returns a canonical object for equal results,
+	so that equal transformed keys are stored once across all dictionaries.
+	"""
+	intern = sys.intern
+	
+	def interned_transform(key: object) -> object:
+		result = transform(key)
+		# strings are checked here, so that the common case costs no further call
+		if type(result) is str:
+			return intern(result)
+		return _canonical(result, table)
+	
+	interned_transform.__name__ = getattr(transform, '__name__', 'interned_transform')
+	interned_transform.__doc__ = getattr(transform, '__doc__', None)
+	return interned_transform
+
+
+def install_key_interning(cls: type) -> None:
+	"""
+	Intern the results of the class's transform_key if intern_keys is set,
+	when the class declares intern_keys or its own transform_key.
+	Must be called before install_transform_cache, so that the cache holds interned keys.
+	"""
+	if not getattr(cls, 'intern_keys', False):
+		return
+	if 'intern_keys' in cls.__dict__ or 'transform_key' in cls.__dict__:
+		# result -> weak reference to the canonical result
+		cls._intern_table = weakref.WeakKeyDictionary()
+		cls.transform_key = staticmethod(interning(cls.transform_key, cls._intern_table))
+
+
+def intern_transformed(cls: type, keys: collections.abc.Iterable) -> collections.abc.Iterable:
+	"""
+	Intern keys already transformed by the class, as its transform_key does, for keys stored without calling it.
+	The keys are returned as they are if the class does not intern keys.
+	"""
+	if not getattr(cls, 'intern_keys', False):
+		return keys
+	table = cls._intern_table
+	return [_canonical(key, table) for key in keys]
+
+
+def intern_storage(cls: type, data: dict | set | frozenset) -> dict | set | frozenset:
+	"""
+	Dictionary or set with the keys of data interned by intern_transformed, or data itself if the class does not intern keys.
+	"""
+	if not getattr(cls, 'intern_keys', False):
+		return data
+	if isinstance(data, dict):
+		return dict(zip(intern_transformed(cls, data), data.values()))
+	return type(data)(intern_transformed(cls, data))
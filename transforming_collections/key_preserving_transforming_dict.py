@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import typing
+
+from .key_interning import intern_storage
+from .key_transforming_mixin import KeyTransformingMixin
+
+
+class KeyPreservingTransformingDict(KeyTransformingMixin, collections.abc.MutableMapping):
+	"""
+	Dictionary that transforms keys before using them in any operation,
+	but remembers each key as it was last inserted and returns it from iteration.
+	Requires subclassing and implementing the key transformation function.
+	Values are stored by transformed key; original keys are stored in a second dictionary
+	only when they differ from their transformation, so keys inserted already transformed take no extra memory.
+	"""
+	
+	class ItemsView(collections.abc.ItemsView):
+		@typing.override
+		def __contains__(self, item: object) -> bool:
+			key, value = item
+			try:
+				v = self._mapping._data[self._mapping.transform_key(key)]
+			except KeyError:
+				return False
+			return v is value or v == value
+		
+		@typing.override
+		def __iter__(self):
+			original_keys = self._mapping._original_keys
+			for transformed_key, value in self._mapping._data.items():
+				yield (original_keys.get(transformed_key, transformed_key), value)
+	
+	class ValuesView(collections.abc.ValuesView):
+		@typing.override
+		def __iter__(self):
+			return iter(self._mapping._data.values())
+	
+	__slots__ = ('_data', '_original_keys', '__weakref__')
+	
+	__marker = object()
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		# transformed key -> value
+		self._data = {}
+		# transformed key -> original key, for original keys that differ from their transformation
+		self._original_keys = {}
+		self.update(other, **kwds)
+	
+	@classmethod
+	def fromkeys(cls, iterable, value: object=None) -> typing.Self:
+		new = cls()
+		for key in iterable:
+			new[key] = value
+		return new
+	
+	def _set_transformed(self, transformed_key: object, key: object, value: object) -> None:
+		self._data[transformed_key] = value
+		if type(key) is type(transformed_key) and key == transformed_key:
+			self._original_keys.pop(transformed_key, None)
+		else:
+			self._original_keys[transformed_key] = key
+	
+	def _pop_transformed(self, transformed_key: object) -> object:
+		value = self._data.pop(transformed_key)
+		if self._original_keys:
+			self._original_keys.pop(transformed_key, None)
+		return value
+	
+	@typing.override
+	def __len__(self) -> int:
+		return len(self._data)
+	
+	@typing.override
+	def __iter__(self):
+		original_keys = self._original_keys
+		for transformed_key in self._data:
+			yield original_keys.get(transformed_key, transformed_key)
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return self.transform_key(key) in self._data
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		return self._data[self.transform_key(key)]
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		self._set_transformed(self.transform_key(key), key, value)
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		self._pop_transformed(self.transform_key(key))
+	
+	@typing.override
+	def get(self, key: object, default: object=None) -> object:
+		return self._data.get(self.transform_key(key), default)
+	
+	@typing.override
+	def pop(self, key: object, default: object=__marker) -> object:
+		transformed_key = self.transform_key(key)
+		if transformed_key in self._data:
+			return self._pop_transformed(transformed_key)
+		if default is self.__marker:
+			raise KeyError(key)
+		return default
+	
+	@typing.override
+	def setdefault(self, key: object, default: object=None) -> object:
+		transformed_key = self.transform_key(key)
+		try:
+			return self._data[transformed_key]
+		except KeyError:
+			self._set_transformed(transformed_key, key, default)
+			return default
+	
+	@typing.override
+	def popitem(self) -> tuple[object, object]:
+		for transformed_key in self._data:
+			break
+		else:
+			raise KeyError('popitem(): dictionary is empty')
+		key = self._original_keys.get(transformed_key, transformed_key)
+		return (key, self._pop_transformed(transformed_key))
+	
+	@typing.override
+	def clear(self) -> None:
+		self._data.clear()
+		self._original_keys.clear()
+	
+	@typing.override
+	def update(self, other=(), /, **kwds) -> None:
+		if isinstance(other, type(self)):
+			for transformed_key in other._data:
+				self._original_keys.pop(transformed_key, None)
+			self._data.update(other._data)
+			self._original_keys.update(other._original_keys)
+			other = ()
+		super().update(other, **kwds)
+	
+	def transformed_items(self):
+		"""
+		Iterate over pairs of transformed keys and values.
+		"""
+		return iter(self._data.items())
+	
+	def copy(self) -> typing.Self:
+		new = type(self)()
+		new.update(self)
+		return new
+	
+	__copy__ = copy
+	
+	def __getstate__(self) -> tuple:
+		# explicit, as protocols 0 and 1 cannot pickle slots by default
+		slots = {'_data': self._data, '_original_keys': self._original_keys}
+		return (getattr(self, '__dict__', None), slots)
+	
+	def __setstate__(self, state: tuple) -> None:
+		instance_state, slots = state
+		if instance_state:
+			vars(self).update(instance_state)
+		self._data = intern_storage(type(self), slots['_data'])
+		self._original_keys = intern_storage(type(self), slots['_original_keys'])
+	
+	def __repr__(self) -> str:
+		return repr(dict(self.items()))
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		if not isinstance(other, type(self)):
+			other = type(self)(other)
+		return self._data == other._data
+	
+	def __or__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		new = self.copy()
+		new.update(other)
+		return new
+	
+	def __ror__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		new = type(self)(other)
+		new.update(self)
+		return new
+	
+	def __ior__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Mapping):
+			return NotImplemented
+		self.update(other)
+		return self
+	
+	@typing.override
+	def items(self) -> collections.abc.ItemsView:
+		return self.ItemsView(self)
+	
+	@typing.override
+	def values(self) -> collections.abc.ValuesView:
+		return self.ValuesView(self)
@@ -1,24 +1,154 @@
 # -*- coding: utf-8 -*-
 
 import collections
-import abc
+import concurrent.futures
+import contextlib
+import csv
+import functools
+import itertools
+import json
+import os
+import pickle
 import typing
 
+from . import instrumentation
+from . import key_transforming_record
+from .key_interning import intern_storage, intern_transformed
+from .key_transforming_mixin import KeyTransformingMixin
+from .transforms import is_str_array
 
-class BaseKeyTransformingDict(collections.UserDict[object, object]):
+
+def _restore(cls: type, data: dict, state: dict, buffer_keys: tuple) -> object:
+	"""
+	Rebuild a pickled dictionary from its storage of already transformed keys.
+	"""
+	for key in buffer_keys:
+		# out-of-band buffers arrive as whatever buffer objects the loader was given
+		data[key] = bytes(data[key])
+	# unpickled keys are new objects, which are not interned by transform_key
+	data = intern_storage(cls, data)
+	new = cls.__new__(cls)
+	if isinstance(new, dict):
+		dict.update(new, data)
+	else:
+		new.data = data
+	for name, value in state.items():
+		setattr(new, name, value)
+	return new
+
+
+def _split_pairs(pairs: collections.abc.Iterable) -> tuple[list, list]:
+	keys = []
+	values = []
+	for key, value in pairs:
+		keys.append(key)
+		values.append(value)
+	return keys, values
+
+
+def _jsonl_pairs(file: typing.TextIO, key_field: str, value_field: str | None) -> collections.abc.Iterator[tuple[object, object]]:
+	for line in file:
+		if line.strip():
+			record = json.loads(line)
+			yield (record[key_field], record if value_field is None else record[value_field])
+
+
+def _csv_pairs(file: typing.TextIO, key_column: str, value_column: str | None, fmtparams: dict) -> collections.abc.Iterator[tuple[object, object]]:
+	for row in csv.DictReader(file, **fmtparams):
+		yield (row[key_column], row if value_column is None else row[value_column])
+
+
+def _transform_chunk(cls: type, keys: collections.abc.Iterable) -> list:
+	"""
+	Transform a chunk of keys in a worker process.
+	"""
+	return cls().transform_keys(keys)
+
+
+def _reduce_transformed(obj: object, data: dict, protocol: int) -> tuple:
+	# slotted dictionaries have no instance dictionary
+	state = dict(getattr(obj, '__dict__', ()))
+	state.pop('data', None)
+	buffer_keys = ()
+	if protocol >= 5:
+		threshold = obj.pickle_buffer_threshold
+		buffer_keys = tuple(key for key, value in data.items() if type(value) is bytes and len(value) >= threshold)
+		if buffer_keys:
+			data = data.copy()
+			for key in buffer_keys:
+				data[key] = pickle.PickleBuffer(data[key])
+	return (_restore, (type(obj), data, state, buffer_keys))
+
+
+class BaseKeyTransformingDict(KeyTransformingMixin, collections.UserDict[object, object]):
 	"""
 	Dictionary that transforms keys before using them in any operation.
 	Requires subclassing and implementing the key transformation function.
+	Subclasses may set transform_cache to memoize the transformation of repeated keys.
+	Subclasses may set intern_keys to share a single object for equal transformed keys across all instances.
+	Pickling stores the transformed keys, so unpickling does not transform them again;
+	with protocol 5, bytes values of at least pickle_buffer_threshold bytes can be sent out-of-band.
+	Transformations and lookups can be recorded with enable_instrumentation(), at no cost while it is disabled.
 	"""
-	@staticmethod
-	@abc.abstractmethod
-	def transform_key(key: object) -> object:
+	pickle_buffer_threshold: typing.ClassVar[int] = 64 * 1024
+	
+	@typing.override
+	def __reduce_ex__(self, protocol: int) -> tuple:
+		return _reduce_transformed(self, self.data, protocol)
+	
+	def to_json(self, **kwds) -> str:
+		"""
+		Serialize to JSON from the stored keys, without transforming them.
+		Nested key transforming dictionaries are serialized the same way.
+		Keyword arguments are passed to json.dumps.
+		"""
+		default = kwds.pop('default', None)
+		
+		def json_default(obj: object) -> object:
+			if isinstance(obj, _UntrustedStorage):
+				return obj._normalized().data
+			if isinstance(obj, BaseKeyTransformingDict):
+				return obj.data
+			if default is None:
+				raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+			return default(obj)
+		
+		return json.dumps(self.data, default=json_default, **kwds)
+	
+	@classmethod
+	def enable_instrumentation(cls) -> None:
+		"""
+		Start recording the transformations made by each operation, their latency, and storage hits and misses.
+		"""
+		instrumentation.enable(cls)
+	
+	@classmethod
+	def disable_instrumentation(cls) -> None:
+		instrumentation.disable(cls)
+	
+	@classmethod
+	def stats(cls) -> instrumentation.TransformStats:
+		"""
+		Snapshot of the recorded counters and of the transform cache counters.
+		"""
+		return instrumentation.stats(cls)
+	
+	@classmethod
+	def count_transforms(cls) -> contextlib.AbstractContextManager[collections.Counter]:
 		"""
-		Function that transforms the key before it is used in any operation.
-		It must be idempotent, i.e. subsequent calls with the same key
-		must return the same result.
+		Context manager counting the transformations made by each operation while it is active.
 		"""
-		raise NotImplementedError
+		return instrumentation.count_transforms(cls)
+	
+	@classmethod
+	def record_type(cls, fields: collections.abc.Iterable, name: str | None=None) -> type[key_transforming_record.KeyTransformingRecord]:
+		"""
+		Return a mapping class for many records with the same fields, such as rows of a table.
+		The field names are transformed once, here; each record stores only a list of values,
+		and keys outside of the fields go to an overflow dictionary of the record.
+		Records look keys up with the transformation of this class, and equal schemas share one class.
+		"""
+		return key_transforming_record.record_type(cls, tuple(map(cls.transform_key, fields)), name or f'{cls.__name__}Record')
 	
 	@typing.override
 	def __contains__(self, key: object) -> bool:
@@ -70,7 +200,10 @@ class KeyTransformingDict(BaseKeyTransformingDict):
 	Requires subclassing and implementing the key transformation function.
 	Optimized so keys are transformed only when necessary, and without repeated redundant transformations.
 	Best for cases where transforming a key is an expensive operation.
+	Bulk operations convert NumPy arrays of str to str at once, or pass them to vectorized_transform_key if a subclass sets it.
 	"""
+	vectorized_transform_key: typing.ClassVar[typing.Callable[[object], list] | None] = None
+	
 	class ItemsView(collections.abc.ItemsView):
 		@typing.override
 		def __contains__(self, item: object) -> bool:
@@ -116,6 +249,184 @@ class KeyTransformingDict(BaseKeyTransformingDict):
 	def _delitem_without_transform(self, key: object) -> None:
 		super(BaseKeyTransformingDict, self).__delitem__(key)
 	
+	def _update_without_transform(self, items: dict) -> None:
+		self.data.update(items)
+	
+	def _transformed_keys(self, storage_keys: collections.abc.Iterable) -> collections.abc.Iterable:
+		# keys of the storage are the transformed keys, unless it was wrapped untrusted
+		return storage_keys
+	
+	def transform_keys(self, keys: collections.abc.Iterable) -> list:
+		"""
+		Function that transforms many keys at once, used by the batch operations.
+		It must return the keys transformed as by transform_key, in input order.
+		Subclasses may override it with a vectorized implementation.
+		"""
+		if is_str_array(keys):
+			if self.vectorized_transform_key is not None:
+				return intern_transformed(type(self), self.vectorized_transform_key(keys))
+			# one C-level conversion to str is much cheaper than iterating over NumPy scalars
+			keys = keys.tolist()
+		transform_key = self.transform_key
+		return [transform_key(key) for key in keys]
+	
+	@typing.override
+	@classmethod
+	def fromkeys(cls, iterable: collections.abc.Iterable, value: object=None) -> typing.Self:
+		new = cls()
+		new._update_without_transform(dict.fromkeys(new.transform_keys(iterable), value))
+		return new
+	
+	@classmethod
+	def wrap(cls, data: dict, trusted: bool=True) -> typing.Self:
+		"""
+		Create a dictionary that uses data as its storage, without copying it; reads and writes go through transform_key.
+		If trusted, the keys of data must already be transformed.
+		Otherwise, the first lookup that misses builds an index of the keys of data that are not transformed,
+		and data must not hold several keys that are equal up to transformation.
+		"""
+		if not trusted:
+			cls = _untrusted_class(cls)
+		new = cls()
+		new.data = data
+		return new
+	
+	@classmethod
+	def json_hook(cls) -> typing.Callable[[list[tuple[str, object]]], typing.Self]:
+		"""
+		Return a function to pass as object_pairs_hook to json.load or json.loads,
+		so that every JSON object is built directly as an instance of the class, with one transformation per key.
+		"""
+		# the dictionary built from the pairs becomes the storage, unless the class keeps other state in sync with it
+		adopt = cls._update_without_transform is KeyTransformingDict._update_without_transform
+		
+		def object_pairs_hook(pairs: list[tuple[str, object]]) -> typing.Self:
+			new = cls()
+			keys, values = _split_pairs(pairs)
+			if adopt:
+				new.data = dict(zip(new.transform_keys(keys), values))
+			else:
+				new._update_without_transform(dict(zip(new.transform_keys(keys), values)))
+			return new
+		
+		return object_pairs_hook
+	
+	@classmethod
+	def from_pairs_parallel(cls, iterable: collections.abc.Mapping | collections.abc.Iterable, workers: int | None=None, chunksize: int=10_000) -> typing.Self:
+		"""
+		Create a dictionary from a mapping or an iterable of key-value pairs, transforming the keys in worker processes.
+		The result is the same as from update(): items are merged in input order, so the last value of equal keys wins.
+		Inputs that fit in fewer than two chunks are transformed serially.
+		The class must be importable by the workers, and keys and transformed keys must be picklable.
+		"""
+		if isinstance(iterable, collections.abc.Mapping):
+			iterable = iterable.items()
+		workers = workers or os.cpu_count() or 1
+		chunks = itertools.batched(iterable, chunksize)
+		head = list(itertools.islice(chunks, 2))
+		if workers == 1 or len(head) < 2:
+			return cls.from_columns(*_split_pairs(itertools.chain.from_iterable(itertools.chain(head, chunks))))
+		staged = {}
+		with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+			# at most two chunks per worker are in flight, so the input is streamed
+			pending = collections.deque()
+			for chunk in itertools.chain(head, chunks):
+				keys, values = _split_pairs(chunk)
+				pending.append((executor.submit(_transform_chunk, cls, keys), values))
+				if len(pending) > 2 * workers:
+					future, values = pending.popleft()
+					staged.update(zip(intern_transformed(cls, future.result()), values))
+			for future, values in pending:
+				staged.update(zip(intern_transformed(cls, future.result()), values))
+		new = cls()
+		new._update_without_transform(staged)
+		return new
+	
+	@classmethod
+	def from_iterable(cls, iterable: collections.abc.Iterable, chunksize: int=10_000, progress: typing.Callable[[int], object] | None=None) -> typing.Self:
+		"""
+		Create a dictionary from an iterable of key-value pairs, read and transformed one chunk at a time,
+		so that only the result and a single chunk of the input are held in memory.
+		If given, progress is called with the number of pairs read so far after each chunk.
+		"""
+		new = cls()
+		count = 0
+		for chunk in itertools.batched(iterable, chunksize):
+			keys, values = _split_pairs(chunk)
+			new._update_without_transform(dict(zip(new.transform_keys(keys), values)))
+			count += len(chunk)
+			if progress is not None:
+				progress(count)
+		return new
+	
+	@classmethod
+	def from_jsonl(cls, path: str | os.PathLike, key_field: str, value_field: str | None=None, *, chunksize: int=10_000, progress: typing.Callable[[int], object] | None=None, encoding: str='utf-8') -> typing.Self:
+		"""
+		Create a dictionary from a file of JSON objects, one per line, streamed as by from_iterable.
+		Keys are taken from key_field, and values from value_field, or are the whole objects if it is None.
+		"""
+		with open(path, encoding=encoding) as file:
+			return cls.from_iterable(_jsonl_pairs(file, key_field, value_field), chunksize, progress)
+	
+	@classmethod
+	def from_csv(cls, path: str | os.PathLike, key_column: str, value_column: str | None=None, *, chunksize: int=10_000, progress: typing.Callable[[int], object] | None=None, encoding: str='utf-8', **fmtparams) -> typing.Self:
+		"""
+		Create a dictionary from a CSV file with a header row, streamed as by from_iterable.
+		Keys are taken from key_column, and values from value_column, or are whole rows as dicts if it is None.
+		Other keyword arguments are passed to csv.DictReader.
+		"""
+		with open(path, encoding=encoding, newline='') as file:
+			return cls.from_iterable(_csv_pairs(file, key_column, value_column, fmtparams), chunksize, progress)
+	
+	@classmethod
+	def from_columns(cls, keys: collections.abc.Iterable, values: collections.abc.Iterable) -> typing.Self:
+		"""
+		Create a dictionary from a column of keys and a column of values of the same length.
+		"""
+		new = cls()
+		new._update_without_transform(dict(zip(new.transform_keys(keys), values, strict=True)))
+		return new
+	
+	def get_many(self, keys: collections.abc.Iterable, default: object=None) -> list:
+		"""
+		Return the values for the keys, in input order, with default for missing keys.
+		"""
+		data = self.data
+		return [data.get(key, default) for key in self.transform_keys(keys)]
+	
+	def contains_many(self, keys: collections.abc.Iterable) -> list[bool]:
+		"""
+		Return whether each of the keys is present, in input order.
+		"""
+		data = self.data
+		return [key in data for key in self.transform_keys(keys)]
+	
+	def set_many(self, items: collections.abc.Mapping | collections.abc.Iterable) -> None:
+		"""
+		Set the values for all keys from a mapping or an iterable of key-value pairs.
+		Either all items are set, or - if any key cannot be transformed or stored - none.
+		"""
+		if isinstance(items, collections.abc.Mapping):
+			keys = list(items)
+			values = [items[key] for key in keys]
+		else:
+			keys, values = _split_pairs(items)
+		staged = dict(zip(self.transform_keys(keys), values))
+		self._update_without_transform(staged)
+	
+	def delete_many(self, keys: collections.abc.Iterable) -> None:
+		"""
+		Delete all keys.
+		Either all keys are deleted, or - if any key is missing - none, and KeyError is raised.
+		"""
+		data = self.data
+		staged = dict.fromkeys(self.transform_keys(keys))
+		for key in staged:
+			if key not in data:
+				raise KeyError(key)
+		for key in staged:
+			self._delitem_without_transform(key)
+	
 	@typing.override
 	def get(self, key: object, default: object=None) -> object:
 		key = self.transform_key(key)
@@ -183,3 +494,140 @@ class KeyTransformingDict(BaseKeyTransformingDict):
 	@typing.override
 	def values(self) -> collections.abc.ValuesView:
 		return self.ValuesView(self)
+
+
+class _UntrustedStorage:
+	"""
+	Mixin for dictionaries wrapping storage whose keys may not be transformed.
+	Transformed keys missing from the storage are looked up in an index of aliases,
+	from transformed keys to the storage keys that are not transformed, built on the first miss.
+	"""
+	_aliases: dict | None = None
+	
+	def _build_aliases(self) -> dict:
+		transform_key = self.transform_key
+		aliases = {}
+		for key in self.data:
+			transformed_key = transform_key(key)
+			if transformed_key != key:
+				aliases[transformed_key] = key
+		self._aliases = aliases
+		return aliases
+	
+	def _storage_key(self, key: object) -> object:
+		if key in self.data:
+			return key
+		aliases = self._aliases
+		if aliases is None:
+			aliases = self._build_aliases()
+		return aliases.get(key, key)
+	
+	def _normalized(self) -> KeyTransformingDict:
+		new = self._unwrapped_class()
+		new._update_without_transform(dict(self.items()))
+		return new
+	
+	@typing.override
+	def _contains_without_transform(self, key: object) -> bool:
+		return super()._contains_without_transform(self._storage_key(key))
+	
+	@typing.override
+	def _getitem_without_transform(self, key: object) -> object:
+		return super()._getitem_without_transform(self._storage_key(key))
+	
+	@typing.override
+	def _setitem_without_transform(self, key: object, value: object) -> None:
+		super()._setitem_without_transform(self._storage_key(key), value)
+	
+	@typing.override
+	def _delitem_without_transform(self, key: object) -> None:
+		super()._delitem_without_transform(self._storage_key(key))
+		if self._aliases:
+			self._aliases.pop(key, None)
+	
+	@typing.override
+	def _update_without_transform(self, items: dict) -> None:
+		for key, value in items.items():
+			self._setitem_without_transform(key, value)
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return self._contains_without_transform(self.transform_key(key))
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		return self._getitem_without_transform(self.transform_key(key))
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		self._setitem_without_transform(self.transform_key(key), value)
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		self._delitem_without_transform(self.transform_key(key))
+	
+	@typing.override
+	def _transformed_keys(self, storage_keys: collections.abc.Iterable) -> collections.abc.Iterable:
+		aliases = self._aliases
+		if aliases is None:
+			aliases = self._build_aliases()
+		if not aliases:
+			return storage_keys
+		transformed_keys = {key: transformed_key for transformed_key, key in aliases.items()}
+		return (transformed_keys.get(key, key) for key in storage_keys)
+	
+	@typing.override
+	def __iter__(self):
+		return iter(self._transformed_keys(self.data))
+	
+	@typing.override
+	def get_many(self, keys: collections.abc.Iterable, default: object=None) -> list:
+		return [self._getitem_without_transform(key) if self._contains_without_transform(key) else default for key in self.transform_keys(keys)]
+	
+	@typing.override
+	def contains_many(self, keys: collections.abc.Iterable) -> list[bool]:
+		return [self._contains_without_transform(key) for key in self.transform_keys(keys)]
+	
+	@typing.override
+	def delete_many(self, keys: collections.abc.Iterable) -> None:
+		staged = dict.fromkeys(self.transform_keys(keys))
+		for key in staged:
+			if not self._contains_without_transform(key):
+				raise KeyError(key)
+		for key in staged:
+			self._delitem_without_transform(key)
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, _UntrustedStorage):
+			other = other._normalized()
+		aliases = self._aliases
+		if aliases is None:
+			aliases = self._build_aliases()
+		if not aliases:
+			return super().__eq__(other)
+		return self._normalized() == other
+	
+	@typing.override
+	def __reduce_ex__(self, protocol: int) -> tuple:
+		return self._normalized().__reduce_ex__(protocol)
+	
+	@typing.override
+	def to_json(self, **kwds) -> str:
+		return self._normalized().to_json(**kwds)
+	
+	def __copy__(self) -> KeyTransformingDict:
+		return self._normalized()
+	
+	@typing.override
+	def copy(self) -> KeyTransformingDict:
+		return self._normalized()
+
+
+@functools.cache
+def _untrusted_class(cls: type) -> type:
+	return type(cls.__name__, (_UntrustedStorage, cls), {
+		'__module__': cls.__module__,
+		'__qualname__': cls.__qualname__,
+		'_unwrapped_class': cls,
+	})
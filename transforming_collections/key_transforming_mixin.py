@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import abc
+import typing
+
+from .key_interning import install_key_interning
+from .transform_cache import TransformCache, install_transform_cache
+
+
+class KeyTransformingMixin(metaclass=abc.ABCMeta):
+	"""
+	Key transformation shared by the key transforming collections: the abstract transform_key,
+	and the interning and caching of its results, installed on subclasses that set intern_keys or transform_cache.
+	"""
+	transform_cache: typing.ClassVar[TransformCache | None] = None
+	intern_keys: typing.ClassVar[bool] = False
+	
+	__slots__ = ()
+	
+	def __init_subclass__(cls, **kwargs) -> None:
+		super().__init_subclass__(**kwargs)
+		install_key_interning(cls)
+		install_transform_cache(cls)
+	
+	@staticmethod
+	@abc.abstractmethod
+	def transform_key(key: object) -> object:
+		"""
+		Function that transforms the key before it is used in any operation.
+		It must be idempotent, i.e. subsequent calls with the same key
+		must return the same result.
+		"""
+		raise NotImplementedError
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import functools
+import typing
+
+
+_MISSING = object()
+
+
+class KeyTransformingRecord(collections.abc.MutableMapping):
+	"""
+	Mapping with a fixed schema of transformed field names shared by all instances of the class.
+	Created by record_type() of a key transforming dictionary, which transforms the field names once.
+	Each record stores the values of the fields in a list ordered as fields, without a hash table of its own;
+	keys outside of the schema are stored in an overflow dictionary, created on first use.
+	"""
+	fields: typing.ClassVar[tuple] = ()
+	# transformed field name -> position in the values
+	_positions: typing.ClassVar[dict] = {}
+	# key transforming dictionary class the schema was created from
+	_owner: typing.ClassVar[type]
+	
+	__slots__ = ('_values', '_overflow')
+	
+	__marker = object()
+	
+	@staticmethod
+	def transform_key(key: object) -> object:
+		return key
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		self._values = [_MISSING] * len(self.fields)
+		self._overflow = None
+		self.update(other, **kwds)
+	
+	@classmethod
+	def from_values(cls, values: collections.abc.Iterable) -> typing.Self:
+		"""
+		Create a record from the values of all fields, in the order of fields, without transforming any key.
+		"""
+		values = list(values)
+		if len(values) != len(cls.fields):
+			raise ValueError(f"expected {len(cls.fields)} values, got {len(values)}")
+		new = cls.__new__(cls)
+		new._values = values
+		new._overflow = None
+		return new
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		transformed_key = self.transform_key(key)
+		position = self._positions.get(transformed_key)
+		if position is None:
+			if self._overflow is None:
+				raise KeyError(key)
+			return self._overflow[transformed_key]
+		value = self._values[position]
+		if value is _MISSING:
+			raise KeyError(key)
+		return value
+	
+	@typing.override
+	def get(self, key: object, default: object=None) -> object:
+		transformed_key = self.transform_key(key)
+		position = self._positions.get(transformed_key)
+		if position is None:
+			if self._overflow is None:
+				return default
+			return self._overflow.get(transformed_key, default)
+		value = self._values[position]
+		return default if value is _MISSING else value
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return self.get(key, self.__marker) is not self.__marker
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		transformed_key = self.transform_key(key)
+		position = self._positions.get(transformed_key)
+		if position is not None:
+			self._values[position] = value
+		elif self._overflow is None:
+			self._overflow = {transformed_key: value}
+		else:
+			self._overflow[transformed_key] = value
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		transformed_key = self.transform_key(key)
+		position = self._positions.get(transformed_key)
+		if position is None:
+			if self._overflow is None:
+				raise KeyError(key)
+			del self._overflow[transformed_key]
+		elif self._values[position] is _MISSING:
+			raise KeyError(key)
+		else:
+			self._values[position] = _MISSING
+	
+	@typing.override
+	def __iter__(self):
+		for field, value in zip(self.fields, self._values):
+			if value is not _MISSING:
+				yield field
+		if self._overflow:
+			yield from self._overflow
+	
+	@typing.override
+	def __len__(self) -> int:
+		return len(self._values) - self._values.count(_MISSING) + (len(self._overflow) if self._overflow else 0)
+	
+	@typing.override
+	def clear(self) -> None:
+		self._values = [_MISSING] * len(self.fields)
+		self._overflow = None
+	
+	def __repr__(self) -> str:
+		return f'{type(self).__name__}({dict(self.items())!r})'
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if type(other) is type(self):
+			return self._values == other._values and (self._overflow or {}) == (other._overflow or {})
+		if isinstance(other, collections.UserDict):
+			return dict(self.items()) == other.data
+		if isinstance(other, collections.abc.Mapping):
+			return dict(self.items()) == dict(other.items())
+		return NotImplemented
+	
+	def copy(self) -> typing.Self:
+		new = type(self).__new__(type(self))
+		new._values = self._values.copy()
+		new._overflow = None if self._overflow is None else self._overflow.copy()
+		return new
+	
+	__copy__ = copy
+	
+	def __reduce__(self) -> tuple:
+		# record types are created at run time, so they are pickled as their schema
+		values = [None if value is _MISSING else value for value in self._values]
+		missing = [position for position, value in enumerate(self._values) if value is _MISSING]
+		return (_restore_record, (self._owner, self.fields, type(self).__name__, values, missing, self._overflow))
+
+
+@functools.cache
+def record_type(owner: type, fields: tuple, name: str) -> type[KeyTransformingRecord]:
+	"""
+	Record class for fields already transformed by the owner, shared by all schemas with the same fields.
+	"""
+	positions = {field: position for position, field in enumerate(fields)}
+	if len(positions) != len(fields):
+		duplicates = [field for field, count in collections.Counter(fields).items() if count > 1]
+		raise ValueError(f"fields must be distinct after transformation, got {duplicates!r} more than once")
+	return type(name, (KeyTransformingRecord, ), {
+		'__slots__': (),
+		'__module__': owner.__module__,
+		'fields': fields,
+		'_positions': positions,
+		'_owner': owner,
+		'transform_key': staticmethod(owner.transform_key),
+	})
+
+
+def _restore_record(owner: type, fields: tuple, name: str, values: list, missing: list, overflow: dict | None) -> KeyTransformingRecord:
+	new = record_type(owner, fields, name).from_values(values)
+	for position in missing:
+		new._values[position] = _MISSING
+	new._overflow = overflow
+	return new
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import typing
+
+from .key_interning import intern_storage
+from .key_transforming_mixin import KeyTransformingMixin
+
+
+class BaseKeyTransformingSet(KeyTransformingMixin, collections.abc.Set):
+	"""
+	Set that transforms elements before using them in any operation.
+	Requires subclassing and implementing the key transformation function.
+	Operations between instances of the same class use the stored elements without transforming them again.
+	Other sets are transformed before any comparison, including equality, so that == agrees with <= and >=.
+	"""
+	_storage_type: typing.ClassVar[type] = frozenset
+	
+	__slots__ = ('data', '__weakref__')
+	
+	def transform_keys(self, keys: collections.abc.Iterable) -> list:
+		"""
+		Function that transforms many elements at once, used by bulk construction and set operations.
+		It must return the elements transformed as by transform_key, in input order.
+		Subclasses may override it with a vectorized implementation.
+		"""
+		transform_key = self.transform_key
+		return [transform_key(key) for key in keys]
+	
+	def __init__(self, iterable: collections.abc.Iterable=(), /) -> None:
+		if isinstance(iterable, type(self)):
+			self.data = self._storage_type(iterable.data)
+		else:
+			self.data = self._storage_type(self.transform_keys(iterable))
+	
+	@classmethod
+	def _from_transformed(cls, data: collections.abc.Iterable) -> typing.Self:
+		new = cls.__new__(cls)
+		new.data = cls._storage_type(data)
+		return new
+	
+	def _transformed(self, other: collections.abc.Iterable) -> collections.abc.Set:
+		if isinstance(other, type(self)):
+			return other.data
+		return set(self.transform_keys(other))
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return self.transform_key(key) in self.data
+	
+	@typing.override
+	def __iter__(self):
+		return iter(self.data)
+	
+	@typing.override
+	def __len__(self) -> int:
+		return len(self.data)
+	
+	def __repr__(self) -> str:
+		return f'{type(self).__name__}({list(self.data)!r})'
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, BaseKeyTransformingSet):
+			return self.data == other.data
+		if isinstance(other, collections.abc.Set):
+			return self.data == self._transformed(other)
+		return NotImplemented
+	
+	@typing.override
+	def __le__(self, other: object) -> bool:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self.data <= self._transformed(other)
+	
+	@typing.override
+	def __lt__(self, other: object) -> bool:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self.data < self._transformed(other)
+	
+	@typing.override
+	def __ge__(self, other: object) -> bool:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self.data >= self._transformed(other)
+	
+	@typing.override
+	def __gt__(self, other: object) -> bool:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self.data > self._transformed(other)
+	
+	@typing.override
+	def __and__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self._from_transformed(self.data & self._transformed(other))
+	
+	@typing.override
+	def __or__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self._from_transformed(self.data | self._transformed(other))
+	
+	@typing.override
+	def __sub__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self._from_transformed(self.data - self._transformed(other))
+	
+	@typing.override
+	def __xor__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self._from_transformed(self.data ^ self._transformed(other))
+	
+	__rand__ = __and__
+	__ror__ = __or__
+	__rxor__ = __xor__
+	
+	@typing.override
+	def __rsub__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		return self._from_transformed(self._transformed(other) - self.data)
+	
+	@typing.override
+	def isdisjoint(self, other: collections.abc.Iterable) -> bool:
+		return self.data.isdisjoint(self._transformed(other))
+	
+	def issubset(self, other: collections.abc.Iterable) -> bool:
+		return self.data <= self._transformed(other)
+	
+	def issuperset(self, other: collections.abc.Iterable) -> bool:
+		return self.data >= self._transformed(other)
+	
+	def union(self, *others: collections.abc.Iterable) -> typing.Self:
+		return self._from_transformed(self.data.union(*map(self._transformed, others)))
+	
+	def intersection(self, *others: collections.abc.Iterable) -> typing.Self:
+		return self._from_transformed(self.data.intersection(*map(self._transformed, others)))
+	
+	def difference(self, *others: collections.abc.Iterable) -> typing.Self:
+		return self._from_transformed(self.data.difference(*map(self._transformed, others)))
+	
+	def symmetric_difference(self, other: collections.abc.Iterable) -> typing.Self:
+		return self._from_transformed(self.data.symmetric_difference(self._transformed(other)))
+	
+	def copy(self) -> typing.Self:
+		return self._from_transformed(self.data)
+	
+	def __copy__(self) -> typing.Self:
+		return self.copy()
+	
+	def __getstate__(self) -> tuple:
+		# explicit, as protocols 0 and 1 cannot pickle slots by default
+		return (getattr(self, '__dict__', None), {'data': self.data})
+	
+	def __setstate__(self, state: tuple) -> None:
+		instance_state, slots = state
+		if instance_state:
+			vars(self).update(instance_state)
+		self.data = intern_storage(type(self), slots['data'])
+
+
+class FrozenKeyTransformingSet(BaseKeyTransformingSet):
+	"""
+	Immutable, hashable set that transforms elements before using them in any operation.
+	Requires subclassing and implementing the key transformation function.
+	"""
+	__slots__ = ()
+	
+	@typing.override
+	def __hash__(self) -> int:
+		return hash(self.data)
+	
+	@typing.override
+	def copy(self) -> typing.Self:
+		return self
+	
+	def __copy__(self) -> typing.Self:
+		return self
+
+
+class KeyTransformingSet(BaseKeyTransformingSet, collections.abc.MutableSet):
+	"""
+	Mutable set that transforms elements before using them in any operation.
+	Requires subclassing and implementing the key transformation function.
+	"""
+	_storage_type = set
+	
+	__slots__ = ()
+	
+	__hash__ = None
+	
+	@typing.override
+	def add(self, key: object) -> None:
+		self.data.add(self.transform_key(key))
+	
+	@typing.override
+	def discard(self, key: object) -> None:
+		self.data.discard(self.transform_key(key))
+	
+	@typing.override
+	def remove(self, key: object) -> None:
+		self.data.remove(self.transform_key(key))
+	
+	@typing.override
+	def pop(self) -> object:
+		return self.data.pop()
+	
+	@typing.override
+	def clear(self) -> None:
+		self.data.clear()
+	
+	def update(self, *others: collections.abc.Iterable) -> None:
+		self.data.update(*map(self._transformed, others))
+	
+	def intersection_update(self, *others: collections.abc.Iterable) -> None:
+		self.data.intersection_update(*map(self._transformed, others))
+	
+	def difference_update(self, *others: collections.abc.Iterable) -> None:
+		self.data.difference_update(*map(self._transformed, others))
+	
+	def symmetric_difference_update(self, other: collections.abc.Iterable) -> None:
+		self.data.symmetric_difference_update(self._transformed(other))
+	
+	@typing.override
+	def __ior__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		self.data |= self._transformed(other)
+		return self
+	
+	@typing.override
+	def __iand__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		self.data &= self._transformed(other)
+		return self
+	
+	@typing.override
+	def __isub__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		self.data -= self._transformed(other)
+		return self
+	
+	@typing.override
+	def __ixor__(self, other: object) -> typing.Self:
+		if not isinstance(other, collections.abc.Set):
+			return NotImplemented
+		self.data ^= self._transformed(other)
+		return self
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import typing
+
+from .key_transforming_mixin import KeyTransformingMixin
+
+
+# file layout: header, open addressing table of (hash, record offset) slots, records in insertion order;
+# a record is the encoded key and the encoded value, each prefixed with its length
+_MAGIC = b'TCMAP\x00\x00\x01'
+_HEADER = struct.Struct('<8sQQ')
+_SLOT = struct.Struct('<QQ')
+_LENGTH = struct.Struct('<I')
+_FLOAT = struct.Struct('<d')
+
+_STR, _BYTES, _INT, _FLOAT_TAG = b's', b'b', b'i', b'f'
+
+
+def _encode(obj: object) -> bytes:
+	"""
+	Tagged, process independent encoding of a str, bytes, int or float.
+	bool is encoded as int, so True is read back as 1.
+	"""
+	type_ = type(obj)
+	if type_ is bool:
+		obj, type_ = int(obj), int
+	if type_ is str:
+		return _STR + obj.encode('utf-8', 'surrogatepass')
+	if type_ is bytes:
+		return _BYTES + obj
+	if type_ is int:
+		return _INT + obj.to_bytes((obj.bit_length() + 8) // 8, 'little', signed=True)
+	if type_ is float:
+		return _FLOAT_TAG + _FLOAT.pack(obj)
+	raise TypeError(f"only str, bytes, int and float can be stored, not {type_.__name__}")
+
+
+def _encode_key(key: object) -> bytes:
+	# keys equal to each other must be encoded the same: 1.0 is looked up as 1
+	if type(key) is float and key.is_integer():
+		key = int(key)
+	return _encode(key)
+
+
+def _decode(data: bytes) -> object:
+	tag = data[:1]
+	payload = data[1:]
+	if tag == _STR:
+		return str(payload, 'utf-8', 'surrogatepass')
+	if tag == _BYTES:
+		return bytes(payload)
+	if tag == _INT:
+		return int.from_bytes(payload, 'little', signed=True)
+	if tag == _FLOAT_TAG:
+		return _FLOAT.unpack(payload)[0]
+	raise ValueError(f"corrupted record with tag {bytes(tag)!r}")
+
+
+def _default_mode() -> int:
+	# mode open() gives new files; the umask can only be read by setting it, so it is restored at once
+	umask = os.umask(0o022)
+	os.umask(umask)
+	return 0o666 & ~umask
+
+
+def _hash(encoded_key: bytes) -> int:
+	# the builtin hash of str and bytes is randomized per process, so it cannot be stored
+	return int.from_bytes(hashlib.blake2b(encoded_key, digest_size=8).digest(), 'little')
+
+
+class MappedKeyTransformingDict(KeyTransformingMixin, collections.abc.Mapping):
+	"""
+	Read-only dictionary that transforms keys before using them in any operation,
+	backed by a memory-mapped hash table file written by write().
+	Requires subclassing and implementing the key transformation function.
+	Keys and values must be str, bytes, int or float; bool is stored as int.
+	Processes mapping the same file share its physical pages, and nothing is loaded until it is looked up.
+	"""
+	
+	class ItemsView(collections.abc.ItemsView):
+		@typing.override
+		def __iter__(self):
+			for key, value in self._mapping._records():
+				yield (_decode(key), _decode(value))
+	
+	class ValuesView(collections.abc.ValuesView):
+		@typing.override
+		def __iter__(self):
+			for key, value in self._mapping._records():
+				yield _decode(value)
+	
+	__slots__ = ('path', '_map', '_len', '_slot_count', '_records_offset', '__weakref__')
+	
+	@classmethod
+	def write(cls, path: str | os.PathLike, mapping: collections.abc.Mapping) -> None:
+		"""
+		Write the items of the mapping, with keys transformed by this class, into a hash table file.
+		The file is replaced atomically, so processes that already mapped the old file keep reading it.
+		"""
+		transform_key = cls.transform_key
+		entries = {}
+		for key, value in mapping.items():
+			entries[_encode_key(transform_key(key))] = _encode(value)
+		slot_count = 8
+		while slot_count < 2 * len(entries):
+			slot_count *= 2
+		slots = bytearray(slot_count * _SLOT.size)
+		mask = slot_count - 1
+		offset = _HEADER.size + len(slots)
+		# a unique file in the same directory, so that concurrent writers do not collide and it can be renamed over path
+		file = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=f'{os.path.basename(path)}.', suffix='.tmp', delete=False)
+		try:
+			with file:
+				file.write(_HEADER.pack(_MAGIC, len(entries), slot_count))
+				file.write(slots)
+				for key, value in entries.items():
+					hash_ = _hash(key)
+					index = hash_ & mask
+					while _SLOT.unpack_from(slots, index * _SLOT.size)[1]:
+						index = (index + 1) & mask
+					_SLOT.pack_into(slots, index * _SLOT.size, hash_, offset)
+					record = b''.join((_LENGTH.pack(len(key)), key, _LENGTH.pack(len(value)), value))
+					file.write(record)
+					offset += len(record)
+				file.seek(_HEADER.size)
+				file.write(slots)
+			# temporary files are private to the user, but processes of other users may map the table
+			os.chmod(file.name, _default_mode())
+			os.replace(file.name, path)
+		except BaseException:
+			os.unlink(file.name)
+			raise
+	
+	def __init__(self, path: str | os.PathLike) -> None:
+		self.path = os.fspath(path)
+		with open(self.path, 'rb') as file:
+			self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, self._len, self._slot_count = _HEADER.unpack_from(self._map)
+		if magic != _MAGIC:
+			self._map.close()
+			raise ValueError(f"{self.path!r} is not a mapped dictionary file")
+		self._records_offset = _HEADER.size + self._slot_count * _SLOT.size
+	
+	def close(self) -> None:
+		self._map.close()
+	
+	def __enter__(self) -> typing.Self:
+		return self
+	
+	def __exit__(self, *exc_info) -> None:
+		self.close()
+	
+	def __reduce__(self) -> tuple:
+		# processes receiving the dictionary map the same file
+		return (type(self), (self.path, ))
+	
+	def _read_record(self, offset: int) -> tuple[bytes, bytes, int]:
+		buffer = self._map
+		key_length, = _LENGTH.unpack_from(buffer, offset)
+		offset += _LENGTH.size
+		key = buffer[offset:offset + key_length]
+		offset += key_length
+		value_length, = _LENGTH.unpack_from(buffer, offset)
+		offset += _LENGTH.size
+		value = buffer[offset:offset + value_length]
+		return key, value, offset + value_length
+	
+	def _records(self):
+		offset = self._records_offset
+		end = len(self._map)
+		while offset < end:
+			key, value, offset = self._read_record(offset)
+			yield key, value
+	
+	def _lookup(self, key: object) -> bytes | None:
+		"""
+		Encoded value of the transformed key, or None if it is missing.
+		"""
+		try:
+			encoded_key = _encode_key(key)
+		except TypeError:
+			return None
+		hash_ = _hash(encoded_key)
+		mask = self._slot_count - 1
+		index = hash_ & mask
+		buffer = self._map
+		while True:
+			slot_hash, offset = _SLOT.unpack_from(buffer, _HEADER.size + index * _SLOT.size)
+			if not offset:
+				return None
+			if slot_hash == hash_:
+				record_key, value, _ = self._read_record(offset)
+				if record_key == encoded_key:
+					return value
+			index = (index + 1) & mask
+	
+	@typing.override
+	def __len__(self) -> int:
+		return self._len
+	
+	@typing.override
+	def __iter__(self):
+		for key, value in self._records():
+			yield _decode(key)
+	
+	@typing.override
+	def __contains__(self, key: object) -> bool:
+		return self._lookup(self.transform_key(key)) is not None
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		value = self._lookup(self.transform_key(key))
+		if value is None:
+			raise KeyError(key)
+		return _decode(value)
+	
+	@typing.override
+	def get(self, key: object, default: object=None) -> object:
+		value = self._lookup(self.transform_key(key))
+		if value is None:
+			return default
+		return _decode(value)
+	
+	def __repr__(self) -> str:
+		return f'{type(self).__name__}({self.path!r})'
+	
+	@typing.override
+	def items(self) -> collections.abc.ItemsView:
+		return self.ItemsView(self)
+	
+	@typing.override
+	def values(self) -> collections.abc.ValuesView:
+		return self.ValuesView(self)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import typing
+
+from .key_transforming_dict import KeyTransformingDict
+
+
+class NestedKeyTransformingDict(KeyTransformingDict):
+	"""
+	Dictionary that transforms keys before using them in any operation, at every level of nested mappings.
+	Requires subclassing and implementing the key transformation function.
+	Nested mappings are wrapped in the same class lazily, when first read, and the wrapper replaces them in storage;
+	wrapping copies one level, so writes through wrappers do not reach the mappings originally passed in.
+	get_path memoizes resolved paths; a write invalidates only the cached paths that looked up the written key.
+	"""
+	__marker = object()
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		# path -> value, for paths resolved from this dictionary
+		self._path_cache = {}
+		# transformed key -> (id of path cache, path) -> path cache, for cached paths that looked up the key here
+		self._dependents = {}
+		super().__init__(other, **kwds)
+	
+	def _invalidate(self, key: object) -> None:
+		for (_, path), path_cache in self._dependents.pop(key, {}).items():
+			path_cache.pop(path, None)
+	
+	def _invalidate_all(self) -> None:
+		for key in list(self._dependents):
+			self._invalidate(key)
+	
+	@typing.override
+	def _getitem_without_transform(self, key: object) -> object:
+		value = super()._getitem_without_transform(key)
+		if isinstance(value, collections.abc.Mapping) and not isinstance(value, NestedKeyTransformingDict) and key in self.data:
+			value = self.data[key] = type(self)(value)
+		return value
+	
+	@typing.override
+	def _setitem_without_transform(self, key: object, value: object) -> None:
+		self.data[key] = value
+		self._invalidate(key)
+	
+	@typing.override
+	def _delitem_without_transform(self, key: object) -> None:
+		del self.data[key]
+		self._invalidate(key)
+	
+	@typing.override
+	def _update_without_transform(self, items: dict) -> None:
+		self.data.update(items)
+		if self._dependents:
+			for key in items:
+				self._invalidate(key)
+	
+	@typing.override
+	def __getitem__(self, key: object) -> object:
+		return self._getitem_without_transform(self.transform_key(key))
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		self._setitem_without_transform(self.transform_key(key), value)
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		self._delitem_without_transform(self.transform_key(key))
+	
+	@typing.override
+	def get_many(self, keys: collections.abc.Iterable, default: object=None) -> list:
+		data = self.data
+		return [self._getitem_without_transform(key) if key in data else default for key in self.transform_keys(keys)]
+	
+	@typing.override
+	def clear(self) -> None:
+		self.data.clear()
+		self._invalidate_all()
+	
+	def get_path(self, path: collections.abc.Iterable, default: object=__marker) -> object:
+		"""
+		Return the value at a path of keys through nested mappings, such as ('a', 'B', 'c').
+		If the path does not exist, return default if given, or raise KeyError.
+		"""
+		path = tuple(path)
+		try:
+			return self._path_cache[path]
+		except KeyError:
+			cacheable = True
+		except TypeError:
+			cacheable = False
+		node = self
+		trail = []
+		for key in path:
+			if not isinstance(node, NestedKeyTransformingDict):
+				break
+			transformed_key = node.transform_key(key)
+			try:
+				value = node._getitem_without_transform(transformed_key)
+			except KeyError:
+				break
+			trail.append((node, transformed_key))
+			node = value
+		else:
+			if cacheable:
+				path_cache = self._path_cache
+				path_cache[path] = node
+				for parent, transformed_key in trail:
+					parent._dependents.setdefault(transformed_key, {})[(id(path_cache), path)] = path_cache
+			return node
+		if default is self.__marker:
+			raise KeyError(path)
+		return default
+	
+	@typing.override
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, NestedKeyTransformingDict):
+			other_data = other.data
+			other_getitem = other._getitem_without_transform
+		elif isinstance(other, collections.UserDict):
+			other_data = other.data
+			other_getitem = other_data.__getitem__
+		elif isinstance(other, collections.abc.Mapping):
+			other_data = dict(other.items())
+			other_getitem = other_data.__getitem__
+		else:
+			return NotImplemented
+		if self.data.keys() != other_data.keys():
+			return False
+		# nested mappings are compared as wrappers, whether or not they were read before
+		for key in self.data:
+			value = self._getitem_without_transform(key)
+			other_value = other_getitem(key)
+			if not (value is other_value or value == other_value):
+				return False
+		return True
+	
+	@typing.override
+	def __reduce_ex__(self, protocol: int) -> tuple:
+		function, (cls, data, state, buffer_keys) = super().__reduce_ex__(protocol)
+		state.update(_path_cache={}, _dependents={})
+		return function, (cls, data, state, buffer_keys)
+	
+	@typing.override
+	def __copy__(self) -> typing.Self:
+		new = super().__copy__()
+		new._path_cache = {}
+		new._dependents = {}
+		return new
+	
+	@typing.override
+	def copy(self) -> typing.Self:
+		return self.__copy__()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import functools
+import threading
+import typing
+
+
+class CacheInfo(typing.NamedTuple):
+	hits: int
+	misses: int
+	evictions: int
+	maxsize: int
+	currsize: int
+
+
+class TransformCache:
+	"""
+	Bounded memoization cache mapping raw keys to transformed keys.
+	Once full, entries are evicted in LRU or CLOCK order.
+	Raw keys that are not hashable bypass the cache.
+	"""
+	POLICIES = ('lru', 'clock')
+	
+	def __init__(self, maxsize: int=1024, policy: str='lru') -> None:
+		if maxsize < 1:
+			raise ValueError(f"maxsize must be positive, not {maxsize!r}")
+		if policy not in self.POLICIES:
+			raise ValueError(f"policy must be one of {self.POLICIES}, not {policy!r}")
+		self.maxsize = maxsize
+		self.policy = policy
+		self._lock = threading.Lock()
+		self.clear()
+	
+	def __len__(self) -> int:
+		if self.policy == 'lru':
+			return len(self._entries)
+		return len(self._slots)
+	
+	def clear(self) -> None:
+		"""
+		Remove all entries and reset the counters.
+		"""
+		with self._lock:
+			self.hits = self.misses = self.evictions = 0
+			# LRU: entry key -> transformed key, least recently used first
+			self._entries = collections.OrderedDict()
+			# CLOCK: entry key -> slot index, with per-slot entry keys, transformed keys and reference bits
+			self._slots = {}
+			self._keys = []
+			self._values = []
+			self._referenced = bytearray()
+			self._hand = 0
+	
+	def info(self) -> CacheInfo:
+		return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self))
+	
+	def get(self, key: object, default: object=None) -> object:
+		"""
+		Return the cached transformation of the key, or default if it is not cached.
+		"""
+		# keys that are equal but of different types (1, 1.0, True) may transform differently
+		entry_key = (type(key), key)
+		with self._lock:
+			try:
+				if self.policy == 'lru':
+					value = self._entries[entry_key]
+					self._entries.move_to_end(entry_key)
+				else:
+					index = self._slots[entry_key]
+					self._referenced[index] = 1
+					value = self._values[index]
+			except KeyError:
+				self.misses += 1
+				return default
+			except TypeError:
+				return default
+			self.hits += 1
+			return value
+	
+	def put(self, key: object, value: object) -> None:
+		"""
+		Cache the transformation of the key, evicting an entry if the cache is full.
+		"""
+		entry_key = (type(key), key)
+		try:
+			hash(entry_key)
+		except TypeError:
+			return
+		with self._lock:
+			if self.policy == 'lru':
+				self._put_lru(entry_key, value)
+			else:
+				self._put_clock(entry_key, value)
+	
+	def _put_lru(self, entry_key: object, value: object) -> None:
+		entries = self._entries
+		if entry_key in entries:
+			entries.move_to_end(entry_key)
+		elif len(entries) >= self.maxsize:
+			entries.popitem(last=False)
+			self.evictions += 1
+		entries[entry_key] = value
+	
+	def _put_clock(self, entry_key: object, value: object) -> None:
+		index = self._slots.get(entry_key)
+		if index is not None:
+			self._values[index] = value
+			self._referenced[index] = 1
+			return
+		if len(self._keys) < self.maxsize:
+			self._slots[entry_key] = len(self._keys)
+			self._keys.append(entry_key)
+			self._values.append(value)
+			self._referenced.append(0)
+			return
+		hand = self._hand
+		while self._referenced[hand]:
+			self._referenced[hand] = 0
+			hand = (hand + 1) % self.maxsize
+		del self._slots[self._keys[hand]]
+		self.evictions += 1
+		self._slots[entry_key] = hand
+		self._keys[hand] = entry_key
+		self._values[hand] = value
+		self._hand = (hand + 1) % self.maxsize
+	
+	def wrap(self, transform: typing.Callable[[object], object]) -> typing.Callable[[object], object]:
+		"""
+		Return a function that calls the transformation only for keys missing from the cache.
+		"""
+		marker = object()
+		
+		@functools.wraps(transform)
+		def cached_transform(key: object) -> object:
+			result = self.get(key, marker)
+			if result is marker:
+				result = transform(key)
+				self.put(key, result)
+			return result
+		
+		cached_transform.transform_cache = self
+		return cached_transform
+
+
+def install_transform_cache(cls: type) -> None:
+	"""
+	Route the class's transform_key through the cache declared in its body, if any.
+	Only classes declaring transform_cache themselves are wrapped,
+	so a subclass with its own transform_key never shares a cache with a different transformation.
+	"""
+	cache = cls.__dict__.get('transform_cache')
+	if cache is not None:
+		cls.transform_key = staticmethod(cache.wrap(cls.transform_key))
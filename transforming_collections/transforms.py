@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import typing
+import unicodedata
+
+
+NORMALIZATION_FORMS = ('NFC', 'NFD', 'NFKC', 'NFKD')
+
+
+def lowercase(key: object) -> object:
+	"""
+	Lowercase string keys, leaving other keys unchanged.
+	Keys that are already lowercase are returned as they are,
+	so the dictionary stores the caller's string instead of an equal copy.
+	"""
+	if isinstance(key, str):
+		# str.lower has an ASCII fast path; str.islower does not, so it is cheaper to fold and compare
+		lowered = key.lower()
+		if lowered == key and type(key) is str:
+			return key
+		return lowered
+	return key
+
+
+def casefold(key: object) -> object:
+	"""
+	Casefold string keys, leaving other keys unchanged.
+	Keys that are already casefolded are returned as they are,
+	so the dictionary stores the caller's string instead of an equal copy.
+	"""
+	if isinstance(key, str):
+		folded = key.casefold()
+		if folded == key and type(key) is str:
+			return key
+		return folded
+	return key
+
+
+def normalizer(form: str='NFKC', casefold: bool=True) -> typing.Callable[[object], object]:
+	"""
+	Return a transformation that normalizes string keys to the Unicode normalization form,
+	then casefolds them and normalizes them again if casefold is set, leaving other keys unchanged.
+	Keys that are already normalized are returned as they are, so the dictionary stores the caller's string:
+	ASCII keys skip normalization altogether, and casefolded keys are normalized again only if casefolding changed them.
+	"""
+	if form not in NORMALIZATION_FORMS:
+		raise ValueError(f"form must be one of {NORMALIZATION_FORMS}, not {form!r}")
+	normalize = unicodedata.normalize
+	
+	def normalize_key(key: object) -> object:
+		if not isinstance(key, str):
+			return key
+		if key.isascii():
+			# ASCII is invariant under every normalization form, and its casefolding is lowercasing
+			result = key.lower() if casefold else key
+		else:
+			# normalize checks whether the key is already normalized first, and then returns it without copying
+			result = normalize(form, key)
+			if casefold:
+				# casefolding may denormalize, so a key changed by it is normalized again
+				folded = result.casefold()
+				if folded != result:
+					result = normalize(form, folded)
+		if result == key and type(key) is str:
+			return key
+		return result if type(result) is str else str(result)
+	
+	normalize_key.__name__ = normalize_key.__qualname__ = f'normalize_{form.lower()}{"_casefold" if casefold else ""}'
+	return normalize_key
+
+
+def is_str_array(keys: object) -> bool:
+	"""
+	Whether the keys are a NumPy array of str, without importing NumPy.
+	Object arrays are not included, as they may hold keys of any type.
+	"""
+	return getattr(getattr(keys, 'dtype', None), 'kind', None) == 'U' and hasattr(keys, 'tolist')
+
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+import typing
+
+from .key_transforming_dict import KeyTransformingDict
+from . import transforms
+
+
+class UnicodeNormalizingDict(KeyTransformingDict):
+	"""
+	Dictionary that normalizes string keys to a Unicode normalization form, and casefolds them,
+	before using them in any operation.
+	Subclasses may set normalization_form and casefold to choose another normalization.
+	"""
+	normalization_form: typing.ClassVar[str] = 'NFKC'
+	casefold: typing.ClassVar[bool] = True
+	
+	transform_key = staticmethod(transforms.normalizer(normalization_form, casefold))
+	
+	def __init_subclass__(cls, **kwargs) -> None:
+		if ('normalization_form' in cls.__dict__ or 'casefold' in cls.__dict__) and 'transform_key' not in cls.__dict__:
+			cls.transform_key = staticmethod(transforms.normalizer(cls.normalization_form, cls.casefold))
+		super().__init_subclass__(**kwargs)
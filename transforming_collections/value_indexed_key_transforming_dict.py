@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import typing
+
+from .key_transforming_dict import KeyTransformingDict
+
+
+class ValueIndexedKeyTransformingDict(KeyTransformingDict):
+	"""
+	Dictionary that transforms keys before using them in any operation,
+	and maintains an index from values to their keys.
+	Requires subclassing and implementing the key transformation function.
+	Value membership and keys_for_value are O(1) for hashable values;
+	unhashable values are kept out of the index and found by scanning.
+	Like dictionary keys, hashable values must not change their hash while stored.
+	"""
+	class ValuesView(KeyTransformingDict.ValuesView):
+		@typing.override
+		def __contains__(self, value: object) -> bool:
+			return self._mapping._has_value(value)
+	
+	def __init__(self, other=(), /, **kwds) -> None:
+		# value -> keys holding it, as an insertion-ordered set
+		self._value_keys = {}
+		# keys holding unhashable values
+		self._unhashable_keys = {}
+		super().__init__(other, **kwds)
+	
+	@typing.override
+	@classmethod
+	def wrap(cls, data: dict, trusted: bool=True) -> typing.Self:
+		new = super().wrap(data, trusted)
+		for key, value in data.items():
+			new._index_add(key, value)
+		return new
+	
+	def _index_add(self, key: object, value: object) -> None:
+		try:
+			keys = self._value_keys.get(value)
+		except TypeError:
+			self._unhashable_keys[key] = None
+			return
+		if keys is None:
+			self._value_keys[value] = {key: None}
+		else:
+			keys[key] = None
+	
+	def _index_remove(self, key: object, value: object) -> None:
+		try:
+			keys = self._value_keys[value]
+		except TypeError:
+			del self._unhashable_keys[key]
+			return
+		del keys[key]
+		if not keys:
+			del self._value_keys[value]
+	
+	@typing.override
+	def _setitem_without_transform(self, key: object, value: object) -> None:
+		data = self.data
+		if key in data:
+			self._index_remove(key, data[key])
+		data[key] = value
+		self._index_add(key, value)
+	
+	@typing.override
+	def _delitem_without_transform(self, key: object) -> None:
+		value = self.data.pop(key)
+		self._index_remove(key, value)
+	
+	@typing.override
+	def _update_without_transform(self, items: dict) -> None:
+		for key, value in items.items():
+			self._setitem_without_transform(key, value)
+	
+	@typing.override
+	def __setitem__(self, key: object, value: object) -> None:
+		self._setitem_without_transform(self.transform_key(key), value)
+	
+	@typing.override
+	def __delitem__(self, key: object) -> None:
+		self._delitem_without_transform(self.transform_key(key))
+	
+	@typing.override
+	def clear(self) -> None:
+		self.data.clear()
+		self._value_keys.clear()
+		self._unhashable_keys.clear()
+	
+	def _scan(self, keys: collections.abc.Iterable, value: object):
+		data = self.data
+		for key in keys:
+			v = data[key]
+			if v is value or v == value:
+				yield key
+	
+	def _has_value(self, value: object) -> bool:
+		try:
+			if value in self._value_keys:
+				return True
+		except TypeError:
+			# an unhashable value may still be equal to a hashable one (set and frozenset)
+			return any(self._scan(self.data, value))
+		return any(self._scan(self._unhashable_keys, value))
+	
+	def keys_for_value(self, value: object) -> list:
+		"""
+		Return the (transformed) keys whose values are equal to the value.
+		"""
+		# the index holds the keys of the storage, which differ from the transformed keys only in untrusted wrapped storage
+		try:
+			keys = list(self._value_keys.get(value, ()))
+		except TypeError:
+			return list(self._transformed_keys(self._scan(self.data, value)))
+		keys.extend(self._scan(self._unhashable_keys, value))
+		return list(self._transformed_keys(keys))
+	
+	@typing.override
+	def __copy__(self) -> typing.Self:
+		new = super().__copy__()
+		new._value_keys = {value: keys.copy() for value, keys in self._value_keys.items()}
+		new._unhashable_keys = self._unhashable_keys.copy()
+		return new
+	
+	@typing.override
+	def copy(self) -> typing.Self:
+		return self.__copy__()